@@ -0,0 +1,94 @@
+"""
+Compare the previous regex-based clean_data with the current columnar one.
+
+A synthetic multi-season frame is built by resampling the CSV backup, shifting
+dates by season and writing PSxG+/- with explicit signs ('+0.2') and some
+blank cells, as raw scraped data has them. Run from the repository root:
+
+    python -m benchmarks.clean_data
+    python -m benchmarks.clean_data --seasons 20 --repeat 5
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_cleaner import COLUMN_MAPPING, clean_data
+from src.team_names import TEAM_NAME_MAPPING
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ROWS_PER_SEASON = 760
+BLANK_FRACTION = 0.01
+
+
+def synthetic_frame(csv_path, seasons, seed=0):
+    """Resample the CSV into `seasons` seasons of raw match logs"""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(csv_path)
+    frames = []
+    for season in range(seasons):
+        sample = base.iloc[rng.integers(0, len(base), ROWS_PER_SEASON)].copy()
+        sample['Date'] = (pd.to_datetime(sample['Date']) - pd.DateOffset(years=season)).dt.strftime('%Y-%m-%d')
+        frames.append(sample)
+    df = pd.concat(frames, ignore_index=True)
+
+    df['keeper_PSxG+/-'] = df['keeper_PSxG+/-'].map(lambda value: f"{value:+.1f}").astype(object)
+    for col in ['keeper_PSxG+/-', 'shooting_Time']:
+        blanks = rng.random(len(df)) < BLANK_FRACTION
+        df[col] = df[col].astype(object)
+        df.loc[blanks, col] = ' '
+    return df
+
+
+def legacy_clean(df):
+    """The previous path: regex over every cell, then team names replaced per column"""
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.replace(r'^\s*$', np.nan, regex=True)
+    df = df.rename(columns=COLUMN_MAPPING)
+    df['team'] = df['team'].replace(TEAM_NAME_MAPPING)
+    df['opponent'] = df['opponent'].replace(TEAM_NAME_MAPPING)
+    return df
+
+
+def time_call(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        fn(frame)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(PROJECT_ROOT / 'data' / 'backups' / 'match_logs.csv'))
+    parser.add_argument('--seasons', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.csv, args.seasons)
+    legacy = legacy_clean(df.copy())
+    current = clean_data(df.copy())
+
+    # The legacy path leaves '+0.2' as text; compare it parsed
+    plus_minus = pd.to_numeric(legacy['expected_goals_plus_minus'], errors='coerce')
+    assert np.allclose(plus_minus, current['expected_goals_plus_minus'], equal_nan=True)
+    assert (legacy['team'].to_numpy() == current['team'].astype(str).to_numpy()).all()
+
+    legacy_time = time_call(legacy_clean, df, args.repeat)
+    current_time = time_call(clean_data, df, args.repeat)
+    print(f"Rows: {len(df)} ({args.seasons} seasons, {df.shape[1]} columns)")
+    print(f"Regex clean_data:     {legacy_time * 1000:8.1f} ms")
+    print(f"Columnar clean_data:  {current_time * 1000:8.1f} ms")
+    print(f"Speedup:              {legacy_time / current_time:8.1f}x")
+    print(f"Memory: {legacy.memory_usage(deep=True).sum() / 1e6:.1f} MB -> "
+          f"{current.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
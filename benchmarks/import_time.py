@@ -0,0 +1,89 @@
+"""
+Measure the cold import cost of each entry point.
+
+Every import runs in a fresh interpreter so nothing is shared between
+measurements. Run from the repository root:
+
+    python -m benchmarks.import_time --repeat 5 --csv benchmarks/import_time.csv
+"""
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = {
+    'prediction (mcmc)': 'import src.modeling.mcmc',
+    'prediction (compact posterior)': 'import src.modeling.mcmc, src.modeling.posterior_store',
+    'trace cache': 'import src.modeling.trace_cache',
+    'evaluation': 'import src.modeling.model_evaluation',
+    'training (pymc)': 'import src.modeling.mcmc, pymc',
+}
+
+HEAVY_MODULES = ['pymc', 'pytensor', 'arviz', 'sklearn', 'sqlalchemy']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(statement):
+    """Import in a fresh interpreter and return (seconds, heavy modules loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, 'PYTHONWARNINGS': 'ignore'},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe['seconds'], probe['heavy']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--csv', help="Append results to this CSV to track import cost over time")
+    args = parser.parse_args()
+
+    rows = []
+    for name, statement in ENTRY_POINTS.items():
+        timings = []
+        for _ in range(args.repeat):
+            seconds, heavy = time_import(statement)
+            timings.append(seconds)
+        rows.append({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'entry_point': name,
+            'median_seconds': round(statistics.median(timings), 4),
+            'min_seconds': round(min(timings), 4),
+            'heavy_modules': ' '.join(heavy),
+        })
+
+    print(f"{'Entry point':<32}{'median (s)':>12}{'min (s)':>10}  heavy modules loaded")
+    for row in rows:
+        print(f"{row['entry_point']:<32}{row['median_seconds']:>12.3f}{row['min_seconds']:>10.3f}  {row['heavy_modules'] or '-'}")
+
+    if args.csv:
+        write_header = not os.path.exists(args.csv)
+        with open(args.csv, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+        print(f"Appended results to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare inference backends on the bundled match logs.
+
+Each backend is fitted on the matches before the split date and scored on
+the home rows after it: wall time of the fit, 1X2 log-loss, ranked
+probability score, Brier score and goals MAE. Backends whose optional
+dependencies are missing are skipped. Run from the repository root:
+
+    python -m benchmarks.inference_backends
+    python -m benchmarks.inference_backends --backends nuts laplace advi --samples 1000
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.data_cleaner import clean_data
+from src.modeling.backends import BACKENDS
+from src.modeling.mcmc import MODEL_COLUMNS, build_model, prepare_data, predict_matches, sample_model, team_indices
+from src.modeling.model_evaluation import evaluate_predictions, split_data_by_date
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(PROJECT_ROOT / 'data' / 'backups' / 'match_logs.csv'))
+    parser.add_argument('--split-date', default=None, help="First test date; defaults to the 80th date percentile")
+    parser.add_argument('--backends', nargs='+', default=BACKENDS, choices=BACKENDS)
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--tune', type=int, default=1000)
+    parser.add_argument('--cores', type=int, default=4)
+    args = parser.parse_args()
+
+    df = clean_data(pd.read_csv(args.csv))[MODEL_COLUMNS]
+    split_date = args.split_date or df['date'].quantile(0.8).normalize()
+    train_df, test_df = split_data_by_date(df, split_date)
+    train_data = prepare_data(train_df)
+    test_df = test_df[test_df['team'].isin(train_data['teams']) & test_df['opponent'].isin(train_data['teams'])]
+    home_idx = team_indices(test_df['team'], train_data)
+    away_idx = team_indices(test_df['opponent'], train_data)
+    actuals = pd.DataFrame({
+        'home_goals': test_df['goals_for'].to_numpy(),
+        'away_goals': test_df['goals_against'].to_numpy(),
+    })
+    print(f"Train: {len(train_data['home_goals'])} fixtures, test: {len(actuals)} fixtures from {pd.Timestamp(split_date).date()}")
+
+    rows = []
+    for backend in args.backends:
+        model = build_model(train_data)
+        start = time.perf_counter()
+        try:
+            trace = sample_model(model, samples=args.samples, tune=args.tune, cores=args.cores, backend=backend)
+        except ImportError as e:
+            print(f"Skipping {backend}: {e}")
+            continue
+        seconds = time.perf_counter() - start
+
+        predictions = predict_matches(trace, home_idx, away_idx, train_data, random_state=0)
+        metrics = evaluate_predictions(predictions, actuals)
+        rows.append({
+            'backend': backend,
+            'seconds': seconds,
+            'log_loss': metrics['log_loss'],
+            'rps': metrics['rps'],
+            'brier': (metrics['brier_home'] + metrics['brier_draw'] + metrics['brier_away']) / 3,
+            'accuracy': metrics['accuracy'],
+            'mae_goals': (metrics['mae_home_goals'] + metrics['mae_away_goals']) / 2,
+        })
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
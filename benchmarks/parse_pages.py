@@ -0,0 +1,94 @@
+"""
+Compare full-page parsing with the targeted table parser on saved FBref pages.
+
+Pages can be plain .html files (e.g. a fixture directory) or the .gz bodies
+stored by the HTTP cache. Run from the repository root:
+
+    python -m benchmarks.parse_pages data/http_cache
+    python -m benchmarks.parse_pages data/fixtures --repeat 5
+"""
+import argparse
+import gzip
+import re
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from scripts.html_tables import PARSER, parse_table, extract_columns
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+TABLE_ID_PATTERN = re.compile(r'<table[^>]+id="(matchlogs_for|results\d{4}-\d{4}91_overall|sched_[^"]+)"')
+
+
+def read_pages(root):
+    for path in sorted(Path(root).rglob('*')):
+        if path.suffix == '.html':
+            yield path, path.read_text(encoding='utf-8', errors='replace')
+        elif path.suffix == '.gz':
+            with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+                yield path, f.read()
+
+
+def full_parse(html, table_id):
+    """The previous path: parse the whole page, then walk the table into row dicts"""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'id': table_id})
+    rows = table.find_all('tr')
+    headers = [th.text.strip() for th in rows[1].find_all('th')]
+    return [
+        {headers[i]: cell.text.strip() for i, cell in enumerate(row.find_all(['th', 'td'])) if i < len(headers)}
+        for row in rows[2:-1]
+    ]
+
+
+def targeted_parse(html, table_id):
+    """The scraper's path: parse only the table, straight into columns of cell text"""
+    table = parse_table(html, table_id)
+    headers = [th.text.strip() for th in table.find_all('tr')[1].find_all('th')]
+    return extract_columns(table, headers)
+
+
+def time_call(fn, *args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('root', help="Directory of saved pages")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--limit', type=int, default=None, help="Only benchmark the first N pages")
+    args = parser.parse_args()
+
+    full_times, targeted_times = [], []
+    for path, html in read_pages(args.root):
+        match = TABLE_ID_PATTERN.search(html)
+        if not match:
+            continue
+        table_id = match.group(1)
+        full_times.append(time_call(full_parse, html, table_id, repeat=args.repeat))
+        targeted_times.append(time_call(targeted_parse, html, table_id, repeat=args.repeat))
+        if args.limit and len(full_times) >= args.limit:
+            break
+
+    if not full_times:
+        print(f"No FBref tables found under {args.root}")
+        return
+
+    full_median = statistics.median(full_times) * 1000
+    targeted_median = statistics.median(targeted_times) * 1000
+    print(f"Pages: {len(full_times)}  (targeted parser: {PARSER})")
+    print(f"Full page, html.parser:  {full_median:8.2f} ms/page")
+    print(f"Targeted table parse:    {targeted_median:8.2f} ms/page")
+    print(f"Speedup:                 {full_median / targeted_median:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Load-test the HTTP prediction service and report latency percentiles.
+
+Without --url the service is started in-process on a free port, with a
+Laplace fit of the bundled match logs (or random parameters with
+--synthetic, to measure serving alone). Worker threads then send
+/predict and /predict/batch requests for random fixtures and the script
+reports p50/p90/p99/max latency, throughput and the service's batching and
+cache counters. Run from the repository root:
+
+    python -m benchmarks.serve_load --requests 5000 --concurrency 32
+    python -m benchmarks.serve_load --synthetic --cache-size 0   # every request predicted
+    python -m benchmarks.serve_load --url http://127.0.0.1:8000
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_cleaner import clean_data
+from src.modeling.mcmc import MODEL_COLUMNS, POSTERIOR_PARAMS, prepare_data
+from src.service import PredictionService, serve
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def synthetic_posterior(n_teams, draws=8000, seed=0):
+    """Random parameters with the model's shapes, for timing the service without a fit"""
+    rng = np.random.default_rng(seed)
+    return {
+        name: rng.normal(0, 0.1, size=(draws, n_teams) if name in ('attack', 'defense') else draws)
+        for name in POSTERIOR_PARAMS
+    }
+
+
+def start_local_service(args):
+    df = clean_data(pd.read_csv(args.csv))[MODEL_COLUMNS]
+    data = prepare_data(df)
+    if args.synthetic:
+        posterior = synthetic_posterior(data['n_teams'])
+    else:
+        from src.modeling.backends import fit
+        from src.modeling.mcmc import build_model, extract_posterior
+        posterior = extract_posterior(fit(build_model(data), 'laplace', samples=2000, tune=0, cores=1))
+
+    service = PredictionService(posterior, data, cache_size=args.cache_size,
+                                max_batch=args.max_batch, max_wait=args.max_wait)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return service, server, f"http://127.0.0.1:{server.server_port}"
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help="Service to test; starts one in-process if omitted")
+    parser.add_argument('--csv', default=str(PROJECT_ROOT / 'data' / 'backups' / 'match_logs.csv'))
+    parser.add_argument('--synthetic', action='store_true', help="Serve random parameters instead of a fit")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--batch-fraction', type=float, default=0.1, help="Share of requests sent to /predict/batch")
+    parser.add_argument('--batch-size', type=int, default=10, help="Fixtures per /predict/batch request")
+    parser.add_argument('--cache-size', type=int, default=4096)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait', type=float, default=0.002)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    service = server = None
+    url = args.url
+    if url is None:
+        service, server, url = start_local_service(args)
+    with urllib.request.urlopen(f"{url}/health") as response:
+        teams = json.loads(response.read())['teams']
+
+    rng = np.random.default_rng(args.seed)
+
+    def fixtures(n):
+        pairs = [rng.choice(len(teams), size=2, replace=False) for _ in range(n)]
+        return [{'home_team': teams[home], 'away_team': teams[away]} for home, away in pairs]
+
+    jobs = [
+        ('/predict/batch', {'fixtures': fixtures(args.batch_size)}) if rng.random() < args.batch_fraction
+        else ('/predict', fixtures(1)[0])
+        for _ in range(args.requests)
+    ]
+
+    def timed(job):
+        path, body = job
+        start = time.perf_counter()
+        post(url + path, body)
+        return path, time.perf_counter() - start
+
+    # Warm up connections and the first prediction
+    timed(('/predict', fixtures(1)[0]))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(timed, jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies = pd.DataFrame(results, columns=['path', 'seconds'])
+    rows = []
+    for path, group in [('all', latencies)] + list(latencies.groupby('path')):
+        ms = group['seconds'].to_numpy() * 1000
+        rows.append({
+            'path': path,
+            'requests': len(ms),
+            'p50_ms': np.percentile(ms, 50),
+            'p90_ms': np.percentile(ms, 90),
+            'p99_ms': np.percentile(ms, 99),
+            'max_ms': ms.max(),
+        })
+    print(f"{args.requests} requests at concurrency {args.concurrency} in {elapsed:.1f}s "
+          f"({args.requests / elapsed:.0f} req/s)")
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda value: f"{value:.2f}"))
+
+    if service is not None:
+        print(service.stats())
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,139 @@
 import pandas as pd
-import numpy as np
-from sqlalchemy.types import String, Float, Integer, Date, Time
+from sqlalchemy.types import String, Float, Integer, Date
 import os
 
+from src.team_names import normalize_team_names
+
 def load_data(file_name='match_logs.csv'):
     file_path = os.path.join('data/backups', file_name)
     return pd.read_csv(file_path)
 
+COLUMN_MAPPING = {
+    'Date': 'date',
+    'Team': 'team',
+    'Venue': 'venue',
+    'Opponent': 'opponent',
+    'shooting_Time': 'time',
+    'shooting_Round': 'round',
+    'shooting_Day': 'day',
+    'shooting_Result': 'result',
+    'shooting_GF': 'goals_for',
+    'shooting_GA': 'goals_against',
+    'shooting_Sh': 'shots',
+    'shooting_SoT': 'shots_on_target',
+    'shooting_SoT%': 'shots_on_target_percentage',
+    'shooting_G/Sh': 'goals_per_shot',
+    'shooting_G/SoT': 'goals_per_shot_on_target',
+    'shooting_FK': 'free_kick_shots',
+    'shooting_PK': 'penalty_kicks_made',
+    'shooting_XG': 'expected_goals',
+    'shooting_npxG': 'expected_goals_non_penalty',
+    'shooting_npxG/Sh': 'expected_goals_per_shot',
+    'shooting_G-xG': 'goals_minus_expected_goals',
+    'shooting_np:G-xG': 'non_penalty_goals_minus_expected_goals',
+    'keeper_SoTA': 'shots_on_target_against',
+    'keeper_Saves': 'saves',
+    'keeper_Save%': 'save_percentage',
+    'keeper_CS': 'clean_sheets',
+    'keeper_PSxG+/-': 'expected_goals_plus_minus',
+    'keeper_Stp%': 'crosses_stopped_percentage',
+    'keeper_Cmp': 'passes_completed',
+    'keeper_Att': 'passes_attempted',
+    'passing_Cmp%': 'passes_completed_percentage',
+    'passing_TotDist': 'total_passing_distance',
+    'passing_PrgDist': 'progressive_passing_distance',
+    'passing_Ast': 'assists',
+    'passing_xAG': 'expected_assisted_goals',
+    'passing_xA': 'expected_assists',
+    'passing_KP': 'key_passes',
+    'passing_1/3': 'passes_final_third',
+    'passing_PPA': 'passes_into_penalty_area',
+    'passing_CrsPA': 'crosses_into_penalty_area',
+    'passing_PrgP': 'progressive_passes',
+    'gca_SCA': 'shot_creating_actions',
+    'gca_PassLive': 'live_ball_gca',
+    'gca_PassDead': 'dead_ball_gca',
+    'gca_TO': 'take_on_gca',
+    'gca_Sh': 'shot_gca',
+    'gca_Fld': 'fouls_drawn_gca',
+    'gca_Def': 'defensive_actions_gca',
+    'gca_GCA': 'goal_creating_actions',
+    'defense_Tkl': 'tackles',
+    'defense_TklW': 'tackles_won',
+    'defense_Blocks': 'blocks',
+    'defense_Sh': 'shots_blocked',
+    'defense_Pass': 'passes_blocked',
+    'defense_Int': 'interceptions',
+    'defense_Clr': 'clearances',
+    'defense_Err': 'defensive_errors',
+    'possession_Poss': 'possession',
+    'possession_Touches': 'touches',
+    'possession_Att 3rd': 'attacking_third_touches',
+    'possession_Att Pen': 'penalty_area_touches',
+    'possession_Att': 'take_ons_attempted',
+    'possession_Succ': 'successful_take_ons',
+    'possession_Succ%': 'successful_take_ons_%',
+    'possession_Carries': 'carries',
+    'possession_TotDist': 'total_carrying_distance',
+    'possession_PrgDist': 'progressive_carrying_distance',
+    'possession_PrgC': 'progressive_carries',
+    'possession_1/3': 'carries_into_final_third',
+    'possession_Dis': 'dispossessed',
+    # Add more column mappings as needed
+}
+
+# Free-text columns; every other column is parsed as a number
+TEXT_COLUMNS = ['team', 'opponent', 'venue', 'time', 'round', 'day', 'result']
+
+# Low-cardinality text columns stored as categoricals
+CATEGORICAL_COLUMNS = ['team', 'opponent', 'venue', 'result']
+
+def parse_numeric(values):
+    """Parse stripped cell text as numbers, allowing '+0.2' style signs and thousands separators"""
+    return pd.to_numeric(values.str.removeprefix('+').str.replace(',', '', regex=False), errors='coerce')
+
 def clean_data(df):
-    # Convert 'Date' column to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    """
+    Rename, type and normalise a raw match log frame.
 
-    # Replace empty strings with None (NULL in SQL)
-    df = df.replace(r'^\s*$', np.nan, regex=True)
+    Each text column is cleaned with one columnar pass: cells are stripped,
+    empty cells become NaN (NULL in SQL) and columns whose non-empty cells
+    are all numbers are converted. The low-cardinality columns become
+    categoricals and team names are mapped to their canonical form.
+    """
+    df = df.rename(columns=COLUMN_MAPPING)
+    df['date'] = pd.to_datetime(df['date'])
 
-    # Rename columns (add your specific renaming logic here)
-    column_mapping = {
-        'Date': 'date',
-        'Team': 'team',
-        'Venue': 'venue',
-        'Opponent': 'opponent',
-        'shooting_Time': 'time',
-        'shooting_Round': 'round',
-        'shooting_Day': 'day',
-        'shooting_Result': 'result',
-        'shooting_GF': 'goals_for',
-        'shooting_GA': 'goals_against',
-        'shooting_Sh': 'shots',
-        'shooting_SoT': 'shots_on_target',
-        'shooting_SoT%': 'shots_on_target_percentage',
-        'shooting_G/Sh': 'goals_per_shot',
-        'shooting_G/SoT': 'goals_per_shot_on_target',
-        'shooting_FK': 'free_kick_shots',
-        'shooting_PK': 'penalty_kicks_made',
-        'shooting_XG': 'expected_goals',
-        'shooting_npxG': 'expected_goals_non_penalty',
-        'shooting_npxG/Sh': 'expected_goals_per_shot',
-        'shooting_G-xG': 'goals_minus_expected_goals',
-        'shooting_np:G-xG': 'non_penalty_goals_minus_expected_goals',
-        'keeper_SoTA': 'shots_on_target_against',
-        'keeper_Saves': 'saves',
-        'keeper_Save%': 'save_percentage',
-        'keeper_CS': 'clean_sheets',
-        'keeper_PSxG+/-': 'expected_goals_plus_minus',
-        'keeper_Stp%': 'crosses_stopped_percentage',
-        'keeper_Cmp': 'passes_completed',
-        'keeper_Att': 'passes_attempted',
-        'passing_Cmp%': 'passes_completed_percentage',
-        'passing_TotDist': 'total_passing_distance',
-        'passing_PrgDist': 'progressive_passing_distance',
-        'passing_Ast': 'assists',
-        'passing_xAG': 'expected_assisted_goals',
-        'passing_xA': 'expected_assists',
-        'passing_KP': 'key_passes',
-        'passing_1/3': 'passes_final_third',
-        'passing_PPA': 'passes_into_penalty_area',
-        'passing_CrsPA': 'crosses_into_penalty_area',
-        'passing_PrgP': 'progressive_passes',
-        'gca_SCA': 'shot_creating_actions',
-        'gca_PassLive': 'live_ball_gca',
-        'gca_PassDead': 'dead_ball_gca',
-        'gca_TO': 'take_on_gca',
-        'gca_Sh': 'shot_gca',
-        'gca_Fld': 'fouls_drawn_gca',
-        'gca_Def': 'defensive_actions_gca',
-        'gca_GCA': 'goal_creating_actions',
-        'defense_Tkl': 'tackles',
-        'defense_TklW': 'tackles_won',
-        'defense_Blocks': 'blocks',
-        'defense_Sh': 'shots_blocked',
-        'defense_Pass': 'passes_blocked',
-        'defense_Int': 'interceptions',
-        'defense_Clr': 'clearances',
-        'defense_Err': 'defensive_errors',
-        'possession_Poss': 'possession',
-        'possession_Touches': 'touches',
-        'possession_Att 3rd': 'attacking_third_touches',
-        'possession_Att Pen': 'penalty_area_touches',
-        'possession_Att': 'take_ons_attempted',
-        'possession_Succ': 'successful_take_ons',
-        'possession_Succ%': 'successful_take_ons_%',
-        'possession_Carries': 'carries',
-        'possession_TotDist': 'total_carrying_distance',
-        'possession_PrgDist': 'progressive_carrying_distance',
-        'possession_PrgC': 'progressive_carries',
-        'possession_1/3': 'carries_into_final_third',
-        'possession_Dis': 'dispossessed',
-        # Add more column mappings as needed
-    }
+    for col in df.columns:
+        if col == 'date' or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        text = df[col].str.strip()
+        text = text.mask(text == '')
+        if col in TEXT_COLUMNS:
+            df[col] = text
+            continue
+        numeric = parse_numeric(text)
+        df[col] = numeric if numeric.notna().sum() == text.notna().sum() else text
 
-    df = df.rename(columns=column_mapping)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
 
-    return df
+    # Team names are mapped through the categories, once per distinct name
+    return normalize_team_names(df)
 
 def get_column_types(df):
     dtype_dict = {col: String for col in df.columns}  # Default all to String
-    dtype_dict.update({
-        'Date': Date,
-        'Team': String,
-        'Venue': String,
-        'Opponent': String,
-        'Time': Time,
-        'Round': String,
-        'Day': String,
-        'Result': String
-    })
+    if 'date' in dtype_dict:
+        dtype_dict['date'] = Date
 
     # Update numeric columns to appropriate types
-    numeric_columns = df.select_dtypes(include=['int64', 'float64']).columns
-    for col in numeric_columns:
-        if df[col].dtype == 'int64':
+    for col in df.columns:
+        if pd.api.types.is_bool_dtype(df[col]):
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
             dtype_dict[col] = Integer
-        else:
+        elif pd.api.types.is_float_dtype(df[col]):
             dtype_dict[col] = Float
 
     return dtype_dict
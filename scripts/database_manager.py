@@ -1,11 +1,16 @@
-from sqlalchemy import create_engine
-from data_cleaner import get_column_types
+from sqlalchemy import create_engine, inspect, true, MetaData, Table, Column, PrimaryKeyConstraint, select, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from scripts.data_cleaner import get_column_types
+import io
 import os
+import uuid
 from dotenv import load_dotenv
 
+PRIMARY_KEY = ['date', 'team']
+
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, url=None):
         load_dotenv()
         self.db_params = {
             'database': os.getenv('DB_NAME'),
@@ -14,15 +19,102 @@ class DatabaseManager:
             'host': os.getenv('DB_HOST'),
             'port': os.getenv('DB_PORT')
         }
+        # DB_URL (e.g. sqlite:///data/match_logs.db) overrides the PostgreSQL parameters
+        self.url = url or os.getenv('DB_URL')
         self.engine = self._create_engine()
 
     def _create_engine(self):
+        if self.url:
+            return create_engine(self.url)
         return create_engine(
             f"postgresql://{self.db_params['user']}:{self.db_params['password']}"
             f"@{self.db_params['host']}:{self.db_params['port']}/{self.db_params['database']}"
         )
 
-    def save_to_database(self, df, table_name='match_logs'):
+    def _table(self, name, df, metadata, temporary=False):
         dtype_dict = get_column_types(df)
-        df.to_sql(table_name, self.engine, if_exists='replace', index=False, dtype=dtype_dict)
-        print(f"Saved cleaned DataFrame to PostgreSQL table: {table_name}")
\ No newline at end of file
+        columns = [Column(col, dtype_dict[col]) for col in df.columns]
+        if temporary:
+            return Table(name, metadata, *columns, prefixes=['TEMPORARY'])
+        return Table(name, metadata, *columns, PrimaryKeyConstraint(*PRIMARY_KEY))
+
+    def _bulk_load(self, conn, table, df):
+        """Load df into table, with COPY on PostgreSQL and executemany elsewhere"""
+        if conn.dialect.name == 'postgresql':
+            buffer = io.StringIO()
+            df.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d')
+            buffer.seek(0)
+            preparer = conn.dialect.identifier_preparer
+            columns = ', '.join(preparer.quote(col) for col in df.columns)
+            with conn.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {preparer.format_table(table)} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+        else:
+            records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+            conn.execute(table.insert(), records)
+
+    def _needs_rebuild(self, conn, table_name, df):
+        """The table must be (re)built if it is missing, has no primary key or different columns"""
+        inspector = inspect(conn)
+        if not inspector.has_table(table_name):
+            return True
+        primary_key = inspector.get_pk_constraint(table_name)['constrained_columns']
+        columns = [col['name'] for col in inspector.get_columns(table_name)]
+        return sorted(primary_key) != sorted(PRIMARY_KEY) or set(columns) != set(df.columns)
+
+    def save_to_database(self, df, table_name='match_logs'):
+        """
+        Upsert df into table_name keyed on (date, team).
+
+        Rows are bulk loaded into a temporary staging table (COPY on
+        PostgreSQL) and merged with INSERT ... ON CONFLICT, updating only rows
+        whose values changed. Everything happens in one transaction, so
+        readers keep seeing the previous data until the refresh commits.
+        Tables written by the old replace-based loader (no primary key) are
+        rebuilt once with typed columns and the key, then swapped in.
+        """
+        df = df.drop_duplicates(subset=PRIMARY_KEY, keep='last').copy()
+        if 'date' in df.columns:
+            df['date'] = df['date'].dt.date
+
+        with self.engine.begin() as conn:
+            if self._needs_rebuild(conn, table_name, df):
+                exists = inspect(conn).has_table(table_name)
+                build_name = f"{table_name}_{uuid.uuid4().hex[:8]}" if exists else table_name
+                metadata = MetaData()
+                target = self._table(build_name, df, metadata)
+                target.create(conn)
+                self._bulk_load(conn, target, df)
+                if exists:
+                    # Swap inside the transaction so readers never see a missing or empty table
+                    Table(table_name, MetaData()).drop(conn)
+                    preparer = conn.dialect.identifier_preparer
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {preparer.quote(build_name)} RENAME TO {preparer.quote(table_name)}"
+                    )
+                print(f"Built table {table_name} with {len(df)} rows and primary key {tuple(PRIMARY_KEY)}")
+                return len(df)
+
+            metadata = MetaData()
+            target = Table(table_name, metadata, autoload_with=conn)
+            staging = self._table(f"{table_name}_staging", df, metadata, temporary=True)
+            staging.create(conn)
+            self._bulk_load(conn, staging, df)
+
+            dialect_insert = postgresql.insert if conn.dialect.name == 'postgresql' else sqlite.insert
+            columns = list(df.columns)
+            value_columns = [col for col in columns if col not in PRIMARY_KEY]
+            insert = dialect_insert(target).from_select(
+                columns, select(*[staging.c[col] for col in columns]).where(true())
+            )
+            upsert = insert.on_conflict_do_update(
+                index_elements=PRIMARY_KEY,
+                set_={col: insert.excluded[col] for col in value_columns},
+                where=or_(*[target.c[col].is_distinct_from(insert.excluded[col]) for col in value_columns])
+            )
+            changed = conn.execute(upsert).rowcount
+            staging.drop(conn)
+
+        print(f"Upserted {changed} new or changed rows of {len(df)} into table: {table_name}")
+        return changed
@@ -0,0 +1,82 @@
+"""
+Serve saved FBref pages locally so the scraper can run offline.
+
+A request for /en/squads/<id>/<season>/matchlogs/c9/shooting/<Team>-Match-Logs-Premier-League
+is answered with <root>/en/squads/<id>/<season>/matchlogs/c9/shooting/<Team>-Match-Logs-Premier-League.html,
+i.e. the fixture directory mirrors the URL paths. Start it and point the scraper at it:
+
+    python -m scripts.fixture_server data/fixtures --port 8000
+    FBREF_BASE_URL=http://127.0.0.1:8000/en FBREF_REQUESTS_PER_SECOND=50 python -m scripts.scrape_fbref --output /tmp/match_logs.csv
+"""
+import argparse
+import hashlib
+import os
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def __init__(self, *args, root, **kwargs):
+        self.root = os.path.abspath(root)
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        path = unquote(urlsplit(self.path).path).strip('/')
+        file_path = os.path.abspath(os.path.join(self.root, path + '.html'))
+
+        # Refuse paths escaping the fixture directory
+        if not file_path.startswith(self.root + os.sep) or not os.path.isfile(file_path):
+            self.send_error(404, f"No fixture for {self.path}")
+            return
+
+        with open(file_path, 'rb') as f:
+            body = f.read()
+
+        # Support conditional requests so cache revalidation can be exercised offline
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(root, host='127.0.0.1', port=0):
+    """
+    Serve fixtures from root on a background thread.
+
+    Args:
+        root (str): Directory mirroring the FBref URL paths.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: The running server and the base URL to use as FBREF_BASE_URL.
+    """
+    server = ThreadingHTTPServer((host, port), partial(FixtureHandler, root=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/en"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="Directory of saved pages mirroring the URL paths")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), partial(FixtureHandler, root=args.root))
+    print(f"Serving {args.root} at http://{args.host}:{args.port}/en")
+    server.serve_forever()
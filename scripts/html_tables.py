@@ -0,0 +1,78 @@
+"""
+Targeted parsing of FBref tables.
+
+FBref pages are large and only one table per page is of interest, so tables
+are parsed with a SoupStrainer that skips everything else, using lxml when it
+is installed and falling back to the standard library parser.
+"""
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def strain_tables(html: str, *table_ids: str) -> BeautifulSoup:
+    """
+    Parse a page keeping only the tables with the given ids.
+
+    The result supports the usual soup.find calls, so code written against a
+    fully parsed page keeps working.
+    """
+    return BeautifulSoup(html, PARSER, parse_only=SoupStrainer("table", id=list(table_ids)))
+
+
+def parse_table(html: str, table_id: str) -> Optional[BeautifulSoup]:
+    """
+    Parse only the table with the given id out of a page.
+
+    Args:
+        html (str): Page source.
+        table_id (str): id attribute of the table to keep.
+
+    Returns:
+        BeautifulSoup | None: The table element, or None if the page has no such table.
+    """
+    return strain_tables(html, table_id).find("table", id=table_id)
+
+
+def extract_columns(table: BeautifulSoup, columns_to_keep: List[str], header_row: int = 1) -> Optional[Dict[str, List[str]]]:
+    """
+    Read a stats table into columns of cell text.
+
+    The header is taken from row header_row; the rows after it, except the
+    last (a totals row on FBref), are data. Rows shorter than the last kept
+    column are skipped.
+
+    Args:
+        table (BeautifulSoup): Table element from parse_table.
+        columns_to_keep (List[str]): Header names to extract.
+        header_row (int): Index of the row holding the column headers.
+
+    Returns:
+        Dict[str, List[str]] | None: Cell text per kept column, or None if the table has too few rows.
+    """
+    rows = table.find_all("tr")
+    if len(rows) < header_row + 2:
+        return None
+
+    headers = [th.text.strip() for th in rows[header_row].find_all("th")]
+    indices_to_keep = [i for i, col in enumerate(headers) if col in columns_to_keep]
+    if not indices_to_keep:
+        return None
+    last_index = max(indices_to_keep)
+
+    # Duplicate header names keep the last matching cell, as the row dicts did
+    columns = {headers[i]: [] for i in indices_to_keep}
+    for row in rows[header_row + 1:-1]:
+        cells = row.find_all(["th", "td"])
+        if len(cells) > last_index:
+            texts = {headers[i]: cells[i].text.strip() for i in indices_to_keep}
+            for name, text in texts.items():
+                columns[name].append(text)
+    return columns
+
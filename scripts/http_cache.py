@@ -0,0 +1,179 @@
+"""
+On-disk HTTP response cache shared by the scraper and the app.
+
+Responses are stored gzip-compressed under data/http_cache/, one body and one
+JSON metadata file per URL. Fresh entries are served without touching the
+network; stale ones are revalidated with ETag/Last-Modified so unchanged
+pages come back as a cheap 304. Set FBREF_OFFLINE=1 to replay everything
+from the cache without any network access.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+import requests
+
+CACHE_DIR = os.getenv("FBREF_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "http_cache"))
+OFFLINE = os.getenv("FBREF_OFFLINE") == "1"
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# (pattern, ttl in seconds or None for never expiring); the first match wins
+DEFAULT_TTL_RULES: List[Tuple[Pattern, Optional[int]]] = [
+    (re.compile(r"/schedule/"), HOUR),
+    (re.compile(r"-Stats"), HOUR),
+    (re.compile(r"/matchlogs/"), 6 * HOUR),
+    (re.compile(r""), DAY),
+]
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str] = None
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPCache:
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        ttl_rules: List[Tuple[Pattern, Optional[int]]] = DEFAULT_TTL_RULES,
+        offline: bool = OFFLINE
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_rules = ttl_rules
+        self.offline = offline
+
+    def ttl_for(self, url: str) -> Optional[int]:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return DAY
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.gz"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, url: str) -> Tuple[Optional[Dict], Optional[bytes]]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with gzip.open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_meta(self, meta_path: str, meta: Dict) -> None:
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_path, meta_path = self._paths(url)
+        tmp_path = body_path + ".tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, body_path)
+        self._write_meta(meta_path, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "fetched_at": time.time(),
+        })
+
+    def invalidate(self, url: str) -> None:
+        """Drop a cached response, e.g. after it failed validation."""
+        for path in self._paths(url):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        before_request: Optional[Callable[[], None]] = None
+    ) -> CachedResponse:
+        """
+        Fetch a URL through the cache.
+
+        Args:
+            url (str): The URL to fetch.
+            session (requests.Session, optional): Session used for network requests.
+            headers (Dict[str, str], optional): Extra request headers.
+            timeout (float): Network timeout in seconds.
+            before_request (Callable, optional): Called right before any network request, e.g. a rate limiter.
+
+        Returns:
+            CachedResponse: The response; from_cache tells whether the body came from disk.
+
+        Raises:
+            CacheMiss: In offline mode, if the URL is not cached.
+            requests.RequestException: If the network request fails.
+        """
+        meta, body = self._load(url)
+        if meta is not None:
+            ttl = self.ttl_for(url)
+            is_fresh = ttl is None or time.time() - meta["fetched_at"] < ttl
+            if self.offline or is_fresh:
+                return CachedResponse(url, 200, body, meta.get("encoding"), from_cache=True)
+        elif self.offline:
+            raise CacheMiss(f"Offline and no cached response for {url}")
+
+        request_headers = dict(headers or {})
+        if meta is not None:
+            # Revalidate the stale entry instead of downloading it again
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        if before_request is not None:
+            before_request()
+        response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and meta is not None:
+            meta["fetched_at"] = time.time()
+            self._write_meta(self._paths(url)[1], meta)
+            return CachedResponse(url, 200, body, meta.get("encoding"), from_cache=True)
+
+        if response.status_code == 200:
+            self._store(url, response)
+        return CachedResponse(url, response.status_code, response.content, response.encoding)
+
+
+_default_cache = None
+
+
+def cached_get(url: str, **kwargs) -> CachedResponse:
+    """Fetch a URL through the process-wide default cache; see HTTPCache.get."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HTTPCache()
+    return _default_cache.get(url, **kwargs)
@@ -1,5 +1,5 @@
-from data_cleaner import load_data, clean_data
-from database_manager import DatabaseManager
+from scripts.data_cleaner import load_data, clean_data
+from scripts.database_manager import DatabaseManager
 
 def main():
     df = load_data()
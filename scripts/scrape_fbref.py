@@ -1,21 +1,33 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import re
+import threading
 import time
 import random
 from requests.adapters import HTTPAdapter, Retry
 import traceback
 import pandas as pd
 import os
+from scripts.http_cache import HTTPCache, CacheMiss, DEFAULT_TTL_RULES
+from scripts.html_tables import strain_tables, parse_table, extract_columns
 
 # Constants
-BASE_URL = "https://fbref.com/en"
+BASE_URL = os.getenv("FBREF_BASE_URL", "https://fbref.com/en")  # Point at scripts.fixture_server to scrape offline
 SEASON = "2024-2025"
 PL_STATS_URL = f"{BASE_URL}/comps/9/{SEASON}/{SEASON}-Premier-League-Stats#all_results{SEASON}91"
 COMPETITION = "c9" # 9: Premier League
 MAX_RETRIES = 5
 BACKOFF_FACTOR = 0.3
+MAX_WORKERS = 6  # One per match log type
+REQUESTS_PER_SECOND = float(os.getenv("FBREF_REQUESTS_PER_SECOND", 0.3))  # Global budget shared by all workers
+BURST = 2
+# Match logs of finished seasons never change, so they never expire
+TTL_RULES = [(re.compile(rf"/(?!{SEASON}/)\d{{4}}-\d{{4}}/matchlogs/"), None)] + DEFAULT_TTL_RULES
+HTTP_CACHE = HTTPCache(ttl_rules=TTL_RULES)
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
@@ -32,48 +44,102 @@ COLUMNS_TO_KEEP = {
     "possession": ["Date", "Poss", "Touches", "Att 3rd", "Att Pen", "Att", "Succ", "Succ%", "Carries", "TotDist", "PrgDist", "PrgC", "1/3", "Dis"]
 }
 
-def get_soup(url: str) -> BeautifulSoup:
+class RateLimiter:
     """
-    Fetch the HTML content of a URL and return a BeautifulSoup object.
+    Thread-safe token bucket shared by every request of a scrape.
+
+    Tokens refill at `rate` per second up to `burst`; acquire() blocks until a
+    token is available, so concurrent workers never exceed the global budget.
+    """
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session, creating it on first use.
+
+    The session keeps a connection pool large enough for MAX_WORKERS threads
+    and retries transient HTTP errors with backoff.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+
+def fetch_html(url: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    """
+    Fetch the HTML source of a URL.
+    
+    Responses go through the on-disk HTTP cache, so fresh pages are served
+    without a request and only network requests draw from the rate limiter.
     
     Args:
         url (str): The URL to fetch.
+        rate_limiter (RateLimiter, optional): Budget to draw a token from before each attempt.
     
     Returns:
-        BeautifulSoup: Parsed HTML content.
-    
-    Raises:
-        requests.RequestException: If there's an error fetching the URL.
+        str | None: Page source, or None if it could not be fetched.
     """
     print(f"Attempting to fetch URL: {url}")
-    session = requests.Session()
-    retry = Retry(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
+    session = get_session()
     
     for attempt in range(MAX_RETRIES):
         try:
-            if attempt > 0:  # Add delay before retries
-                time.sleep(3 + random.uniform(0, 1))
-            
             headers = {'User-Agent': random.choice(USER_AGENTS)}
             print(f"Request attempt {attempt + 1} with User-Agent: {headers['User-Agent']}")
-            response = session.get(url, headers=headers, timeout=30)
+            response = HTTP_CACHE.get(
+                url,
+                session=session,
+                headers=headers,
+                timeout=30,
+                before_request=rate_limiter.acquire if rate_limiter is not None else None
+            )
             response.raise_for_status()
+            html = response.text
             
-            # Check if the response content is valid HTML
-            if not response.text.strip().startswith('<!DOCTYPE html>'):
+            # Check if the response content is valid HTML, without parsing the whole page
+            if not html.strip().startswith('<!DOCTYPE html>'):
+                HTTP_CACHE.invalidate(url)
                 raise ValueError("Response content is not valid HTML")
+            if '<body' not in html:
+                HTTP_CACHE.invalidate(url)
+                raise ValueError("Response content does not contain a body element")
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Check if the parsed content contains expected elements
-            if not soup.find('body'):
-                raise ValueError("Parsed content does not contain a body element")
-            
-            print(f"Successfully fetched and parsed URL: {url}")
-            return soup
+            source = "cache" if response.from_cache else "network"
+            print(f"Successfully fetched URL from {source}: {url}")
+            return html
+        except CacheMiss as e:
+            print(f"{e}")
+            return None
         except (requests.RequestException, ValueError) as e:
             print(f"Error fetching or parsing URL {url} (attempt {attempt + 1}): {e}")
             if attempt < MAX_RETRIES - 1:
@@ -84,9 +150,15 @@ def get_soup(url: str) -> BeautifulSoup:
                 print(f"Max retries reached. Unable to fetch or parse URL: {url}")
                 return None
 
-    # Add delay after successful request
-    time.sleep(3 + random.uniform(0, 1))
-    return soup
+def get_soup(url: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[BeautifulSoup]:
+    """
+    Fetch a URL and parse the whole page into a BeautifulSoup object.
+    
+    The scraper itself only parses the tables it needs (see html_tables);
+    this is kept for ad hoc use on full pages.
+    """
+    html = fetch_html(url, rate_limiter)
+    return BeautifulSoup(html, "html.parser") if html else None
 
 def get_team_names_and_id(soup: BeautifulSoup) -> List[Tuple[str, str]]:
     """
@@ -111,6 +183,33 @@ def get_team_names_and_id(soup: BeautifulSoup) -> List[Tuple[str, str]]:
                 teams.append((team_name, team_id))
     return teams
 
+def get_matches_played(soup: BeautifulSoup) -> Dict[str, int]:
+    """
+    Extract the number of matches each team has played from the Premier League table.
+    
+    Args:
+        soup (BeautifulSoup): Parsed HTML content of the Premier League stats page.
+    
+    Returns:
+        Dict[str, int]: Matches played keyed by the team name used in the match logs.
+    """
+    matches_played = {}
+    pl_table = soup.find("table", {"id": f"results{SEASON}91_overall"})
+    if pl_table:
+        for row in pl_table.find_all("tr")[1:]:  # Skip the header row
+            team_cell = row.find("td", {"data-stat": "team"})
+            games_cell = row.find("td", {"data-stat": "games"})
+            if team_cell and team_cell.find("a") and games_cell and games_cell.text.strip().isdigit():
+                team_name = team_cell.find("a")["href"].split("/")[-1].replace("-Stats", "")
+                matches_played[team_name] = int(games_cell.text.strip())
+    return matches_played
+
+def load_existing_match_logs(csv_path: str) -> Optional[pd.DataFrame]:
+    """Read previously scraped match logs as strings, exactly as they were scraped."""
+    if not os.path.exists(csv_path):
+        return None
+    return pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+
 def get_match_log_urls(team: Tuple[str, str]) -> Dict[str, str]:
     """
     Generate URLs for different match log types for a given team.
@@ -134,90 +233,190 @@ def get_match_log_urls(team: Tuple[str, str]) -> Dict[str, str]:
         "possession": f"{base_match_log_url}/possession/{team_name}-Match-Logs-Premier-League",
     }
 
-def scrape_match_logs():
+def parse_match_log(html: str, team_name: str, log_type: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Extract the rows of a team's match log table.
+    
+    Only the matchlogs_for table is parsed; the rest of the page is skipped.
+    
+    Args:
+        html (str): Match log page source.
+        team_name (str): Team name, used in log messages.
+        log_type (str): Match log type, selecting the columns to keep.
+    
+    Returns:
+        List[Dict[str, str]] | None: One dict of kept columns per match, or None if the table is unusable.
+    """
+    stats_table = parse_table(html, "matchlogs_for")
+    if not stats_table:
+        print(f"  No stats table found for {team_name} - {log_type}")
+        return None
+
+    columns_to_keep = COLUMNS_TO_KEEP.get(log_type, [])
+    if not columns_to_keep:
+        print(f"  No columns defined for log type: {log_type}")
+        return None
+
+    columns = extract_columns(stats_table, columns_to_keep)
+    if columns is None:
+        print(f"  Not enough rows in stats table for {team_name} - {log_type}")
+        return None
+
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+def fetch_match_log(team: Tuple[str, str], log_type: str, url: str, rate_limiter: RateLimiter) -> Optional[List[Dict[str, str]]]:
+    """Fetch and parse one match log page; runs on a worker thread."""
+    print(f"  Scraping {log_type} data from {url}")
+    html = fetch_html(url, rate_limiter)
+    if not html:
+        print(f"  Failed to fetch {log_type} data for {team[0]}")
+        return None
+    return parse_match_log(html, team[0], log_type)
+
+def add_match_log(
+    all_match_data: Dict[str, Dict[str, str]],
+    team_name: str,
+    log_type: str,
+    matches: List[Dict[str, str]],
+    since: Optional[str] = None
+) -> int:
+    """
+    Merge parsed match log rows into all_match_data, keyed on {Date}_{Team}.
+    
+    Args:
+        all_match_data (Dict[str, Dict[str, str]]): Rows collected so far, updated in place.
+        team_name (str): Team the match log belongs to.
+        log_type (str): Match log type, used to prefix the stat columns.
+        matches (List[Dict[str, str]]): Output of parse_match_log.
+        since (str, optional): Only keep matches dated after this YYYY-MM-DD date.
+    
+    Returns:
+        int: Number of matches merged.
+    """
+    merged = 0
+    for match_data in matches:
+        if since is not None and match_data['Date'] <= since:
+            continue
+        merged += 1
+        match_key = f"{match_data['Date']}_{team_name}"
+        
+        if match_key not in all_match_data:
+            all_match_data[match_key] = {
+                "Date": match_data['Date'],
+                "Team": team_name,
+            }
+        
+        # Add venue and opponent info if it's not already there (only for shooting log type)
+        if log_type == "shooting":
+            venue = match_data.get('Venue', '')
+            all_match_data[match_key]['Venue'] = venue
+            all_match_data[match_key]['Opponent'] = match_data.get('Opponent', '')
+        
+        # Add stats for this log type
+        for key, value in match_data.items():
+            if key not in ['Date', 'Venue', 'Opponent']:
+                all_match_data[match_key][f"{log_type}_{key}"] = value
+    return merged
+
+def scrape_match_logs(
+    csv_path: str = os.path.join('data/backups', 'match_logs.csv'),
+    max_workers: int = MAX_WORKERS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    burst: int = BURST,
+    incremental: bool = False
+):
+    """
+    Scrape every team's match logs and save them to csv_path.
+    
+    Pages are fetched on a thread pool sharing one pooled session, with a
+    global token bucket instead of fixed sleeps. Results are merged in team
+    and log type order, so the output does not depend on completion order.
+    
+    In incremental mode the existing CSV is read first. Teams whose match
+    count already equals the matches played in the league table are skipped
+    entirely; for the others only matches after the team's latest stored
+    date are kept. New rows are merged into the existing ones on the
+    {Date}_{Team} match key.
+    
+    Args:
+        csv_path (str): Where to write the combined match logs.
+        max_workers (int): Number of concurrent fetches.
+        requests_per_second (float): Global request budget.
+        burst (int): Requests allowed back to back before the budget applies.
+        incremental (bool): Only fetch and append matches newer than those in csv_path.
+    
+    Returns:
+        pd.DataFrame | None: The scraped match logs, or None on failure.
+    """
     print("Starting to scrape match logs...")
+    rate_limiter = RateLimiter(requests_per_second, burst)
     try:
-        soup = get_soup(PL_STATS_URL)
-        if not soup:
+        html = fetch_html(PL_STATS_URL, rate_limiter)
+        if not html:
             print(f"Failed to fetch the main page: {PL_STATS_URL}")
             return
+        soup = strain_tables(html, f"results{SEASON}91_overall")
 
         teams = get_team_names_and_id(soup)
         print(f"Found {len(teams)} teams")
         
+        existing = load_existing_match_logs(csv_path) if incremental else None
+        latest_dates = {}
+        if existing is not None and not existing.empty:
+            latest_dates = existing.groupby("Team")["Date"].max().to_dict()
+            stored_counts = existing.groupby("Team").size().to_dict()
+            matches_played = get_matches_played(soup)
+            # Teams without a count in the league table are always refreshed
+            up_to_date = [
+                team for team in teams
+                if team[0] in matches_played and stored_counts.get(team[0], 0) >= matches_played[team[0]]
+            ]
+            teams = [team for team in teams if team not in up_to_date]
+            print(f"Incremental mode: {len(up_to_date)} teams up to date, fetching {len(teams)}")
+        
         all_match_data = {}
 
-        for team in teams:
-            print(f"Processing team: {team[0]}")
-            match_log_urls = get_match_log_urls(team)
-            team_match_count = 0
-
-            for log_type, url in match_log_urls.items():
-                print(f"  Scraping {log_type} data from {url}")
-                soup = get_soup(url)
-                if not soup:
-                    print(f"  Failed to fetch {log_type} data for {team[0]}")
-                    continue
-                stats_table = soup.find("table", {"id": "matchlogs_for"})
-                if not stats_table:
-                    print(f"  No stats table found for {team[0]} - {log_type}")
-                    continue
-
-                rows = stats_table.find_all("tr")
-                if len(rows) < 3:
-                    print(f"  Not enough rows in stats table for {team[0]} - {log_type}")
-                    continue
-
-                headers = [th.text.strip() for th in rows[1].find_all("th")]
-                columns_to_keep = COLUMNS_TO_KEEP.get(log_type, [])
-                if not columns_to_keep:
-                    print(f"  No columns defined for log type: {log_type}")
-                    continue
-
-                indices_to_keep = [i for i, col in enumerate(headers) if col in columns_to_keep]
-
-                log_type_match_count = 0
-                for row in rows[2:-1]:
-                    cells = row.find_all(["th", "td"])
-                    if len(cells) > max(indices_to_keep):
-                        match_data = {headers[i]: cells[i].text.strip() for i in indices_to_keep}
-                        match_key = f"{match_data['Date']}_{team[0]}"
-                        
-                        if match_key not in all_match_data:
-                            all_match_data[match_key] = {
-                                "Date": match_data['Date'],
-                                "Team": team[0],
-                            }
-                        
-                        # Add venue and opponent info if it's not already there (only for shooting log type)
-                        if log_type == "shooting":
-                            venue = match_data.get('Venue', '')
-                            all_match_data[match_key]['Venue'] = venue
-                            all_match_data[match_key]['Opponent'] = match_data.get('Opponent', '')
-                        
-                        # Add stats for this log type
-                        for key, value in match_data.items():
-                            if key not in ['Date', 'Venue', 'Opponent']:
-                                all_match_data[match_key][f"{log_type}_{key}"] = value
-                        
-                        log_type_match_count += 1
-
-                team_match_count += log_type_match_count
-                print(f"  Extracted {log_type_match_count} matches for {team[0]} - {log_type}")
-                
-                time.sleep(3 + random.uniform(0, 1))
-        
-            print(f"Total matches extracted for {team[0]}: {team_match_count}")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                team: {
+                    log_type: executor.submit(fetch_match_log, team, log_type, url, rate_limiter)
+                    for log_type, url in get_match_log_urls(team).items()
+                }
+                for team in teams
+            }
+
+            for team, team_futures in futures.items():
+                print(f"Processing team: {team[0]}")
+                team_match_count = 0
+
+                for log_type, future in team_futures.items():
+                    matches = future.result()
+                    if matches is None:
+                        continue
+                    log_type_match_count = add_match_log(
+                        all_match_data, team[0], log_type, matches, since=latest_dates.get(team[0])
+                    )
+                    team_match_count += log_type_match_count
+                    print(f"  Extracted {log_type_match_count} matches for {team[0]} - {log_type}")
+            
+                print(f"Total matches extracted for {team[0]}: {team_match_count}")
 
         df = pd.DataFrame(list(all_match_data.values()))
         
         print(f"Created DataFrame with {len(df)} rows and {len(df.columns)} columns.")
 
-        # Create 'data' directory if it doesn't exist
-        os.makedirs('data', exist_ok=True)
+        if existing is not None:
+            # New rows replace stored ones with the same {Date}_{Team} key
+            columns = list(existing.columns) + [col for col in df.columns if col not in existing.columns]
+            df = pd.concat([existing, df], ignore_index=True).reindex(columns=columns)
+            df = df.drop_duplicates(subset=["Date", "Team"], keep="last")
+            print(f"Merged with existing match logs: {len(df)} rows")
 
-        # Save DataFrame to CSV in the 'data' directory
-        csv_path = os.path.join('data/backups', 'match_logs.csv')
+        # Create the output directory if it doesn't exist
+        os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+
+        # Save DataFrame to CSV
         df.to_csv(csv_path, index=False)
         print(f"Saved DataFrame to {csv_path}")
 
@@ -229,7 +428,15 @@ def scrape_match_logs():
         return None
 
 if __name__ == "__main__":
-    match_logs_df = scrape_match_logs()
+    parser = argparse.ArgumentParser(description="Scrape Premier League match logs from FBref")
+    parser.add_argument("--output", default=os.path.join('data/backups', 'match_logs.csv'))
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="Requests per second across all workers")
+    parser.add_argument("--burst", type=int, default=BURST)
+    parser.add_argument("--incremental", action="store_true", help="Only fetch matches newer than those in --output")
+    args = parser.parse_args()
+
+    match_logs_df = scrape_match_logs(args.output, args.workers, args.rate, args.burst, args.incremental)
 
 
 
@@ -1,14 +1,32 @@
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, select, table, column, text
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
+# Declared at read time so pandas does not re-infer types column by column. Counts
+# are nullable, so a NULL (e.g. a match not played yet) reads as <NA> instead of
+# failing the cast
+MATCH_LOG_DTYPES = {
+    'goals_for': 'Int64',
+    'goals_against': 'Int64',
+    'shots': 'Int64',
+    'shots_on_target': 'Int64',
+    'shooting_xG': 'float64',
+    'expected_goals_non_penalty': 'float64',
+    'possession': 'float64',
+}
 
-def load_from_database(table_name='match_logs'):
+
+def database_url():
+    """Build the database URL from the environment; DB_URL takes precedence"""
 
     # Load environment variables
     load_dotenv()
 
+    if os.getenv('DB_URL'):
+        return os.getenv('DB_URL')
+
     # Database connection parameters
     db_params = {
         'database': os.getenv('DB_NAME'),
@@ -17,17 +35,83 @@ def load_from_database(table_name='match_logs'):
         'host': os.getenv('DB_HOST'),
         'port': os.getenv('DB_PORT')
     }
+    return f"postgresql://{db_params['user']}:{db_params['password']}@{db_params['host']}:{db_params['port']}/{db_params['database']}"
+
+
+def database_configured():
+    """Whether a database is configured, through DB_URL or the PostgreSQL parameters"""
+    load_dotenv()
+    return bool(os.getenv('DB_URL')) or all(os.getenv(name) for name in ('DB_NAME', 'DB_USER', 'DB_HOST', 'DB_PORT'))
+
+
+@lru_cache(maxsize=None)
+def get_engine(url=None):
+    """Return the process-wide pooled engine for a URL, creating it on first use"""
+    return create_engine(url or database_url(), pool_pre_ping=True)
+
+
+def season_bounds(season):
+    """Date range covered by a season such as '2024-2025'"""
+    start_year, end_year = season.split('-')
+    return f"{start_year}-07-01", f"{end_year}-06-30"
+
+
+def load_from_database(table_name='match_logs', columns=None, start_date=None, end_date=None, season=None, chunksize=None):
+    """
+    Read match logs from the database.
+
+    Column selection and date predicates are pushed into the SQL query, so
+    only the needed rows and columns leave the database.
+
+    Args:
+        table_name (str): Table to read.
+        columns (List[str] | None): Columns to select; all columns if None.
+        start_date (str | datetime | None): Earliest date to include.
+        end_date (str | datetime | None): Latest date to include.
+        season (str | None): Season such as '2024-2025'; narrows the date range.
+        chunksize (int | None): Stream rows from a server-side cursor in chunks of this size.
+
+    Returns:
+        pd.DataFrame: The selected match logs.
+    """
+    # Dates are compared as YYYY-MM-DD strings, which works for both DATE and text columns
+    start_date = pd.Timestamp(start_date).strftime('%Y-%m-%d') if start_date is not None else None
+    end_date = pd.Timestamp(end_date).strftime('%Y-%m-%d') if end_date is not None else None
+    if season is not None:
+        season_start, season_end = season_bounds(season)
+        start_date = max(start_date, season_start) if start_date else season_start
+        end_date = min(end_date, season_end) if end_date else season_end
+
+    if columns is None:
+        source = table(table_name, column('date'))
+        query = select(text('*')).select_from(source)
+    else:
+        source = table(table_name, *[column(col) for col in columns], column('date'))
+        query = select(*[source.c[col] for col in columns])
+
+    if start_date is not None:
+        query = query.where(source.c.date >= start_date)
+    if end_date is not None:
+        query = query.where(source.c.date <= end_date)
+
+    # Read data from the database
+    with get_engine().connect() as conn:
+        # dtype may only name selected columns, so SELECT * looks the table's columns up first
+        selected = columns if columns is not None else [col['name'] for col in inspect(conn).get_columns(table_name)]
+        dtype = {col: MATCH_LOG_DTYPES[col] for col in selected if col in MATCH_LOG_DTYPES} or None
+        if chunksize:
+            conn = conn.execution_options(stream_results=True)
+            chunks = pd.read_sql_query(query, conn, chunksize=chunksize, dtype=dtype)
+            df = pd.concat(chunks, ignore_index=True)
+        else:
+            df = pd.read_sql_query(query, conn, dtype=dtype)
 
-    # Create SQLAlchemy engine
-    engine = create_engine(f"postgresql://{db_params['user']}:{db_params['password']}@{db_params['host']}:{db_params['port']}/{db_params['database']}")
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
 
-    # Read data from PostgreSQL
-    query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql_query(query, engine)
-    
     print(f"Loaded {len(df)} rows from {table_name}")
     return df
 
 if __name__ == "__main__":
     df = load_from_database()
-    print(f"DataFrame columns: {df.columns.tolist()}")
\ No newline at end of file
+    print(f"DataFrame columns: {df.columns.tolist()}")
@@ -0,0 +1,123 @@
+"""
+Adaptive-length NUTS sampling.
+
+Instead of a fixed number of draws, the chains are sampled in chunks and the
+convergence diagnostics of the parameters used for prediction are checked
+after each one. Sampling stops as soon as R-hat and bulk/tail ESS meet their
+targets, or when the draw budget is spent. Divergences are logged but do not
+hold sampling up, since more draws do not remove them. The first chunk tunes
+the sampler; later chunks continue every chain from its last draw with the
+step size and (diagonal) mass matrix fixed from the first chunk, so they
+extend the same Markov chains. One NUTS step, compiled once, serves every
+chunk; a warm refit passes in its own step and initial points.
+
+    trace = sample_model(model, samples=5000, adaptive=True)  # at most 5000 draws per chain
+    python -m src.modeling.warm_start --adaptive
+    python -m src.pipeline --adaptive
+"""
+import time
+
+import numpy as np
+
+from src.modeling.compiled_model import reset_nuts_step
+from src.modeling.warm_start import MAX_RHAT, MIN_ESS, convergence_report, warm_start_state
+
+CHUNK_SIZE = 250
+
+
+def _concat_draws(traces):
+    """Join chunk traces along the draw dimension, renumbering the draws"""
+    import arviz as az
+
+    offset = 0
+    renumbered = []
+    for trace in traces:
+        n_draws = trace.posterior.sizes['draw']
+        draws = np.arange(offset, offset + n_draws)
+        renumbered.append(az.InferenceData(**{
+            group: trace[group].assign_coords(draw=draws)
+            for group in ('posterior', 'sample_stats') if group in trace
+        }))
+        offset += n_draws
+    combined = az.concat(renumbered, dim='draw')
+    # Groups without a draw dimension are the same for every chunk
+    for group in traces[0].groups():
+        if group not in combined.groups():
+            combined.add_groups({group: traces[0][group]})
+    return combined
+
+
+def sample_adaptive(model, max_draws=5000, tune=1000, chunk_size=CHUNK_SIZE, cores=4, chains=None,
+                    max_rhat=MAX_RHAT, min_ess=MIN_ESS, random_seed=None, step=None, initvals=None):
+    """
+    Sample in chunks until the convergence targets are met.
+
+    Args:
+        model (pm.Model): Model from build_model.
+        max_draws (int): Most draws per chain before giving up on the targets.
+        tune (int): Tuning steps per chain, spent before the first chunk only.
+        chunk_size (int): Draws per chain between diagnostic checks.
+        cores (int): Chains sampled in parallel.
+        chains (int | None): Number of chains; defaults to max(cores, 2).
+        max_rhat (float): Largest acceptable R-hat.
+        min_ess (float): Smallest acceptable bulk and tail ESS.
+        random_seed (int | None): Seed of the first chunk; later chunks use the following integers.
+        step (pm.NUTS | None): Step of the first chunk, e.g. a warm-started one; its
+            tuned state is then frozen in place for the later chunks. A new NUTS
+            step if None.
+        initvals (List[dict] | None): Initial point per chain of the first chunk.
+
+    Returns:
+        az.InferenceData: All draws of all chunks.
+    """
+    import pymc as pm
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiag
+
+    chains = chains or max(cores, 2)
+    traces = []
+    frozen = False
+    total = 0
+    start = time.perf_counter()
+    while total < max_draws:
+        draws = min(chunk_size, max_draws - total)
+        seed = None if random_seed is None else random_seed + len(traces)
+        chunk_start = time.perf_counter()
+        # pymc's own convergence warnings are skipped; convergence_report is logged per chunk instead
+        with model:
+            if not frozen:
+                step = step if step is not None else pm.NUTS(vars=model.value_vars)
+                chunk = pm.sample(draws=draws, tune=tune, step=step, initvals=initvals, chains=chains, cores=cores,
+                                  random_seed=seed, return_inferencedata=True, progressbar=False,
+                                  compute_convergence_checks=False)
+                # Freeze the dual-averaged step size and the first chunk's variances for the remaining chunks
+                state = warm_start_state(model, chunk)
+                reset_nuts_step(step, model, potential=QuadPotentialDiag(state['variance']),
+                                step_size=state['step_size'])
+                frozen = True
+            else:
+                initvals = warm_start_state(model, traces[-1])['initvals']
+                chunk = pm.sample(draws=draws, tune=0, step=step, initvals=initvals, chains=chains, cores=cores,
+                                  random_seed=seed, return_inferencedata=True, progressbar=False,
+                                  compute_convergence_checks=False)
+        traces.append(chunk)
+        total += draws
+
+        trace = _concat_draws(traces) if len(traces) > 1 else chunk
+        report = convergence_report(trace, max_rhat=max_rhat, min_ess=min_ess)
+        converged = (
+            report['max_rhat'] <= max_rhat
+            and report['min_ess_bulk'] >= min_ess
+            and report['min_ess_tail'] >= min_ess
+        )
+        print(
+            f"Chunk {len(traces)}: {total} draws/chain in {time.perf_counter() - chunk_start:.1f}s "
+            f"({time.perf_counter() - start:.1f}s total), max R-hat {report['max_rhat']:.3f}, "
+            f"min ESS bulk {report['min_ess_bulk']:.0f} / tail {report['min_ess_tail']:.0f}, "
+            f"{report['divergences']} divergences"
+        )
+        if converged:
+            print(f"Convergence targets met after {total} draws per chain")
+            return trace
+
+    print(f"Convergence targets not met within {max_draws} draws per chain")
+    return trace
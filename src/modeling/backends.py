@@ -0,0 +1,151 @@
+"""
+Inference backends for the match model.
+
+NUTS through pm.sample is the reference. The alternatives trade accuracy for
+speed in interactive "what if" runs and large backtests:
+
+    advi        mean-field ADVI, pm.fit
+    pathfinder  Pathfinder variational fit (needs pymc-extras)
+    laplace     MAP estimate with a Gaussian from the Hessian at the mode
+    numpyro     JAX NUTS via numpyro on CPU (needs jax and numpyro)
+    blackjax    JAX NUTS via blackjax on CPU (needs jax and blackjax)
+
+Every backend returns InferenceData with a posterior group of
+(chain, draw, ...) arrays, so extract_posterior and predict_match work
+unchanged.
+"""
+import numpy as np
+
+BACKENDS = ['nuts', 'advi', 'pathfinder', 'laplace', 'numpyro', 'blackjax']
+
+# Optimisation steps for the variational fits
+ADVI_ITERATIONS = 30000
+
+# Finite-difference step for the Laplace Hessian, in unconstrained units
+HESSIAN_STEP = 1e-4
+
+
+def fit_advi(model, samples=2000, iterations=ADVI_ITERATIONS, random_seed=None):
+    """Mean-field ADVI fit, returning samples drawn from the approximation"""
+    import pymc as pm
+
+    with model:
+        approx = pm.fit(n=iterations, method='advi', random_seed=random_seed, progressbar=False)
+        return approx.sample(samples, random_seed=random_seed)
+
+
+def fit_pathfinder(model, samples=2000, random_seed=None):
+    """Pathfinder variational fit from pymc-extras"""
+    try:
+        import pymc_extras as pmx
+    except ImportError as e:
+        raise ImportError("The pathfinder backend needs pymc-extras: pip install pymc-extras") from e
+
+    with model:
+        return pmx.fit(method='pathfinder', num_draws=samples, random_seed=random_seed, progressbar=False)
+
+
+def fit_laplace(model, samples=2000, random_seed=None):
+    """
+    Laplace approximation: a Gaussian centred on the MAP estimate with the
+    inverse Hessian of the negative log posterior as covariance.
+
+    Draws are taken in the unconstrained space and mapped back through the
+    model, so transformed variables and deterministics come out as pm.sample
+    would store them.
+    """
+    import arviz as az
+    import pymc as pm
+    from pymc.blocking import DictToArrayBijection
+
+    with model:
+        map_point = pm.find_MAP(progressbar=False)
+    value_vars = model.value_vars
+    mode = DictToArrayBijection.map({var.name: map_point[var.name] for var in value_vars})
+
+    # Central differences of the compiled gradient; compiling the symbolic
+    # Hessian costs far more than the 2n gradient evaluations
+    dlogp = model.compile_dlogp([model.values_to_rvs[var] for var in value_vars])
+    n = len(mode.data)
+    hessian = np.empty((n, n))
+    for i in range(n):
+        step = np.zeros(n)
+        step[i] = HESSIAN_STEP
+        forward = dlogp(DictToArrayBijection.rmap(mode._replace(data=mode.data + step)))
+        backward = dlogp(DictToArrayBijection.rmap(mode._replace(data=mode.data - step)))
+        hessian[:, i] = -(forward - backward) / (2 * HESSIAN_STEP)
+    hessian = (hessian + hessian.T) / 2
+
+    covariance = np.linalg.inv(hessian)
+    # Symmetrise against round-off before factorising
+    covariance = (covariance + covariance.T) / 2
+
+    rng = np.random.default_rng(random_seed)
+    flat_draws = rng.multivariate_normal(mode.data, covariance, size=samples, method='cholesky')
+
+    outputs = model.unobserved_value_vars
+    point_fn = model.compile_fn(outputs, inputs=value_vars, on_unused_input='ignore', point_fn=False)
+    names = [var.name for var in outputs]
+    draws = {name: [] for name in names}
+    for flat in flat_draws:
+        point = DictToArrayBijection.rmap(mode._replace(data=flat))
+        for name, value in zip(names, point_fn(*[point[var.name] for var in value_vars])):
+            draws[name].append(value)
+
+    # Keep the variables pm.sample reports, dropping the unconstrained copies
+    keep = {var.name for var in model.free_RVs + model.deterministics}
+    posterior = {name: np.asarray(values)[None] for name, values in draws.items() if name in keep}
+    return az.from_dict(posterior=posterior)
+
+
+def fit_jax_nuts(model, sampler, samples=2000, tune=1000, chains=4, random_seed=None):
+    """NUTS compiled with JAX (numpyro or blackjax), chains vectorised on one CPU device"""
+    import pymc as pm
+
+    try:
+        import jax  # noqa: F401
+    except ImportError as e:
+        raise ImportError(f"The {sampler} backend needs jax and {sampler}: pip install jax {sampler}") from e
+
+    with model:
+        return pm.sample(
+            draws=samples,
+            tune=tune,
+            chains=chains,
+            nuts_sampler=sampler,
+            nuts_sampler_kwargs={'chain_method': 'vectorized'},
+            random_seed=random_seed,
+            progressbar=False,
+        )
+
+
+def fit(model, backend, samples=2000, tune=1000, cores=4, random_seed=None):
+    """
+    Fit the model with the named backend.
+
+    Args:
+        model (pm.Model): Model from build_model.
+        backend (str): One of BACKENDS.
+        samples (int): Posterior draws (per chain for the NUTS backends).
+        tune (int): Tuning steps per chain; ignored by the approximate backends.
+        cores (int): Parallel chains for pm.sample; the JAX backends run this many chains vectorised.
+        random_seed (int | None): Seed for reproducible fits.
+
+    Returns:
+        az.InferenceData: Posterior draws.
+    """
+    if backend == 'nuts':
+        import pymc as pm
+
+        with model:
+            return pm.sample(draws=samples, tune=tune, cores=cores, random_seed=random_seed,
+                             return_inferencedata=True)
+    if backend == 'advi':
+        return fit_advi(model, samples=samples, random_seed=random_seed)
+    if backend == 'pathfinder':
+        return fit_pathfinder(model, samples=samples, random_seed=random_seed)
+    if backend == 'laplace':
+        return fit_laplace(model, samples=samples, random_seed=random_seed)
+    if backend in ('numpyro', 'blackjax'):
+        return fit_jax_nuts(model, backend, samples=samples, tune=tune, chains=cores, random_seed=random_seed)
+    raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
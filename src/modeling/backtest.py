@@ -0,0 +1,230 @@
+"""
+Walk-forward (rolling-origin) backtest.
+
+The data is prepared once. Each fold refits the model on every fixture
+before its cutoff and predicts the fixtures of the following k weeks, so
+every prediction uses only information available at the time. Folds run in
+parallel in a process pool; each worker receives the prepared arrays once
+and slices them per fold, compiles the model once for all its folds, and
+samples with a fixed number of cores, so workers x cores_per_fold matches
+the machine.
+
+    python -m src.modeling.backtest --every 1 --cores-per-fold 2
+    python -m src.modeling.backtest --season 2024-2025 --backend laplace --output backtest.csv
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.modeling.compiled_model import compiled_model
+from src.modeling.mcmc import load_data, prepare_data, slice_fixtures, set_model_data, sample_model, predict_matches
+from src.modeling.model_evaluation import evaluate_predictions
+
+# Smallest training set for the first fold. fold_cutoffs raises it to n_teams when
+# there are more teams, and starts the first test window the day after the date on
+# which max(MIN_TRAIN_FIXTURES, n_teams) fixtures have been played
+MIN_TRAIN_FIXTURES = 50
+
+# BLAS/OpenMP thread pools, capped at each fold's core count
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+_worker_data = None
+
+
+def fold_cutoffs(dates, every_weeks=1, min_train_fixtures=MIN_TRAIN_FIXTURES, n_teams=0):
+    """
+    Start dates of the test windows.
+
+    The first cutoff is the day after the date on which the training set
+    reaches max(min_train_fixtures, n_teams) fixtures; later ones follow every
+    every_weeks weeks until the last fixture.
+
+    Returns:
+        List[np.datetime64]: Cutoff dates (day precision).
+    """
+    days = np.sort(np.asarray(dates, dtype='datetime64[D]'))
+    needed = max(min_train_fixtures, n_teams)
+    if len(days) <= needed:
+        raise ValueError(f"Need more than {needed} fixtures to backtest, got {len(days)}")
+
+    first = days[needed - 1] + np.timedelta64(1, 'D')
+    step = np.timedelta64(7 * every_weeks, 'D')
+    return list(np.arange(first, days[-1] + np.timedelta64(1, 'D'), step))
+
+
+def _init_worker(data):
+    """Keep the prepared arrays in the worker so folds only send their dates"""
+    global _worker_data
+    _worker_data = data
+
+
+def run_fold(cutoff, window_end, samples, tune, cores, backend, n_recent_matches, seed, data=None):
+    """
+    Fit on fixtures before cutoff and predict those in [cutoff, window_end).
+
+    Returns:
+        pd.DataFrame | None: One row per test fixture with predictions,
+        actual goals and fold timing, or None if the window is empty.
+    """
+    data = data if data is not None else _worker_data
+    dates = data['dates'].astype('datetime64[D]')
+    test_mask = (dates >= cutoff) & (dates < window_end)
+    if not test_mask.any():
+        return None
+
+    train = slice_fixtures(data, dates < cutoff, n_recent_matches)
+    start = time.perf_counter()
+    # The worker's model is built and compiled by its first fold and re-pointed at later ones
+    compiled = compiled_model(train)
+    if backend == 'nuts':
+        trace = compiled.sample(train, samples=samples, tune=tune, cores=cores, random_seed=seed)
+    else:
+        model = set_model_data(compiled.model, train)
+        trace = sample_model(model, samples=samples, tune=tune, cores=cores, backend=backend)
+    seconds = time.perf_counter() - start
+
+    predictions = predict_matches(
+        trace, data['home_teams'][test_mask], data['away_teams'][test_mask], train, random_state=seed
+    )
+    predictions.insert(0, 'cutoff', pd.Timestamp(cutoff))
+    predictions.insert(1, 'date', pd.to_datetime(data['dates'][test_mask]))
+    predictions.insert(2, 'home_team', [data['teams'][i] for i in data['home_teams'][test_mask]])
+    predictions.insert(3, 'away_team', [data['teams'][i] for i in data['away_teams'][test_mask]])
+    predictions['home_goals'] = data['home_goals'][test_mask]
+    predictions['away_goals'] = data['away_goals'][test_mask]
+    predictions['n_train'] = len(train['home_goals'])
+    predictions['fit_seconds'] = seconds
+    return predictions
+
+
+def summarize(predictions):
+    """
+    Metrics per fold, plus the same metrics over all predictions so far at each fold.
+
+    Returns:
+        pd.DataFrame: One row per cutoff with n_test, n_train, fit_seconds and
+        the evaluate_predictions metrics, with cumulative_ prefixed columns
+        for the running totals.
+    """
+    rows = []
+    cutoffs = sorted(predictions['cutoff'].unique())
+    for cutoff in cutoffs:
+        fold = predictions[predictions['cutoff'] == cutoff]
+        seen = predictions[predictions['cutoff'] <= cutoff]
+        row = {
+            'cutoff': cutoff,
+            'n_test': len(fold),
+            'n_train': int(fold['n_train'].iloc[0]),
+            'fit_seconds': float(fold['fit_seconds'].iloc[0]),
+        }
+        row.update(evaluate_predictions(fold, fold))
+        row.update({f'cumulative_{name}': value for name, value in evaluate_predictions(seen, seen).items()})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def backtest(data, every_weeks=1, samples=1000, tune=1000, cores_per_fold=1, workers=None,
+             backend='nuts', n_recent_matches=5, min_train_fixtures=MIN_TRAIN_FIXTURES, seed=0):
+    """
+    Run the walk-forward backtest over prepared data.
+
+    Args:
+        data (dict): Output of prepare_data over the whole backtest period.
+        every_weeks (int): Refit every this many weeks; each fold predicts that many weeks.
+        samples (int): Draws per chain for each fold.
+        tune (int): Tuning steps per chain for each fold.
+        cores_per_fold (int): Cores (and parallel chains) each fold samples with.
+        workers (int | None): Folds run at once; defaults to cpu_count // cores_per_fold.
+        backend (str): Inference backend passed to sample_model.
+        n_recent_matches (int): Window of the per-team average goals used for prediction.
+        min_train_fixtures (int): Fixtures required before the first fold.
+        seed (int): Seed for the outcome simulation in each fold.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Per-fixture predictions and the per-fold summary.
+    """
+    cutoffs = fold_cutoffs(data['dates'], every_weeks, min_train_fixtures, data['n_teams'])
+    window = np.timedelta64(7 * every_weeks, 'D')
+    workers = workers or max(1, (os.cpu_count() or 1) // cores_per_fold)
+    print(f"Backtesting {len(cutoffs)} folds on {workers} workers x {cores_per_fold} cores ({backend})")
+
+    # Spawned workers inherit the environment, so their thread pools are
+    # capped before numpy or pytensor load
+    saved_env = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(cores_per_fold) for name in THREAD_ENV_VARS})
+    context = multiprocessing.get_context('spawn')
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(data,)) as pool:
+            futures = {
+                pool.submit(run_fold, cutoff, cutoff + window, samples, tune, cores_per_fold,
+                            backend, n_recent_matches, seed): cutoff
+                for cutoff in cutoffs
+            }
+            for future in as_completed(futures):
+                fold = future.result()
+                if fold is not None:
+                    print(f"Fold {pd.Timestamp(futures[future]).date()}: {len(fold)} fixtures, "
+                          f"fit in {fold['fit_seconds'].iloc[0]:.1f}s")
+                    results.append(fold)
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    if not results:
+        raise ValueError("No fold had fixtures to predict")
+    predictions = pd.concat(results, ignore_index=True).sort_values(['cutoff', 'date'], kind='mergesort')
+    predictions = predictions.reset_index(drop=True)
+    return predictions, summarize(predictions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--season', default=None, help="Season to backtest, e.g. 2024-2025; all data if omitted")
+    parser.add_argument('--every', type=int, default=1, help="Refit every N weeks")
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--tune', type=int, default=1000)
+    parser.add_argument('--cores-per-fold', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--backend', default='nuts')
+    parser.add_argument('--min-train', type=int, default=MIN_TRAIN_FIXTURES)
+    parser.add_argument('--output', default=None, help="Write per-fixture predictions to this CSV")
+    args = parser.parse_args()
+
+    data = prepare_data(load_data(season=args.season))
+    start = time.perf_counter()
+    predictions, summary = backtest(
+        data,
+        every_weeks=args.every,
+        samples=args.samples,
+        tune=args.tune,
+        cores_per_fold=args.cores_per_fold,
+        workers=args.workers,
+        backend=args.backend,
+        min_train_fixtures=args.min_train,
+    )
+
+    columns = ['cutoff', 'n_train', 'n_test', 'fit_seconds', 'log_loss', 'rps', 'accuracy',
+               'brier_home', 'brier_draw', 'brier_away', 'cumulative_log_loss', 'cumulative_accuracy']
+    print(summary[columns].to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    overall = summary.iloc[-1]
+    print(f"\n{len(predictions)} fixtures in {time.perf_counter() - start:.1f}s: "
+          f"log-loss {overall['cumulative_log_loss']:.3f}, accuracy {overall['cumulative_accuracy']:.3f}, "
+          f"MAE {overall['cumulative_mae_home_goals']:.3f} / {overall['cumulative_mae_away_goals']:.3f}")
+
+    if args.output:
+        predictions.to_csv(args.output, index=False)
+        print(f"Saved predictions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
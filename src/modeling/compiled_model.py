@@ -0,0 +1,154 @@
+"""
+A match model built and compiled once per process.
+
+build_model declares the fixtures as pm.Data containers, so one model and
+one NUTS step (whose construction compiles the log-probability and gradient
+functions) can serve every fold of a backtest, every weekly refit and every
+posterior-predictive run: set_model_data swaps the fixtures in and the
+compiled functions read them from the shared containers.
+
+    compiled = compiled_model(train_data)
+    trace = compiled.sample(train_data, samples=1000, tune=1000)
+    trace = compiled.sample(next_fold_data)  # no rebuild, no recompile
+    print(compiled.timings)
+"""
+import time
+
+import numpy as np
+
+from src.modeling.mcmc import build_model, set_model_data
+
+# One compiled model per team count in this process
+_COMPILED = {}
+
+
+class CompiledModel:
+    def __init__(self, data):
+        start = time.perf_counter()
+        self.model = build_model(data)
+        self.timings = {
+            'build_seconds': time.perf_counter() - start,
+            'compile_seconds': 0.0,
+            'compiles': 0,
+            'sample_seconds': [],
+        }
+        self._step = None
+
+    @property
+    def step(self):
+        """The NUTS step, compiled on first use"""
+        if self._step is None:
+            import pymc as pm
+
+            start = time.perf_counter()
+            with self.model:
+                self._step = pm.NUTS()
+            self.timings['compile_seconds'] += time.perf_counter() - start
+            self.timings['compiles'] += 1
+        return self._step
+
+    def reset_step(self, potential=None, step_size=None):
+        """
+        Point the compiled step at a new mass matrix and initial step size.
+
+        Only the potential and the step size adaptation are replaced; the
+        compiled log-probability and gradient functions are kept. Without
+        arguments the step goes back to NUTS's defaults, as for a cold start.
+
+        Args:
+            potential (QuadPotential | None): Mass matrix to start from; NUTS's
+                default diagonal adaptation if None.
+            step_size (float | None): Initial step size; NUTS's default if None.
+
+        Returns:
+            pm.NUTS: The compiled step, ready to pass to pm.sample.
+        """
+        return reset_nuts_step(self.step, self.model, potential=potential, step_size=step_size)
+
+    def sample(self, data, samples=1000, tune=1000, cores=1, chains=None, random_seed=None):
+        """
+        Sample the posterior for a prepared dataset with the compiled step.
+
+        Args:
+            data (dict): Output of prepare_data (or slice_fixtures) with the model's team count.
+            samples (int): Draws per chain.
+            tune (int): Tuning steps per chain; step size and mass matrix are re-tuned per call.
+            cores (int): Chains sampled in parallel.
+            chains (int | None): Number of chains; defaults to max(cores, 2).
+            random_seed (int | None): Seed for reproducible sampling.
+
+        Returns:
+            az.InferenceData: Posterior trace.
+        """
+        import pymc as pm
+
+        set_model_data(self.model, data)
+        # A warm refit may have left its mass matrix and step size on the shared step
+        step = self.reset_step()
+        start = time.perf_counter()
+        with self.model:
+            trace = pm.sample(
+                draws=samples,
+                tune=tune,
+                chains=chains or max(cores, 2),
+                cores=cores,
+                step=step,
+                random_seed=random_seed,
+                return_inferencedata=True,
+                progressbar=False,
+            )
+        seconds = time.perf_counter() - start
+        self.timings['sample_seconds'].append(seconds)
+        print(f"Sampled {len(data['home_goals'])} fixtures in {seconds:.1f}s "
+              f"(model compiled {self.timings['compiles']}x, {self.timings['compile_seconds']:.1f}s)")
+        return trace
+
+    def posterior_predictive(self, trace, data, random_seed=None):
+        """
+        Simulate home and away goals for a dataset's fixtures from a posterior trace.
+
+        Fixtures without results can carry placeholder goals; the observed
+        values only size the simulated arrays.
+        """
+        import pymc as pm
+
+        set_model_data(self.model, data)
+        with self.model:
+            return pm.sample_posterior_predictive(
+                trace, var_names=['home_goals', 'away_goals'], random_seed=random_seed, progressbar=False
+            )
+
+
+def compiled_model(data):
+    """The process-wide CompiledModel for data's team count, building it on first use"""
+    n_teams = data['n_teams']
+    if n_teams not in _COMPILED:
+        _COMPILED[n_teams] = CompiledModel(data)
+    return _COMPILED[n_teams]
+
+
+def reset_nuts_step(step, model, potential=None, step_size=None):
+    """
+    Replace a NUTS step's potential and step size adaptation in place, keeping its compiled functions.
+
+    pm.sample resets the tuning state at the start of every call, so the
+    potential and step size set here are what the next call starts from.
+    See CompiledModel.reset_step for the arguments.
+    """
+    from pymc.step_methods.hmc.integration import CpuLeapfrogIntegrator
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+    from pymc.step_methods.step_sizes import DualAverageAdaptation
+
+    point = model.initial_point()
+    size = sum(np.size(point[var.name]) for var in step.vars)
+    if potential is None:
+        potential = QuadPotentialDiagAdapt(size, np.zeros(size), np.ones(size), 10, rng=step.rng.spawn(1)[0])
+    if step_size is None:
+        step_size = 0.25 / size ** 0.25
+
+    step.potential = potential
+    step.integrator = CpuLeapfrogIntegrator(potential, step._logp_dlogp_func)
+    step.step_size = step_size
+    # NUTS's default adaptation settings, restarted from the new step size
+    step.step_adapt = DualAverageAdaptation(step_size, step.target_accept, gamma=0.05, k=0.75, t0=10)
+    return step
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+FORM_STATS = ['goals_for', 'shooting_xG', 'possession']
+FORM_WINDOWS = (3, 5, 10)
+
+
+def form_column(stat, window):
+    """Name of the rolling form column for a stat and window"""
+    return f'{stat}_last_{window}'
+
+
+def rolling_form_features(df, windows=FORM_WINDOWS, stats=FORM_STATS):
+    """
+    Compute each team's rolling form as of kickoff for every row of a match log.
+
+    Rows are sorted once by (team, date) and every window is read off the same
+    cumulative sums, so adding windows does not re-scan the frame. A window
+    only covers matches played before the row's date; teams with fewer prior
+    matches are averaged over what is available and teams with none get 0.
+
+    Args:
+        df (pd.DataFrame): Match logs with 'team', 'date' and the stat columns.
+        windows (Iterable[int]): Number of previous matches to average over.
+        stats (Iterable[str]): Columns to build form features for.
+
+    Returns:
+        pd.DataFrame: One column per (stat, window), aligned to df's index.
+    """
+    team_codes = pd.factorize(df['team'])[0]
+    dates = pd.to_datetime(df['date']).to_numpy()
+    order = np.lexsort((dates, team_codes))
+
+    # Position of each sorted row within its team's history
+    sorted_codes = team_codes[order]
+    row_numbers = np.arange(len(order))
+    is_group_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    group_start = np.maximum.accumulate(np.where(is_group_start, row_numbers, 0))
+    position = row_numbers - group_start
+
+    features = {}
+    for stat in stats:
+        values = df[stat].to_numpy(dtype=float)[order]
+        valid = ~np.isnan(values)
+        value_sums = np.r_[0.0, np.cumsum(np.where(valid, values, 0.0))]
+        valid_counts = np.r_[0, np.cumsum(valid)]
+
+        for window in windows:
+            lookback = np.minimum(position, window)
+            total = value_sums[row_numbers] - value_sums[row_numbers - lookback]
+            count = valid_counts[row_numbers] - valid_counts[row_numbers - lookback]
+            form = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+            column = np.empty_like(form)
+            column[order] = form
+            features[form_column(stat, window)] = column
+
+    return pd.DataFrame(features, index=df.index)
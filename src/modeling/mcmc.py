@@ -1,110 +1,205 @@
+import os
 import numpy as np
 import pandas as pd
-from scipy import stats
-import pymc as pm
+from src.modeling.features import FORM_WINDOWS, form_column, rolling_form_features
+from src.modeling.scorelines import MAX_GOALS, scoreline_matrix, market_probabilities
+from src.team_names import normalize_team_names
 
-def load_data():
-    """Load match data from database"""
-    from src.data_loader import load_from_database
-    df = load_from_database('match_logs')
-    
-    # Standardize team names
-    team_name_mapping = {
-        "Nott'ham Forest": "Nottingham-Forest",
-        "Ipswich Town": "Ipswich-Town",
-        "Leicester City": "Leicester-City",
-        "Tottenham": "Tottenham-Hotspur",
-        "Manchester City": "Manchester-City",
-        "Newcastle Utd": "Newcastle-United",
-        "West Ham": "West-Ham-United",
-        "Aston Villa": "Aston-Villa",
-        "Brighton": "Brighton-and-Hove-Albion",
-        "Crystal Palace": "Crystal-Palace",
-        "Wolves": "Wolverhampton-Wanderers",
-        "Manchester Utd": "Manchester-United",
-    }
-    
-    df['team'] = df['team'].replace(team_name_mapping)
-    df['opponent'] = df['opponent'].replace(team_name_mapping)
-    
-    return df
+PAIRED_STATS = ['goals_for', 'shots_on_target', 'shooting_xG', 'possession']
+
+# Columns used by prepare_data and model evaluation; only these are read from the database
+MODEL_COLUMNS = [
+    'date',
+    'team',
+    'opponent',
+    'venue',
+    'goals_for',
+    'goals_against',
+    'shots_on_target',
+    'shooting_xG',
+    'possession',
+]
+
+def load_data(columns=MODEL_COLUMNS, start_date=None, end_date=None, season=None, source=None):
+    """Load match data from the database or the local Parquet snapshot.
+
+    source is 'database' or 'parquet'; it defaults to the DATA_SOURCE
+    environment variable, falling back to 'database'.
+    """
+    source = source or os.getenv('DATA_SOURCE', 'database')
+    if source == 'parquet':
+        from src.snapshot import read_snapshot
+        df = read_snapshot(columns=columns, start_date=start_date, end_date=end_date, season=season)
+    elif source == 'database':
+        from src.data_loader import load_from_database
+        df = load_from_database(
+            'match_logs',
+            columns=columns,
+            start_date=start_date,
+            end_date=end_date,
+            season=season
+        )
+    else:
+        raise ValueError(f"Unknown data source {source!r}; expected 'database' or 'parquet'")
+
+    return normalize_team_names(df)
+
+def pair_fixtures(df, stat_columns=PAIRED_STATS):
+    """Pair every home row with its away row via a single self-join.
+
+    The join is keyed on (date, team, opponent), so each fixture is matched
+    once instead of filtering the whole frame per home row. Raises a
+    ValueError describing any duplicated team/date rows or home rows
+    without an away counterpart.
+    """
+    key_columns = ['date', 'team', 'opponent']
+
+    duplicated = df[df.duplicated(['date', 'team'], keep=False)]
+    if not duplicated.empty:
+        raise ValueError(
+            f"Found {len(duplicated)} duplicated team/date rows:\n"
+            + duplicated[key_columns].to_string(index=False)
+        )
+
+    home = df.loc[df['venue'] == 'Home', key_columns + stat_columns]
+    home = home.rename(columns={'team': 'home_team', 'opponent': 'away_team'})
+    home = home.rename(columns={col: f'home_{col}' for col in stat_columns})
+
+    away = df[key_columns + stat_columns]
+    away = away.rename(columns={'team': 'away_team', 'opponent': 'home_team'})
+    away = away.rename(columns={col: f'away_{col}' for col in stat_columns})
+
+    paired = home.merge(
+        away,
+        on=['date', 'home_team', 'away_team'],
+        how='left',
+        validate='one_to_one',
+        indicator=True
+    )
+
+    unmatched = paired[paired['_merge'] == 'left_only']
+    if not unmatched.empty:
+        raise ValueError(
+            f"Found {len(unmatched)} home fixtures without a matching away row:\n"
+            + unmatched[['date', 'home_team', 'away_team']].to_string(index=False)
+        )
+
+    return paired.drop(columns='_merge')
 
-def prepare_data(df, n_recent_matches=5):
+def prepare_data(df, n_recent_matches=5, form_windows=FORM_WINDOWS):
     """Prepare data for MCMC model, including form indicators"""
     df['date'] = pd.to_datetime(df['date'])
     
     teams = sorted(df['team'].unique())
     team_idx = {team: i for i, team in enumerate(teams)}
     
-    # Initialize lists to hold the processed data
-    home_teams = []
-    away_teams = []
-    home_goals = []
-    away_goals = []
-    home_shots_on_target = []
-    away_shots_on_target = []
-    home_xg = []
-    away_xg = []
-    home_possession = []
-    away_possession = []
-    
-    # Create a dictionary to hold recent form indicators
-    recent_form = {team: [] for team in teams}
-    
-    for _, match in df.iterrows():
-        if match['venue'] == 'Home':
-            home_teams.append(team_idx[match['team']])
-            home_goals.append(match['goals_for'])
-            home_shots_on_target.append(match['shots_on_target'])
-            home_xg.append(match['shooting_xG'])
-            home_possession.append(match['possession'])
-            
-            # Find the corresponding away team statistics
-            away_stats = df[(df['team'] == match['opponent']) & (df['date'] == match['date'])]
-            away_teams.append(team_idx[away_stats['team'].values[0]])
-            away_goals.append(away_stats['goals_for'].values[0])
-            away_shots_on_target.append(away_stats['shots_on_target'].values[0])
-            away_xg.append(away_stats['shooting_xG'].values[0])
-            away_possession.append(away_stats['possession'].values[0])
-            
-            # Update recent form indicators
-            recent_form[match['team']].append(match['goals_for'])
-            recent_form[match['opponent']].append(away_stats['goals_for'].values[0])
-            
-            # Keep only the last n_recent_matches
-            if len(recent_form[match['team']]) > n_recent_matches:
-                recent_form[match['team']].pop(0)
-            if len(recent_form[match['opponent']]) > n_recent_matches:
-                recent_form[match['opponent']].pop(0)
-
-    # Calculate average goals scored in the last n_recent_matches for each team
-    avg_goals = {team: np.mean(recent_form[team]) if recent_form[team] else 0 for team in teams}
+    # Rolling form as of kickoff for every fixture
+    windows = sorted(set(form_windows) | {n_recent_matches})
+    form = rolling_form_features(df, windows=windows)
+    paired = pair_fixtures(df.join(form), stat_columns=PAIRED_STATS + list(form.columns))
+    home_form = {col: paired[f'home_{col}'].to_numpy() for col in form.columns}
+    away_form = {col: paired[f'away_{col}'].to_numpy() for col in form.columns}
+    recent_form_column = form_column('goals_for', n_recent_matches)
+
+    home_teams = paired['home_team'].map(team_idx).to_numpy()
+    away_teams = paired['away_team'].map(team_idx).to_numpy()
+    avg_goals = average_recent_goals(
+        home_teams, away_teams,
+        paired['home_goals_for'].to_numpy(), paired['away_goals_for'].to_numpy(),
+        paired['date'].to_numpy(), teams, n_recent_matches
+    )
 
     # Normalization
-    home_possession = np.array(home_possession) / 100.0  # Convert percentage to proportion
-    away_possession = np.array(away_possession) / 100.0  # Convert percentage to proportion
+    home_possession = paired['home_possession'].to_numpy() / 100.0  # Convert percentage to proportion
+    away_possession = paired['away_possession'].to_numpy() / 100.0  # Convert percentage to proportion
 
     
     return {
-        'home_teams': np.array(home_teams),
-        'away_teams': np.array(away_teams),
-        'home_goals': np.array(home_goals),
-        'away_goals': np.array(away_goals),
-        'home_shots_on_target': np.array(home_shots_on_target),
-        'away_shots_on_target': np.array(away_shots_on_target),
-        'home_xg': np.array(home_xg),
-        'away_xg': np.array(away_xg),
+        'dates': paired['date'].to_numpy(),
+        'home_teams': home_teams,
+        'away_teams': away_teams,
+        'home_goals': paired['home_goals_for'].to_numpy(),
+        'away_goals': paired['away_goals_for'].to_numpy(),
+        'home_shots_on_target': paired['home_shots_on_target'].to_numpy(),
+        'away_shots_on_target': paired['away_shots_on_target'].to_numpy(),
+        'home_xg': paired['home_shooting_xG'].to_numpy(),
+        'away_xg': paired['away_shooting_xG'].to_numpy(),
         'home_possession': home_possession,
         'away_possession': away_possession,
+        'home_form': home_form,
+        'away_form': away_form,
+        'home_recent_form': home_form[recent_form_column],
+        'away_recent_form': away_form[recent_form_column],
         'n_teams': len(teams),
         'teams': teams,
         'team_idx': team_idx,
         'avg_goals': avg_goals  # Include average goals in the returned data
     }
 
+def average_recent_goals(home_teams, away_teams, home_goals, away_goals, dates, teams, n_recent_matches=5):
+    """Goals per appearance over each team's last n_recent_matches by date, whatever order the rows came in"""
+    appearances = pd.DataFrame({
+        'team': np.column_stack([home_teams, away_teams]).ravel(),
+        'goals': np.column_stack([home_goals, away_goals]).ravel(),
+        'date': np.repeat(np.asarray(dates, dtype='datetime64[ns]'), 2)
+    })
+    # A team plays at most once a day, so (date, team) orders its appearances fully
+    appearances = appearances.sort_values(['date', 'team'], kind='mergesort')
+    recent_form = appearances.groupby('team').tail(n_recent_matches).groupby('team')['goals'].mean()
+    return {team: recent_form[i] if i in recent_form.index else 0 for i, team in enumerate(teams)}
+
+def slice_fixtures(data, mask, n_recent_matches=5):
+    """Restrict prepared data to the fixtures selected by a boolean mask.
+
+    Teams and their indices are kept, so folds of one dataset share a team
+    index. Form features are as of kickoff and stay valid; the per-team
+    average goals used for prediction are recomputed from the kept fixtures.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    sliced = {}
+    for key, value in data.items():
+        if isinstance(value, np.ndarray) and value.shape[:1] == mask.shape:
+            sliced[key] = value[mask]
+        elif key in ('home_form', 'away_form'):
+            sliced[key] = {name: values[mask] for name, values in value.items()}
+        else:
+            sliced[key] = value
+    sliced['avg_goals'] = average_recent_goals(
+        sliced['home_teams'], sliced['away_teams'], sliced['home_goals'], sliced['away_goals'],
+        sliced['dates'], data['teams'], n_recent_matches
+    )
+    return sliced
+
+# Data containers of the model and the prepare_data arrays that fill them.
+# All are per-fixture vectors, so a model can take any number of fixtures;
+# the number of teams is fixed when the model is built.
+MODEL_INPUTS = {
+    'home_team_idx': 'home_teams',
+    'away_team_idx': 'away_teams',
+    'home_xg': 'home_xg',
+    'away_xg': 'away_xg',
+    'home_possession': 'home_possession',
+    'away_possession': 'away_possession',
+    'home_recent_form': 'home_recent_form',
+    'away_recent_form': 'away_recent_form',
+    'observed_home_goals': 'home_goals',
+    'observed_away_goals': 'away_goals',
+}
+
 def build_model(data):
-    """Build PyMC model for soccer predictions"""
+    """Build PyMC model for soccer predictions
+
+    Fixture inputs are pm.Data containers, so set_model_data can swap in
+    another fold or refit's fixtures without rebuilding or recompiling.
+    """
+    # Imported here so the prediction path never pays for pymc/pytensor
+    import pymc as pm
+
     with pm.Model() as model:
+        inputs = {name: pm.Data(name, data[key]) for name, key in MODEL_INPUTS.items()}
+        home_teams = inputs['home_team_idx']
+        away_teams = inputs['away_team_idx']
+
         # Priors for team attack and defense strengths
         home_advantage = pm.Normal('home_advantage', mu=0.2, sigma=0.05)
         
@@ -120,121 +215,233 @@ def build_model(data):
 
         recent_form_coefficient = pm.Normal('recent_form_coefficient', mu=0, sigma=0.1)
 
-        # Recent form effect
-        recent_form_home = pm.math.stack([data['avg_goals'][team] for team in data['teams']])[data['home_teams']] * recent_form_coefficient
-        recent_form_away = pm.math.stack([data['avg_goals'][team] for team in data['teams']])[data['away_teams']] * recent_form_coefficient
+        # Recent form effect, using each team's form as of kickoff
+        recent_form_home = inputs['home_recent_form'] * recent_form_coefficient
+        recent_form_away = inputs['away_recent_form'] * recent_form_coefficient
 
 
         # Expected goals 
         theta_home = pm.math.exp(
-            attack[data['home_teams']] - 
-            defense[data['away_teams']] + 
+            attack[home_teams] - 
+            defense[away_teams] + 
             home_advantage + 
             recent_form_home +
-            beta_home_xG * data['home_xg'] +
-            beta_home_possession * data['home_possession'] 
+            beta_home_xG * inputs['home_xg'] +
+            beta_home_possession * inputs['home_possession'] 
         )
         theta_away = pm.math.exp(
-            attack[data['away_teams']] - 
-            defense[data['home_teams']] + 
+            attack[away_teams] - 
+            defense[home_teams] + 
             recent_form_away +
-            beta_away_xG * data['away_xg'] + 
-            beta_away_possession * data['away_possession']
+            beta_away_xG * inputs['away_xg'] + 
+            beta_away_possession * inputs['away_possession']
         )
         
-        # Likelihood of observed goals
-        home_goals = pm.Poisson('home_goals', mu=theta_home, observed=data['home_goals'])
-        away_goals = pm.Poisson('away_goals', mu=theta_away, observed=data['away_goals'])
+        # Likelihood of observed goals, sized by the current fixtures
+        home_goals = pm.Poisson('home_goals', mu=theta_home, observed=inputs['observed_home_goals'],
+                                shape=home_teams.shape)
+        away_goals = pm.Poisson('away_goals', mu=theta_away, observed=inputs['observed_away_goals'],
+                                shape=home_teams.shape)
     
     return model
 
-def sample_model(model, samples=2000):
-    """Sample from the model using MCMC"""
+def set_model_data(model, data):
+    """Point a model from build_model at another prepared dataset's fixtures
+
+    Raises a ValueError if the dataset has a different number of teams,
+    which would change the parameter shapes.
+    """
+    import pymc as pm
+
+    n_teams = model['attack'].type.shape[0]
+    if data['n_teams'] != n_teams:
+        raise ValueError(f"Model was built for {n_teams} teams, data has {data['n_teams']}")
+
+    values = {
+        name: np.asarray(data[key]).astype(model[name].dtype)
+        for name, key in MODEL_INPUTS.items()
+    }
+    pm.set_data(values, model=model)
+    return model
+
+def sample_model(model, samples=2000, tune=1000, cores=4, backend='nuts', adaptive=False,
+                 max_rhat=None, min_ess=None, chunk_size=None):
+    """
+    Sample from the model using MCMC, or fit it with another of backends.BACKENDS.
+
+    With adaptive=True, NUTS samples in chunks and stops once the R-hat and
+    ESS targets are met; samples is then the most draws per chain. max_rhat,
+    min_ess and chunk_size override sample_adaptive's defaults and are only
+    used in that mode.
+    """
+    if backend != 'nuts':
+        from src.modeling.backends import fit
+        return fit(model, backend, samples=samples, tune=tune, cores=cores)
+    if adaptive:
+        from src.modeling.adaptive import sample_adaptive
+        targets = {'max_rhat': max_rhat, 'min_ess': min_ess, 'chunk_size': chunk_size}
+        return sample_adaptive(model, max_draws=samples, tune=tune, cores=cores,
+                               **{name: value for name, value in targets.items() if value is not None})
+
+    import pymc as pm
+
     with model:
         trace = pm.sample(
             draws=samples,
-            tune=1000,
+            tune=tune,
             return_inferencedata=True,
-            cores=4
+            cores=cores
         )
     return trace
 
-def predict_match(trace, home_team, away_team, data, n_samples=1000):
-    """Predict the outcome of a match using the trained model, incorporating all model components."""
-    
-    # Validate team names
-    if home_team not in data['team_idx']:
-        raise ValueError(f"Home team '{home_team}' not found in data.")
-    if away_team not in data['team_idx']:
-        raise ValueError(f"Away team '{away_team}' not found in data.")
-    
-    home_idx = data['team_idx'][home_team]
-    away_idx = data['team_idx'][away_team]
-    
-    # Extract parameter samples from the trace
-    attack_samples = trace.posterior['attack'].values[..., home_idx].flatten()
-    defense_samples = trace.posterior['defense'].values[..., away_idx].flatten()
-    home_defense_samples = trace.posterior['defense'].values[..., home_idx].flatten()
-    away_attack_samples = trace.posterior['attack'].values[..., away_idx].flatten()
+POSTERIOR_PARAMS = [
+    'attack',
+    'defense',
+    'home_advantage',
+    'beta_home_xG',
+    'beta_away_xG',
+    'beta_home_possession',
+    'beta_away_possession',
+    'recent_form_coefficient',
+]
+
+def extract_posterior(trace):
+    """Pull the posterior parameters into contiguous (draws, ...) NumPy arrays, once"""
+    if isinstance(trace, dict):
+        return trace
     
-    home_advantage_samples = trace.posterior['home_advantage'].values.flatten()
-    beta_home_xG_samples = trace.posterior['beta_home_xG'].values.flatten()
-    beta_away_xG_samples = trace.posterior['beta_away_xG'].values.flatten()
-    beta_home_possession_samples = trace.posterior['beta_home_possession'].values.flatten()
-    beta_away_possession_samples = trace.posterior['beta_away_possession'].values.flatten()
-    recent_form_coeff_samples = trace.posterior['recent_form_coefficient'].values.flatten()
+    posterior = {}
+    for name in POSTERIOR_PARAMS:
+        values = trace.posterior[name].values
+        # Merge chain and draw dimensions, chain-major like .flatten()
+        posterior[name] = np.ascontiguousarray(values.reshape(-1, *values.shape[2:]))
+    return posterior
+
+def team_indices(teams, data):
+    """Map team names to model indices, rejecting teams the model has not seen"""
+    unknown = sorted(set(teams) - set(data['team_idx']))
+    if unknown:
+        raise ValueError(f"Teams not found in data: {unknown}")
+    return np.array([data['team_idx'][team] for team in teams], dtype=int)
+
+def expected_goals(posterior, home_idx, away_idx, data):
+    """Compute (fixtures x draws) expected goal matrices for home and away sides"""
+    home_idx = np.asarray(home_idx, dtype=int)
+    away_idx = np.asarray(away_idx, dtype=int)
     
-    # Retrieve recent form (average goals) for both teams
-    recent_form_home = data['avg_goals'][home_team]
-    recent_form_away = data['avg_goals'][away_team]
+    # Recent form (average goals) per team, in model index order
+    avg_goals = np.array([data['avg_goals'][team] for team in data['teams']], dtype=float)
     
-    # Calculate recent form effect
-    recent_form_home_effect = recent_form_home * recent_form_coeff_samples
-    recent_form_away_effect = recent_form_away * recent_form_coeff_samples
+    # Covariates per fixture as column vectors, parameters per draw as row vectors
+    recent_form_home = avg_goals[home_idx][:, None]
+    recent_form_away = avg_goals[away_idx][:, None]
+    home_xg = data['home_xg'][home_idx][:, None]
+    away_xg = data['away_xg'][away_idx][:, None]
+    home_possession = data['home_possession'][home_idx][:, None]
+    away_possession = data['away_possession'][away_idx][:, None]
     
-    home_xg = data['home_xg'][data['team_idx'][home_team]]
-    away_xg = data['away_xg'][data['team_idx'][away_team]]
-
-    home_possession = data['home_possession'][data['team_idx'][home_team]]
-    away_possession = data['away_possession'][data['team_idx'][away_team]]
+    attack = posterior['attack'].T
+    defense = posterior['defense'].T
+    recent_form_coeff = posterior['recent_form_coefficient'][None, :]
     
-    # Calculate expected goals (theta) for home and away teams
     theta_home = np.exp(
-        attack_samples - 
-        defense_samples + 
-        home_advantage_samples + 
-        recent_form_home_effect +
-        beta_home_xG_samples * home_xg +
-        beta_home_possession_samples * home_possession
+        attack[home_idx] - 
+        defense[away_idx] + 
+        posterior['home_advantage'][None, :] + 
+        recent_form_home * recent_form_coeff +
+        posterior['beta_home_xG'][None, :] * home_xg +
+        posterior['beta_home_possession'][None, :] * home_possession
     )
     theta_away = np.exp(
-        away_attack_samples - 
-        home_defense_samples + 
-        recent_form_away_effect +
-        beta_away_xG_samples * away_xg +
-        beta_away_possession_samples * away_possession
+        attack[away_idx] - 
+        defense[home_idx] + 
+        recent_form_away * recent_form_coeff +
+        posterior['beta_away_xG'][None, :] * away_xg +
+        posterior['beta_away_possession'][None, :] * away_possession
     )
+    return theta_home, theta_away
+
+def predict_scorelines(trace, home_idx, away_idx, data, max_goals=MAX_GOALS):
+    """
+    Exact scoreline matrices and market probabilities for many fixtures.
+
+    Args:
+        trace (az.InferenceData | dict): Posterior trace, or the output of extract_posterior.
+        home_idx (array-like): Model indices of the home teams.
+        away_idx (array-like): Model indices of the away teams.
+        data (dict): Output of prepare_data used to fit the model.
+        max_goals (int): Highest number of goals per side in the scoreline grid.
+
+    Returns:
+        Tuple[np.ndarray, pd.DataFrame]: (fixtures, max_goals + 1, max_goals + 1) scoreline
+        probabilities with home goals on the rows, and the markets derived from them
+        along with expected goals.
+    """
+    posterior = extract_posterior(trace)
+    theta_home, theta_away = expected_goals(posterior, home_idx, away_idx, data)
+    
+    matrix = scoreline_matrix(theta_home, theta_away, max_goals=max_goals)
+    markets = market_probabilities(matrix)
+    markets['expected_home_goals'] = np.mean(theta_home, axis=1)
+    markets['expected_away_goals'] = np.mean(theta_away, axis=1)
+    return matrix, markets
+
+def predict_matches(trace, home_idx, away_idx, data, random_state=None, method='sample'):
+    """
+    Predict many fixtures at once from a single extraction of the posterior.
+
+    With method='exact' the probabilities come from the analytic scoreline
+    matrix instead of one simulated score per draw, so they are deterministic
+    and include over/under and both-teams-to-score markets.
+
+    Args:
+        trace (az.InferenceData | dict): Posterior trace, or the output of extract_posterior.
+        home_idx (array-like): Model indices of the home teams.
+        away_idx (array-like): Model indices of the away teams.
+        data (dict): Output of prepare_data used to fit the model.
+        random_state (int | np.random.Generator | None): Seed for the simulated goals.
+        method (str): 'sample' for Monte Carlo goals, 'exact' for the scoreline matrix.
+
+    Returns:
+        pd.DataFrame: One row per fixture with outcome probabilities and expected goals.
+    """
+    if method == 'exact':
+        return predict_scorelines(trace, home_idx, away_idx, data)[1]
+    if method != 'sample':
+        raise ValueError(f"Unknown prediction method '{method}'")
     
-    # Sample goals from Poisson distribution
-    home_goals = stats.poisson.rvs(theta_home)
-    away_goals = stats.poisson.rvs(theta_away)
+    posterior = extract_posterior(trace)
+    theta_home, theta_away = expected_goals(posterior, home_idx, away_idx, data)
     
-    # Calculate outcome probabilities
-    home_wins = np.mean(home_goals > away_goals)
-    draws = np.mean(home_goals == away_goals)
-    away_wins = np.mean(home_goals < away_goals)
+    # Sample goals from Poisson distribution, one per fixture and draw. Both
+    # sides come from one generator, so a seed gives independent home and
+    # away streams rather than the same stream twice
+    rng = np.random.default_rng(random_state)
+    home_goals = rng.poisson(theta_home)
+    away_goals = rng.poisson(theta_away)
     
-    # Calculate expected goals
-    expected_home_goals = np.mean(theta_home)
-    expected_away_goals = np.mean(theta_away)
+    return pd.DataFrame({
+        'home_win_prob': np.mean(home_goals > away_goals, axis=1),
+        'draw_prob': np.mean(home_goals == away_goals, axis=1),
+        'away_win_prob': np.mean(home_goals < away_goals, axis=1),
+        'expected_home_goals': np.mean(theta_home, axis=1),
+        'expected_away_goals': np.mean(theta_away, axis=1)
+    })
+
+def predict_match(trace, home_team, away_team, data, n_samples=1000, method='sample'):
+    """Predict the outcome of a match using the trained model, incorporating all model components."""
     
-    return {
-        'home_win_prob': home_wins,
-        'draw_prob': draws,
-        'away_win_prob': away_wins,
-        'expected_home_goals': expected_home_goals,
-        'expected_away_goals': expected_away_goals
-    }
+    # Validate team names
+    if home_team not in data['team_idx']:
+        raise ValueError(f"Home team '{home_team}' not found in data.")
+    if away_team not in data['team_idx']:
+        raise ValueError(f"Away team '{away_team}' not found in data.")
+    
+    home_idx = data['team_idx'][home_team]
+    away_idx = data['team_idx'][away_team]
+    
+    prediction = predict_matches(trace, [home_idx], [away_idx], data, method=method)
+    return prediction.iloc[0].to_dict()
 
 
 def main():
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from sklearn.metrics import log_loss, brier_score_loss
 from datetime import datetime
 
 def split_data_by_date(df, split_date):
@@ -10,66 +9,162 @@ def split_data_by_date(df, split_date):
     test = df[(df['date'] >= split_date) & (df['venue'] == 'Home')].copy()
     return train, test
 
+OUTCOME_COLUMNS = ['home_win_prob', 'draw_prob', 'away_win_prob']
+
+# Probabilities are clipped to [LOG_LOSS_EPS, 1] before taking logs
+LOG_LOSS_EPS = 1e-15
+
+def outcome_labels(home_goals, away_goals):
+    """Observed outcome per fixture: 0 home win, 1 draw, 2 away win"""
+    home_goals = np.asarray(home_goals)
+    away_goals = np.asarray(away_goals)
+    return np.where(home_goals > away_goals, 0, np.where(home_goals == away_goals, 1, 2))
+
+def outcome_probabilities(predictions):
+    """(fixtures, 3) array of home win / draw / away win probabilities"""
+    return predictions[OUTCOME_COLUMNS].to_numpy(dtype=float)
+
+def log_losses(probs, outcomes):
+    """Per-fixture negative log probability of the observed outcome, rows renormalised"""
+    probs = probs / probs.sum(axis=1, keepdims=True)
+    observed = probs[np.arange(len(outcomes)), outcomes]
+    return -np.log(np.clip(observed, LOG_LOSS_EPS, 1))
+
+def ranked_probability_scores(probs, outcomes):
+    """Per-fixture ranked probability score over the ordered outcomes home win < draw < away win"""
+    observed = np.eye(probs.shape[1])[outcomes]
+    cumulative_gap = np.cumsum(probs, axis=1) - np.cumsum(observed, axis=1)
+    return (cumulative_gap[:, :-1] ** 2).sum(axis=1) / (probs.shape[1] - 1)
+
 def evaluate_predictions(predictions, actuals):
     """Calculate various prediction metrics"""
     metrics = {}
-    
-    # Calculate Brier scores for each outcome
-    actual_home_wins = (actuals['home_goals'] > actuals['away_goals']).astype(int)
-    actual_draws = (actuals['home_goals'] == actuals['away_goals']).astype(int)
-    actual_away_wins = (actuals['home_goals'] < actuals['away_goals']).astype(int)
-    
-    metrics['brier_home'] = brier_score_loss(actual_home_wins, predictions['home_win_prob'])
-    metrics['brier_draw'] = brier_score_loss(actual_draws, predictions['draw_prob'])
-    metrics['brier_away'] = brier_score_loss(actual_away_wins, predictions['away_win_prob'])
-    
+
+    probs = outcome_probabilities(predictions)
+    outcomes = outcome_labels(actuals['home_goals'], actuals['away_goals'])
+    observed = np.eye(3)[outcomes]
+
+    # Brier score of each outcome as a binary event
+    brier = ((probs - observed) ** 2).mean(axis=0)
+    metrics['brier_home'] = brier[0]
+    metrics['brier_draw'] = brier[1]
+    metrics['brier_away'] = brier[2]
+
     # Calculate average goals error
-    metrics['mae_home_goals'] = np.mean(np.abs(predictions['expected_home_goals'] - actuals['home_goals']))
-    metrics['mae_away_goals'] = np.mean(np.abs(predictions['expected_away_goals'] - actuals['away_goals']))
-    
+    metrics['mae_home_goals'] = np.mean(np.abs(predictions['expected_home_goals'].to_numpy() - np.asarray(actuals['home_goals'])))
+    metrics['mae_away_goals'] = np.mean(np.abs(predictions['expected_away_goals'].to_numpy() - np.asarray(actuals['away_goals'])))
+
     # Calculate prediction accuracy
-    predicted_outcomes = np.argmax([predictions['home_win_prob'], 
-                                  predictions['draw_prob'], 
-                                  predictions['away_win_prob']], axis=0)
-    actual_outcomes = np.where(actual_home_wins == 1, 0,
-                             np.where(actual_draws == 1, 1, 2))
-    metrics['accuracy'] = np.mean(predicted_outcomes == actual_outcomes)
-    
+    metrics['accuracy'] = np.mean(probs.argmax(axis=1) == outcomes)
+
+    metrics['log_loss'] = log_losses(probs, outcomes).mean()
+    metrics['rps'] = ranked_probability_scores(probs, outcomes).mean()
+
     return metrics
 
-def evaluate_model(model_data, test_data, trace, predict_match_fn):
-    """Evaluate model performance on test data"""
-    predictions = []
-    actuals = []
-    
-    for _, match in test_data.iterrows():
-        # Get prediction for this match
-        pred = predict_match_fn(
-            trace=trace,
-            home_team=match['team'],
-            away_team=match['opponent'],
-            data=model_data
+def calibration_table(predictions, actuals, n_bins=10):
+    """
+    Reliability of each outcome probability.
+
+    Predicted probabilities are split into n_bins equal-width bins per
+    outcome; a calibrated model has mean_predicted close to
+    observed_frequency in every bin.
+
+    Returns:
+        pd.DataFrame: outcome, bin bounds, count, mean_predicted and
+        observed_frequency for every non-empty bin.
+    """
+    probs = outcome_probabilities(predictions)
+    observed = np.eye(3)[outcome_labels(actuals['home_goals'], actuals['away_goals'])]
+    bins = np.minimum((probs * n_bins).astype(int), n_bins - 1)
+
+    # One bincount over (outcome, bin) pairs covers all three outcomes
+    flat_bins = (bins + np.arange(3) * n_bins).ravel()
+    counts = np.bincount(flat_bins, minlength=3 * n_bins)
+    predicted = np.bincount(flat_bins, weights=probs.ravel(), minlength=3 * n_bins)
+    hits = np.bincount(flat_bins, weights=observed.ravel(), minlength=3 * n_bins)
+
+    table = pd.DataFrame({
+        'outcome': np.repeat(['home_win', 'draw', 'away_win'], n_bins),
+        'lower': np.tile(np.arange(n_bins) / n_bins, 3),
+        'upper': np.tile(np.arange(1, n_bins + 1) / n_bins, 3),
+        'count': counts,
+    })
+    with np.errstate(invalid='ignore', divide='ignore'):
+        table['mean_predicted'] = predicted / counts
+        table['observed_frequency'] = hits / counts
+    return table[table['count'] > 0].reset_index(drop=True)
+
+def team_breakdown(predictions, actuals):
+    """
+    Metrics per team over the fixtures it played, home or away.
+
+    actuals needs home_team and away_team columns, as returned by evaluate_model.
+
+    Returns:
+        pd.DataFrame: matches, log_loss, rps, accuracy and goals MAE per team.
+    """
+    probs = outcome_probabilities(predictions)
+    outcomes = outcome_labels(actuals['home_goals'], actuals['away_goals'])
+    fixture_metrics = np.column_stack([
+        log_losses(probs, outcomes),
+        ranked_probability_scores(probs, outcomes),
+        probs.argmax(axis=1) == outcomes,
+        np.abs(predictions['expected_home_goals'].to_numpy() - np.asarray(actuals['home_goals'])),
+        np.abs(predictions['expected_away_goals'].to_numpy() - np.asarray(actuals['away_goals'])),
+    ])
+
+    # Each fixture counts once for each side; a team's goals MAE is its own goals
+    codes, teams = pd.factorize(np.concatenate([np.asarray(actuals['home_team']), np.asarray(actuals['away_team'])]))
+    per_side = np.vstack([fixture_metrics[:, [0, 1, 2, 3]], fixture_metrics[:, [0, 1, 2, 4]]])
+    matches = np.bincount(codes, minlength=len(teams))
+    sums = np.column_stack([np.bincount(codes, weights=per_side[:, i], minlength=len(teams)) for i in range(4)])
+
+    breakdown = pd.DataFrame(sums / matches[:, None], columns=['log_loss', 'rps', 'accuracy', 'mae_goals'])
+    breakdown.insert(0, 'team', teams)
+    breakdown.insert(1, 'matches', matches)
+    return breakdown.sort_values('log_loss', ascending=False, kind='mergesort').reset_index(drop=True)
+
+def evaluate_model(model_data, test_data, trace, predict_match_fn=None, predict_matches_fn=None):
+    """Evaluate model performance on test data
+
+    The whole test set is predicted in one batched call with
+    predict_matches_fn (mcmc.predict_matches by default). Passing only
+    predict_match_fn keeps the old per-row loop for custom predictors.
+    The returned actuals carry home_team/away_team for team_breakdown.
+    """
+    actual_df = pd.DataFrame({
+        'home_team': test_data['team'].to_numpy(),
+        'away_team': test_data['opponent'].to_numpy(),
+        'home_goals': test_data['goals_for'].to_numpy(),
+        'away_goals': test_data['goals_against'].to_numpy()
+    })
+
+    if predict_matches_fn is None and predict_match_fn is not None:
+        pred_df = pd.DataFrame([
+            predict_match_fn(trace=trace, home_team=home_team, away_team=away_team, data=model_data)
+            for home_team, away_team in zip(actual_df['home_team'], actual_df['away_team'])
+        ])
+    else:
+        from src.modeling.mcmc import predict_matches, team_indices
+
+        predict_matches_fn = predict_matches_fn or predict_matches
+        pred_df = predict_matches_fn(
+            trace,
+            team_indices(actual_df['home_team'], model_data),
+            team_indices(actual_df['away_team'], model_data),
+            model_data
         )
-        
-        predictions.append(pred)
-        actuals.append({
-            'home_goals': match['goals_for'],
-            'away_goals': match['goals_against']
-        })
-    
-    # Convert to DataFrames
-    pred_df = pd.DataFrame(predictions)
-    actual_df = pd.DataFrame(actuals)
-    
-    # Calculate metrics
+
     metrics = evaluate_predictions(pred_df, actual_df)
-    
     return metrics, pred_df, actual_df
 
 def print_metrics(metrics):
     """Print evaluation metrics in a readable format"""
     print("\nModel Evaluation Metrics:")
     print(f"Prediction Accuracy: {metrics['accuracy']:.3f}")
+    print(f"Log-Loss: {metrics['log_loss']:.3f}")
+    print(f"Ranked Probability Score: {metrics['rps']:.3f}")
     print("\nBrier Scores (lower is better):")
     print(f"Home Win: {metrics['brier_home']:.3f}")
     print(f"Draw: {metrics['brier_draw']:.3f}")
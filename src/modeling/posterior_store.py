@@ -0,0 +1,123 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_POSTERIOR_PATH = Path(__file__).resolve().parents[2] / 'data' / 'posterior' / 'posterior.npy'
+
+
+def _metadata_path(path):
+    return Path(path).with_suffix('.json')
+
+
+def export_posterior(trace, path=DEFAULT_POSTERIOR_PATH, teams=None, fingerprint=None):
+    """
+    Write the parameters needed for prediction to a single float32 array file.
+
+    Each parameter occupies a contiguous block of rows in a (rows, draws)
+    array, described by a JSON sidecar, so load_posterior can memory-map the
+    file and hand out views without copying.
+
+    Args:
+        trace (az.InferenceData | dict): Posterior trace, or the output of extract_posterior.
+        path (str | Path): Destination .npy file; the sidecar is written next to it.
+        teams (List[str] | None): Team names in model index order, stored for validation.
+        fingerprint (str | None): Trace fingerprint of the data and config the trace was fit on.
+
+    Returns:
+        Path: The written array file.
+    """
+    from src.modeling.mcmc import extract_posterior
+
+    posterior = extract_posterior(trace)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    blocks = []
+    layout = {}
+    row = 0
+    for name, values in posterior.items():
+        # (draws, ...) -> (rows, draws) so each parameter's block is contiguous
+        block = values.reshape(values.shape[0], -1).T
+        layout[name] = {'start': row, 'stop': row + block.shape[0], 'shape': list(values.shape[1:])}
+        blocks.append(block)
+        row += block.shape[0]
+
+    array = np.ascontiguousarray(np.vstack(blocks), dtype=np.float32)
+    metadata = {
+        'n_draws': array.shape[1],
+        'params': layout,
+        'teams': list(teams) if teams is not None else None,
+        'fingerprint': fingerprint
+    }
+
+    # Write both files under temporary names first so readers never see a partial export
+    tmp_path = path.with_name(path.stem + '.tmp.npy')
+    np.save(tmp_path, array)
+    tmp_metadata_path = path.with_name(path.stem + '.tmp.json')
+    with open(tmp_metadata_path, 'w') as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, path)
+    os.replace(tmp_metadata_path, _metadata_path(path))
+
+    print(f"Exported {row} parameter rows x {array.shape[1]} draws to {path} ({array.nbytes / 1e6:.1f} MB)")
+    return path
+
+
+def load_posterior_metadata(path=DEFAULT_POSTERIOR_PATH):
+    """Read the sidecar describing an exported posterior"""
+    with open(_metadata_path(path)) as f:
+        return json.load(f)
+
+
+def load_posterior(path=DEFAULT_POSTERIOR_PATH, mmap_mode='r'):
+    """
+    Load an exported posterior as a dict of (draws, ...) float32 views.
+
+    The result can be passed as the trace argument of predict_match and
+    predict_matches, and needs neither pymc nor arviz.
+
+    Args:
+        path (str | Path): Array file written by export_posterior.
+        mmap_mode (str | None): Passed to np.load; 'r' shares pages between workers.
+
+    Returns:
+        Dict[str, np.ndarray]: Posterior samples per parameter.
+    """
+    metadata = load_posterior_metadata(path)
+    array = np.load(path, mmap_mode=mmap_mode)
+
+    posterior = {}
+    for name, block in metadata['params'].items():
+        rows = array[block['start']:block['stop']]
+        posterior[name] = rows.T.reshape(metadata['n_draws'], *block['shape'])
+    return posterior
+
+
+def load_matching_posterior(data, path=DEFAULT_POSTERIOR_PATH, samples=2000, tune=1000):
+    """
+    The posterior fit on data, from the export when it matches and the trace cache otherwise.
+
+    The export is used only if its sidecar carries the trace fingerprint of
+    data and the sampler settings, so serving never pairs a posterior with
+    data it was not fit on and, on a match, never imports pymc or arviz.
+    Exports written without a fingerprint are treated as stale.
+
+    Args:
+        data (dict): Output of prepare_data.
+        path (str | Path): Exported posterior to try first.
+        samples (int): Draws per chain the posterior is expected to have been fit with.
+        tune (int): Tuning steps per chain, likewise.
+
+    Returns:
+        Dict[str, np.ndarray]: Posterior samples per parameter.
+    """
+    from src.modeling.trace_cache import load_or_sample, trace_fingerprint
+
+    key = trace_fingerprint(data, samples=samples, tune=tune)
+    if Path(path).exists() and load_posterior_metadata(path).get('fingerprint') == key:
+        return load_posterior(path)
+
+    from src.modeling.mcmc import extract_posterior
+    return extract_posterior(load_or_sample(data, samples=samples, tune=tune))
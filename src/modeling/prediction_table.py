@@ -0,0 +1,267 @@
+"""
+Precomputed predictions for every gameweek of the season.
+
+A batch job predicts all fixtures of the schedule in one call after each
+refit and stores them under data/predictions/, so the app only has to look a
+gameweek up. The table is always built from the trace fit on the current
+data, found in the trace cache by its fingerprint, and its sidecar records
+that fingerprint. PredictionStore holds the table (and the posterior it was
+built from) in memory and refreshes it in a background thread when the trace
+for the current data changes or another process rewrites the table.
+
+    python -m src.modeling.prediction_table  # rebuild from the trace of the current data
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.modeling.mcmc import extract_posterior, load_data, predict_matches, prepare_data
+from src.modeling.trace_cache import DEFAULT_CACHE_DIR, latest_trace_path, load_or_sample, trace_fingerprint
+from src.team_names import canonical_team_name
+
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parents[2] / 'data' / 'predictions' / 'gameweeks.parquet'
+SCHEDULE_URL = "https://fbref.com/en/comps/9/schedule/Premier-League-Scores-and-Fixtures"
+SCHEDULE_TABLE_ID = "sched_2024-2025_9_1"
+
+# Seconds between checks for a new trace or table
+REFRESH_INTERVAL = 60
+
+
+def _metadata_path(path):
+    return Path(path).with_suffix('.json')
+
+
+def fetch_schedule():
+    """
+    The league schedule for every gameweek, with team names as in the match logs.
+
+    Returns:
+        pd.DataFrame: gameweek, date, home_team and away_team.
+    """
+    from scripts.html_tables import parse_table
+    from scripts.http_cache import cached_get
+
+    response = cached_get(SCHEDULE_URL)  # The schedule is revalidated at most hourly
+    table = parse_table(response.text, SCHEDULE_TABLE_ID)
+
+    matches = []
+    for row in table.find("tbody").find_all("tr"):
+        gameweek_cell = row.find("th", {"data-stat": "gameweek"})
+        gameweek_text = gameweek_cell.text.strip() if gameweek_cell else ""
+        # Spacer and header rows have no gameweek number
+        if not gameweek_text.isdigit():
+            continue
+        date_cell = row.find("td", {"data-stat": "date"})
+        matches.append([
+            int(gameweek_text),
+            date_cell.text.strip() if date_cell else "",
+            canonical_team_name(row.find("td", {"data-stat": "home_team"}).text.strip()),
+            canonical_team_name(row.find("td", {"data-stat": "away_team"}).text.strip()),
+        ])
+    return pd.DataFrame(matches, columns=['gameweek', 'date', 'home_team', 'away_team'])
+
+
+def build_prediction_table(posterior, data, schedule):
+    """
+    Predict every scheduled fixture in one batched call.
+
+    Fixtures involving a team the model has not seen keep the schedule
+    columns with missing predictions.
+
+    Args:
+        posterior (dict): Output of extract_posterior (or load_posterior).
+        data (dict): Output of prepare_data the posterior was fit on.
+        schedule (pd.DataFrame): gameweek, date, home_team and away_team.
+
+    Returns:
+        pd.DataFrame: The schedule with outcome, over/under and
+        both-teams-to-score probabilities and expected goals.
+    """
+    schedule = schedule.reset_index(drop=True)
+    known = (schedule['home_team'].isin(data['team_idx']) & schedule['away_team'].isin(data['team_idx'])).to_numpy()
+    if not known.all():
+        unknown = sorted((set(schedule['home_team'][~known]) | set(schedule['away_team'][~known])) - set(data['teams']))
+        print(f"No predictions for {int((~known).sum())} fixtures with unknown teams: {unknown}")
+
+    home_idx = schedule['home_team'][known].map(data['team_idx']).to_numpy(dtype=int)
+    away_idx = schedule['away_team'][known].map(data['team_idx']).to_numpy(dtype=int)
+    prediction = predict_matches(posterior, home_idx, away_idx, data, method='exact')
+    prediction.index = np.flatnonzero(known)
+    return schedule.join(prediction)
+
+
+def write_prediction_table(table, path=DEFAULT_TABLE_PATH, trace=None):
+    """Write the table and a sidecar naming the trace it was built from, replacing both atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        'trace': trace,
+        'built_at': datetime.now(timezone.utc).isoformat(),
+        'fixtures': len(table),
+    }
+
+    tmp_path = path.with_name(path.stem + '.tmp.parquet')
+    table.to_parquet(tmp_path, index=False)
+    tmp_metadata_path = path.with_name(path.stem + '.tmp.json')
+    with open(tmp_metadata_path, 'w') as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, path)
+    os.replace(tmp_metadata_path, _metadata_path(path))
+    print(f"Saved predictions for {len(table)} fixtures to {path}")
+    return path
+
+
+def read_prediction_table(path=DEFAULT_TABLE_PATH):
+    """
+    Read a stored prediction table.
+
+    Returns:
+        Tuple[pd.DataFrame, dict] | None: The table and its metadata, or None if none was built.
+    """
+    path = Path(path)
+    if not path.exists() or not _metadata_path(path).exists():
+        return None
+    with open(_metadata_path(path)) as f:
+        metadata = json.load(f)
+    return pd.read_parquet(path), metadata
+
+
+def load_current_posterior(cache_dir=DEFAULT_CACHE_DIR, data=None, samples=2000, tune=1000):
+    """
+    The current data and the posterior fit on it.
+
+    The trace is looked up by the data's fingerprint, so a cached trace of
+    other data (an older season, a backtest fold) is never paired with it.
+    Samples (through the trace cache) when the data has no trace yet.
+
+    Args:
+        cache_dir (str | Path): Trace cache.
+        data (dict | None): Output of prepare_data; loaded if None.
+        samples (int): Draws per chain of the fit.
+        tune (int): Tuning steps per chain of the fit.
+
+    Returns:
+        Tuple[dict, dict, str]: posterior, data and the trace's cache key.
+    """
+    data = data if data is not None else prepare_data(load_data())
+    key = trace_fingerprint(data, samples=samples, tune=tune)
+    trace = load_or_sample(data, samples=samples, tune=tune, cache_dir=cache_dir)
+    return extract_posterior(trace), data, key
+
+
+class PredictionStore:
+    """
+    The prediction table in memory, refreshed in the background.
+
+    Args:
+        path (str | Path): Stored prediction table.
+        cache_dir (str | Path): Trace cache watched for new traces.
+        schedule_fn (Callable[[], pd.DataFrame]): Returns the schedule to predict.
+        samples (int): Draws per chain of the fit whose trace is used.
+        tune (int): Tuning steps per chain of that fit.
+    """
+
+    def __init__(self, path=DEFAULT_TABLE_PATH, cache_dir=DEFAULT_CACHE_DIR, schedule_fn=fetch_schedule,
+                 samples=2000, tune=1000):
+        self.path = Path(path)
+        self.cache_dir = cache_dir
+        self.schedule_fn = schedule_fn
+        self.samples = samples
+        self.tune = tune
+        self.posterior = None
+        self.data = None
+        self.version = 0
+        # Name and mtime of the newest cached trace at the last refresh
+        self._seen_trace = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+        stored = read_prediction_table(self.path)
+        if stored is None:
+            self.rebuild()
+        else:
+            self._swap(*stored)
+
+    def _swap(self, table, metadata):
+        with self._lock:
+            self.table = table
+            self.metadata = metadata
+            self.version += 1
+
+    def rebuild(self, data=None):
+        """Predict the schedule from the trace of the current data, store the table and swap it in"""
+        start = time.perf_counter()
+        self.posterior, self.data, trace_key = load_current_posterior(
+            self.cache_dir, data=data, samples=self.samples, tune=self.tune
+        )
+        table = build_prediction_table(self.posterior, self.data, self.schedule_fn())
+        write_prediction_table(table, self.path, trace=trace_key)
+        self._swap(*read_prediction_table(self.path))
+        print(f"Rebuilt predictions from trace {trace_key[:12]} in {time.perf_counter() - start:.1f}s")
+
+    def refresh(self):
+        """Pick up a table written by another process, or rebuild once the current data has a new trace"""
+        stored_metadata_path = _metadata_path(self.path)
+        if stored_metadata_path.exists():
+            with open(stored_metadata_path) as f:
+                on_disk = json.load(f)
+            if on_disk != self.metadata:
+                self._swap(*read_prediction_table(self.path))
+                return
+
+        # A trace written or used since the last check is the cheap signal that a fit ran;
+        # only then is the data loaded to find the trace it needs
+        latest = latest_trace_path(self.cache_dir)
+        seen = (latest.name, latest.stat().st_mtime) if latest is not None else None
+        if seen is None or seen == self._seen_trace:
+            return
+        self._seen_trace = seen
+
+        data = prepare_data(load_data())
+        key = trace_fingerprint(data, samples=self.samples, tune=self.tune)
+        # The newest trace may be of other data; wait until the current data's own fit is cached
+        if key != self.metadata.get('trace') and (Path(self.cache_dir) / f'{key}.nc').exists():
+            self.rebuild(data)
+
+    def start(self, interval=REFRESH_INTERVAL):
+        """Refresh every interval seconds in a daemon thread; failures are logged and retried"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Refreshing predictions failed: {e!r}")
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=run, daemon=True)
+            self._thread.start()
+        return self
+
+    def gameweek(self, gameweek):
+        """Predictions for one gameweek"""
+        table = self.table
+        return table[table['gameweek'] == gameweek].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    posterior, data, trace_key = load_current_posterior(args.cache_dir)
+    table = build_prediction_table(posterior, data, fetch_schedule())
+    write_prediction_table(table, args.output, trace=trace_key)
+    print(table.groupby('gameweek').size().to_string())
+
+
+if __name__ == "__main__":
+    main()
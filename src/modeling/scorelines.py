@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+MAX_GOALS = 10
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+
+def poisson_pmf_grid(theta, max_goals=MAX_GOALS):
+    """P(k) for k = 0..max_goals along a new leading axis, via P(k) = P(k-1) * theta / k"""
+    pmf = np.empty((max_goals + 1,) + theta.shape)
+    pmf[0] = np.exp(-theta)
+    for k in range(1, max_goals + 1):
+        np.multiply(pmf[k - 1], theta / k, out=pmf[k])
+    return pmf
+
+
+def scoreline_matrix(theta_home, theta_away, max_goals=MAX_GOALS, chunk_size=64):
+    """
+    Exact scoreline probabilities averaged over posterior draws.
+
+    For each draw the home and away goals are independent Poisson variables,
+    so P(home=i, away=j) is the outer product of the two PMFs. The grid is
+    truncated at max_goals and renormalised to sum to one per fixture.
+
+    Args:
+        theta_home (np.ndarray): (fixtures, draws) expected home goals.
+        theta_away (np.ndarray): (fixtures, draws) expected away goals.
+        max_goals (int): Highest number of goals per side in the grid.
+        chunk_size (int): Fixtures per block, bounding the (fixtures, draws, goals) PMF arrays.
+
+    Returns:
+        np.ndarray: (fixtures, max_goals + 1, max_goals + 1) matrix, home goals on the rows.
+    """
+    n_fixtures, n_draws = theta_home.shape
+    matrix = np.empty((n_fixtures, max_goals + 1, max_goals + 1))
+
+    for start in range(0, n_fixtures, chunk_size):
+        block = slice(start, start + chunk_size)
+        home_pmf = poisson_pmf_grid(theta_home[block], max_goals)
+        away_pmf = poisson_pmf_grid(theta_away[block], max_goals)
+        # Sum over draws of the per-draw outer products
+        matrix[block] = np.einsum('ifd,jfd->fij', home_pmf, away_pmf, optimize=True) / n_draws
+
+    return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+
+def market_probabilities(matrix, lines=OVER_UNDER_LINES):
+    """
+    Derive 1X2, over/under and both-teams-to-score probabilities from scoreline matrices.
+
+    Args:
+        matrix (np.ndarray): Output of scoreline_matrix.
+        lines (Iterable[float]): Total-goals lines to price.
+
+    Returns:
+        pd.DataFrame: One row per fixture with a column per market.
+    """
+    size = matrix.shape[1]
+    home_goals, away_goals = np.indices((size, size))
+    total_goals = home_goals + away_goals
+
+    markets = {
+        'home_win_prob': matrix[:, home_goals > away_goals].sum(axis=1),
+        'draw_prob': matrix[:, home_goals == away_goals].sum(axis=1),
+        'away_win_prob': matrix[:, home_goals < away_goals].sum(axis=1),
+    }
+    for line in lines:
+        markets[f'over_{line}_prob'] = matrix[:, total_goals > line].sum(axis=1)
+        markets[f'under_{line}_prob'] = matrix[:, total_goals < line].sum(axis=1)
+    markets['btts_prob'] = matrix[:, (home_goals > 0) & (away_goals > 0)].sum(axis=1)
+
+    return pd.DataFrame(markets)
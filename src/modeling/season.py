@@ -0,0 +1,190 @@
+"""
+Monte Carlo simulation of the rest of a season.
+
+Every remaining fixture is simulated for every simulated season in one
+(seasons x fixtures) Poisson draw, using a posterior draw per season. Points
+and goals are added to the current table with one matrix product per
+statistic, and tables are ranked on points, goal difference, goals scored and
+then a coin toss, all vectorised. Seasons are simulated in chunks (to bound
+memory) on a thread pool, with an independent random stream per chunk so
+results do not depend on the thread count.
+
+    python -m src.modeling.season --season 2024-2025 --simulations 100000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.modeling.mcmc import extract_posterior, expected_goals, team_indices
+
+CHUNK_SIZE = 10000
+TOP_FOUR = 4
+RELEGATION_PLACES = 3
+
+# Weights of the lexicographic sort key; goal difference is shifted to stay positive
+POINTS_WEIGHT = 1e6
+GOAL_DIFFERENCE_WEIGHT = 1e3
+GOAL_DIFFERENCE_OFFSET = 500
+
+
+def current_table(data):
+    """
+    Points, goals for and goals against per team from the played fixtures.
+
+    Returns:
+        dict: 'points', 'goals_for', 'goals_against' and 'played' arrays in model team order.
+    """
+    n_teams = data['n_teams']
+    home, away = data['home_teams'], data['away_teams']
+    home_goals, away_goals = data['home_goals'], data['away_goals']
+    home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+    away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+
+    def per_team(home_values, away_values):
+        return (np.bincount(home, weights=home_values, minlength=n_teams)
+                + np.bincount(away, weights=away_values, minlength=n_teams))
+
+    return {
+        'points': per_team(home_points, away_points),
+        'goals_for': per_team(home_goals, away_goals),
+        'goals_against': per_team(away_goals, home_goals),
+        'played': per_team(np.ones(len(home)), np.ones(len(away))),
+    }
+
+
+def remaining_fixtures(data):
+    """
+    Fixtures of a double round robin that are not in the played data.
+
+    Assumes data covers one season: every team hosts every other team once.
+
+    Returns:
+        pd.DataFrame: home_team and away_team names.
+    """
+    teams = np.asarray(data['teams'], dtype=object)
+    n_teams = data['n_teams']
+    played = np.zeros((n_teams, n_teams), dtype=bool)
+    played[data['home_teams'], data['away_teams']] = True
+    np.fill_diagonal(played, True)
+    home, away = np.nonzero(~played)
+    return pd.DataFrame({'home_team': teams[home], 'away_team': teams[away]})
+
+
+def _simulate_chunk(theta_home, theta_away, home_onehot, away_onehot, base, n_seasons, seed):
+    """Simulate n_seasons seasons; returns team x position finish counts and each team's summed points"""
+    rng = np.random.default_rng(seed)
+    n_draws = theta_home.shape[1]
+    n_teams = home_onehot.shape[1]
+
+    # One posterior draw per simulated season
+    draws = rng.integers(0, n_draws, size=n_seasons)
+    home_goals = rng.poisson(theta_home[:, draws].T).astype(float)
+    away_goals = rng.poisson(theta_away[:, draws].T).astype(float)
+
+    home_points = 3.0 * (home_goals > away_goals) + (home_goals == away_goals)
+    away_points = 3.0 * (away_goals > home_goals) + (home_goals == away_goals)
+
+    # (seasons x fixtures) @ (fixtures x teams) scatters each fixture to its two teams
+    points = base['points'] + home_points @ home_onehot + away_points @ away_onehot
+    goals_for = base['goals_for'] + home_goals @ home_onehot + away_goals @ away_onehot
+    goals_against = base['goals_against'] + away_goals @ home_onehot + home_goals @ away_onehot
+
+    key = (points * POINTS_WEIGHT
+           + (goals_for - goals_against + GOAL_DIFFERENCE_OFFSET) * GOAL_DIFFERENCE_WEIGHT
+           + goals_for
+           + rng.random((n_seasons, n_teams)) * 0.5)
+    order = np.argsort(-key, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_teams)[None, :].repeat(n_seasons, axis=0), axis=1)
+
+    counts = np.bincount((np.arange(n_teams) * n_teams + positions).ravel(), minlength=n_teams * n_teams)
+    return counts.reshape(n_teams, n_teams), points.sum(axis=0)
+
+
+def simulate_season(trace, data, fixtures=None, n_simulations=100000, chunk_size=CHUNK_SIZE,
+                    workers=None, random_state=None):
+    """
+    Simulate the remaining fixtures and summarise the final tables.
+
+    Args:
+        trace (az.InferenceData | dict): Posterior trace, or the output of extract_posterior.
+        data (dict): Output of prepare_data for the season's played fixtures.
+        fixtures (pd.DataFrame | None): Remaining home_team/away_team pairs;
+            defaults to remaining_fixtures(data).
+        n_simulations (int): Seasons to simulate.
+        chunk_size (int): Seasons simulated per chunk; bounds peak memory.
+        workers (int | None): Threads simulating chunks; defaults to the CPU count.
+        random_state (int | None): Seed for reproducible simulations.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Per-team summary (current and
+        expected points, title, top-four and relegation probabilities), sorted
+        by expected points, and the team x position probability matrix.
+    """
+    posterior = extract_posterior(trace)
+    fixtures = remaining_fixtures(data) if fixtures is None else fixtures
+    n_teams = data['n_teams']
+    home_idx = team_indices(fixtures['home_team'], data)
+    away_idx = team_indices(fixtures['away_team'], data)
+    theta_home, theta_away = expected_goals(posterior, home_idx, away_idx, data)
+
+    home_onehot = np.zeros((len(fixtures), n_teams))
+    away_onehot = np.zeros((len(fixtures), n_teams))
+    home_onehot[np.arange(len(fixtures)), home_idx] = 1
+    away_onehot[np.arange(len(fixtures)), away_idx] = 1
+    base = current_table(data)
+
+    sizes = [min(chunk_size, n_simulations - start) for start in range(0, n_simulations, chunk_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(
+            lambda args: _simulate_chunk(theta_home, theta_away, home_onehot, away_onehot, base, *args),
+            zip(sizes, seeds)
+        ))
+    counts = sum(result[0] for result in results)
+    total_points = sum(result[1] for result in results)
+    print(f"Simulated {n_simulations} seasons of {len(fixtures)} remaining fixtures "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    position_probs = pd.DataFrame(
+        counts / n_simulations, index=data['teams'], columns=np.arange(1, n_teams + 1)
+    )
+    summary = pd.DataFrame({
+        'team': data['teams'],
+        'played': base['played'].astype(int),
+        'points': base['points'].astype(int),
+        'expected_points': total_points / n_simulations,
+        'title_prob': position_probs.iloc[:, 0].to_numpy(),
+        'top_four_prob': position_probs.iloc[:, :TOP_FOUR].sum(axis=1).to_numpy(),
+        'relegation_prob': position_probs.iloc[:, -RELEGATION_PLACES:].sum(axis=1).to_numpy(),
+    })
+    summary = summary.sort_values('expected_points', ascending=False, kind='mergesort').reset_index(drop=True)
+    return summary, position_probs
+
+
+def main():
+    from src.modeling.mcmc import load_data, prepare_data
+    from src.modeling.trace_cache import load_or_sample
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--season', default=None, help="Season whose played results seed the table, e.g. 2024-2025")
+    parser.add_argument('--simulations', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    data = prepare_data(load_data(season=args.season))
+    trace = load_or_sample(data)
+    summary, _ = simulate_season(trace, data, n_simulations=args.simulations, chunk_size=args.chunk_size,
+                                 workers=args.workers, random_state=args.seed)
+    print(summary.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.modeling.mcmc import load_data, prepare_data, build_model, sample_model
+from src.modeling.posterior_store import DEFAULT_POSTERIOR_PATH, export_posterior
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / 'data' / 'traces'
+MAX_ENTRIES = 5
+
+
+def _update_hash(h, value):
+    """Feed a prepared-data value (arrays, dicts, lists, scalars) into a hash"""
+    if isinstance(value, np.ndarray):
+        h.update(str(value.dtype).encode())
+        h.update(str(value.shape).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            h.update(str(key).encode())
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_hash(h, item)
+    else:
+        h.update(repr(value).encode())
+
+
+def trace_fingerprint(data, **sampler_config):
+    """
+    Fingerprint the prepared data together with the model and sampler config.
+
+    The model config is the source of build_model, so any change to the model
+    definition invalidates previously cached traces.
+
+    Args:
+        data (dict): Output of prepare_data.
+        **sampler_config: Arguments passed to sample_model.
+
+    Returns:
+        str: Hex digest identifying the trace.
+    """
+    h = hashlib.sha256()
+    _update_hash(h, data)
+    h.update(inspect.getsource(build_model).encode())
+    h.update(json.dumps(sampler_config, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def evict_stale(cache_dir=DEFAULT_CACHE_DIR, max_entries=MAX_ENTRIES):
+    """Delete all but the max_entries most recently used traces"""
+    entries = sorted(Path(cache_dir).glob('*.nc'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in entries[max_entries:]:
+        print(f"Evicting cached trace {path.name}")
+        path.unlink(missing_ok=True)
+
+
+def load_or_sample(data, samples=2000, tune=1000, cache_dir=DEFAULT_CACHE_DIR, max_entries=MAX_ENTRIES,
+                   adaptive=False, max_rhat=None, min_ess=None, chunk_size=None):
+    """
+    Return the posterior trace for the prepared data, sampling only on a cache miss.
+
+    An adaptive fit is stored under the same key as the fixed-length fit it
+    stands in for (as a converged warm refit is), so readers that look the
+    trace up by samples and tune find it either way.
+
+    Args:
+        data (dict): Output of prepare_data.
+        samples (int): Draws per chain; the most draws per chain if adaptive.
+        tune (int): Tuning steps per chain.
+        cache_dir (str | Path): Directory holding the cached NetCDF traces.
+        max_entries (int): Number of traces to keep after a new one is stored.
+        adaptive (bool): On a miss, sample in chunks until the convergence targets are met.
+        max_rhat (float | None): Adaptive R-hat target; sample_adaptive's default if None.
+        min_ess (float | None): Adaptive ESS target; sample_adaptive's default if None.
+        chunk_size (int | None): Adaptive draws per check; sample_adaptive's default if None.
+
+    Returns:
+        az.InferenceData: Posterior trace.
+    """
+    import arviz as az
+
+    cache_dir = Path(cache_dir)
+    key = trace_fingerprint(data, samples=samples, tune=tune)
+    path = cache_dir / f'{key}.nc'
+
+    if path.exists():
+        print(f"Loading cached trace {path.name}")
+        os.utime(path)  # Mark as recently used for eviction
+        return az.from_netcdf(path)
+
+    print(f"No cached trace for fingerprint {key[:12]}, sampling model")
+    model = build_model(data)
+    trace = sample_model(model, samples=samples, tune=tune, adaptive=adaptive,
+                         max_rhat=max_rhat, min_ess=min_ess, chunk_size=chunk_size)
+    store_trace(trace, key, cache_dir, max_entries)
+    return trace
+
+
+def store_trace(trace, key, cache_dir=DEFAULT_CACHE_DIR, max_entries=MAX_ENTRIES):
+    """Save a trace under its fingerprint and evict the least recently used ones"""
+    cache_dir = Path(cache_dir)
+    path = cache_dir / f'{key}.nc'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.nc.tmp')
+    trace.to_netcdf(tmp_path)
+    os.replace(tmp_path, path)  # Never expose a partially written trace
+    print(f"Saved trace to {path}")
+
+    evict_stale(cache_dir, max_entries)
+    return path
+
+
+def latest_trace_path(cache_dir=DEFAULT_CACHE_DIR):
+    """Path of the most recently used cached trace, or None if the cache is empty"""
+    entries = sorted(Path(cache_dir).glob('*.nc'), key=lambda p: p.stat().st_mtime, reverse=True)
+    return entries[0] if entries else None
+
+
+def latest_trace(cache_dir=DEFAULT_CACHE_DIR):
+    """The most recently used cached trace, or None if the cache is empty"""
+    import arviz as az
+
+    path = latest_trace_path(cache_dir)
+    if path is None:
+        return None
+    print(f"Using cached trace {path.name}")
+    return az.from_netcdf(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the cached posterior traces")
+    parser.add_argument('command', choices=['warm', 'prune', 'list'])
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--tune', type=int, default=1000)
+    parser.add_argument('--max-entries', type=int, default=MAX_ENTRIES)
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Sample until the convergence targets are met, with --samples as the most draws")
+    parser.add_argument('--export', nargs='?', const=DEFAULT_POSTERIOR_PATH, default=None,
+                        help="Also write the compact posterior used for serving")
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        # Run after each data refresh so the app starts from a cached trace
+        data = prepare_data(load_data())
+        trace = load_or_sample(data, samples=args.samples, tune=args.tune, cache_dir=args.cache_dir,
+                               max_entries=args.max_entries, adaptive=args.adaptive)
+        if args.export:
+            key = trace_fingerprint(data, samples=args.samples, tune=args.tune)
+            export_posterior(trace, args.export, teams=data['teams'], fingerprint=key)
+    elif args.command == 'prune':
+        evict_stale(args.cache_dir, args.max_entries)
+    else:
+        for path in sorted(Path(args.cache_dir).glob('*.nc'), key=lambda p: p.stat().st_mtime, reverse=True):
+            print(f"{path.name}  {path.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Warm-started re-fitting after a matchweek.
+
+A new matchweek adds a handful of fixtures and barely moves the posterior,
+so instead of sampling from scratch the chains start from the previous
+trace: its last draws as initial points, its posterior variances as the
+diagonal mass matrix and its tuned step size. That needs only a short tune
+phase. Convergence diagnostics are reported for every refit, and a refit
+that does not meet them is flagged so a full fit can be run instead.
+
+    python -m src.modeling.warm_start            # refit from the latest cached trace
+    python -m src.modeling.warm_start --fallback # run a full fit if the refit does not converge
+    python -m src.modeling.warm_start --adaptive # stop sampling once the convergence targets are met
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.modeling.compiled_model import compiled_model
+from src.modeling.mcmc import POSTERIOR_PARAMS, load_data, prepare_data, set_model_data
+from src.modeling.trace_cache import (
+    DEFAULT_CACHE_DIR,
+    MAX_ENTRIES,
+    latest_trace,
+    load_or_sample,
+    store_trace,
+    trace_fingerprint,
+)
+
+# Thresholds below which a warm refit is trusted
+MAX_RHAT = 1.01
+MIN_ESS = 400
+
+# How many draws' worth of confidence the previous variances carry into adaptation
+MASS_MATRIX_WEIGHT = 50
+
+
+def warm_start_state(model, trace):
+    """
+    Initial points, mass matrix and step size carried over from a previous trace.
+
+    Variables missing from the trace (e.g. after a model change) keep the
+    model's default initial point and unit variance.
+
+    Args:
+        model (pm.Model): The model about to be sampled.
+        trace (az.InferenceData): Previous trace of the same model.
+
+    Returns:
+        dict: initvals (one dict per previous chain), mean and variance
+        (flat, in model.value_vars order) and the adapted step_size.
+    """
+    posterior = trace.posterior
+    n_chains = posterior.sizes['chain']
+    initial_point = model.initial_point()
+
+    initvals = [{} for _ in range(n_chains)]
+    means, variances = [], []
+    for value_var in model.value_vars:
+        name = value_var.name
+        default = np.asarray(initial_point[name], dtype=float)
+        if name in posterior:
+            values = posterior[name].values
+            for chain in range(n_chains):
+                initvals[chain][name] = values[chain, -1]
+            draws = values.reshape(-1, *default.shape)
+            means.append(draws.mean(axis=0).ravel())
+            variances.append(draws.var(axis=0).ravel())
+        else:
+            means.append(default.ravel())
+            variances.append(np.ones(default.size))
+
+    # After tuning NUTS samples at the dual-averaged step size, reported as
+    # step_size_bar; step_size holds the last tuning iterate
+    step_size = None
+    for stat in ('step_size_bar', 'step_size'):
+        if stat in trace.sample_stats:
+            step_size = float(np.median(trace.sample_stats[stat].values[:, -1]))
+            break
+
+    return {
+        'initvals': initvals,
+        'mean': np.concatenate(means),
+        'variance': np.concatenate(variances),
+        'step_size': step_size,
+    }
+
+
+def convergence_report(trace, max_rhat=MAX_RHAT, min_ess=MIN_ESS):
+    """
+    Summarise R-hat, effective sample size and divergences over the model parameters.
+
+    Returns:
+        dict: max_rhat, min_ess_bulk, min_ess_tail, divergences and
+        needs_full_refit, set when any threshold is missed.
+    """
+    import arviz as az
+
+    params = [name for name in POSTERIOR_PARAMS if name in trace.posterior]
+    rhat = az.rhat(trace, var_names=params)
+    ess_bulk = az.ess(trace, var_names=params, method='bulk')
+    ess_tail = az.ess(trace, var_names=params, method='tail')
+
+    report = {
+        'max_rhat': float(max(rhat[name].max() for name in params)),
+        'min_ess_bulk': float(min(ess_bulk[name].min() for name in params)),
+        'min_ess_tail': float(min(ess_tail[name].min() for name in params)),
+        'divergences': int(trace.sample_stats['diverging'].sum()) if 'diverging' in trace.sample_stats else 0,
+    }
+    report['needs_full_refit'] = (
+        not report['max_rhat'] <= max_rhat
+        or not report['min_ess_bulk'] >= min_ess
+        or not report['min_ess_tail'] >= min_ess
+        or report['divergences'] > 0
+    )
+    return report
+
+
+def refit(data, previous_trace, samples=2000, tune=200, cores=4, max_rhat=MAX_RHAT, min_ess=MIN_ESS,
+          adaptive=False, chunk_size=None):
+    """
+    Sample the model on the updated data, warm-started from the previous trace.
+
+    Args:
+        data (dict): Output of prepare_data, including the new fixtures.
+        previous_trace (az.InferenceData): Trace fitted before the new fixtures.
+        samples (int): Draws per chain; the most draws per chain if adaptive.
+        tune (int): Tuning steps per chain; far fewer than a cold start needs.
+        cores (int): Chains sampled in parallel.
+        max_rhat (float): Largest acceptable R-hat.
+        min_ess (float): Smallest acceptable bulk and tail ESS.
+        adaptive (bool): Sample in chunks from the warm start until max_rhat and min_ess are met.
+        chunk_size (int | None): Adaptive draws per check; sample_adaptive's default if None.
+
+    Returns:
+        Tuple[az.InferenceData, dict]: The new trace and its convergence_report.
+    """
+    import pymc as pm
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+
+    compiled = compiled_model(data)
+    model = set_model_data(compiled.model, data)
+    state = warm_start_state(model, previous_trace)
+    n_chains = len(state['initvals'])
+
+    # The process's compiled step, started from the previous trace's mass matrix and step size
+    potential = QuadPotentialDiagAdapt(
+        len(state['mean']),
+        state['mean'],
+        state['variance'],
+        MASS_MATRIX_WEIGHT,
+        rng=compiled.step.rng.spawn(1)[0],
+    )
+    step = compiled.reset_step(potential=potential, step_size=state['step_size'])
+
+    start = time.perf_counter()
+    if adaptive:
+        from src.modeling.adaptive import sample_adaptive
+
+        options = {'chunk_size': chunk_size} if chunk_size is not None else {}
+        trace = sample_adaptive(model, max_draws=samples, tune=tune, cores=cores, chains=n_chains,
+                                max_rhat=max_rhat, min_ess=min_ess, step=step, initvals=state['initvals'],
+                                **options)
+    else:
+        with model:
+            trace = pm.sample(
+                draws=samples,
+                tune=tune,
+                step=step,
+                initvals=state['initvals'],
+                chains=n_chains,
+                cores=cores,
+                return_inferencedata=True,
+            )
+    elapsed = time.perf_counter() - start
+
+    report = convergence_report(trace, max_rhat=max_rhat, min_ess=min_ess)
+    report['seconds'] = elapsed
+    print(
+        f"Warm refit on {len(data['home_goals'])} fixtures in {elapsed:.1f}s: "
+        f"max R-hat {report['max_rhat']:.3f}, min ESS bulk {report['min_ess_bulk']:.0f} / "
+        f"tail {report['min_ess_tail']:.0f}, {report['divergences']} divergences"
+    )
+    if report['needs_full_refit']:
+        print("Warm refit did not meet the convergence targets; a full refit is required")
+    return trace, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--tune', type=int, default=200, help="Tuning steps for the warm refit")
+    parser.add_argument('--full-tune', type=int, default=1000, help="Tuning steps of the full fit it stands in for")
+    parser.add_argument('--max-entries', type=int, default=MAX_ENTRIES)
+    parser.add_argument('--fallback', action='store_true', help="Run a full fit when the refit does not converge")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Sample until the convergence targets are met, with --samples as the most draws")
+    parser.add_argument('--predictions', action='store_true',
+                        help="Rebuild the gameweek prediction table from the new trace")
+    args = parser.parse_args()
+
+    data = prepare_data(load_data())
+    previous = latest_trace(args.cache_dir)
+    if previous is None:
+        print("No cached trace to warm start from, running a full fit")
+        load_or_sample(data, samples=args.samples, tune=args.full_tune, cache_dir=args.cache_dir,
+                       max_entries=args.max_entries, adaptive=args.adaptive)
+    else:
+        trace, report = refit(data, previous, samples=args.samples, tune=args.tune, adaptive=args.adaptive)
+        if not report['needs_full_refit']:
+            # A converged refit stands in for the full fit, so the app and load_or_sample pick it up
+            key = trace_fingerprint(data, samples=args.samples, tune=args.full_tune)
+            store_trace(trace, key, cache_dir=args.cache_dir, max_entries=args.max_entries)
+        elif args.fallback:
+            load_or_sample(data, samples=args.samples, tune=args.full_tune, cache_dir=args.cache_dir,
+                           max_entries=args.max_entries, adaptive=args.adaptive)
+        else:
+            return
+
+    if args.predictions:
+        from src.modeling.prediction_table import PredictionStore
+
+        # Builds the table if there is none, and rebuilds it from the trace just stored otherwise
+        PredictionStore(cache_dir=args.cache_dir).refresh()
+
+
+if __name__ == "__main__":
+    main()
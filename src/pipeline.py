@@ -0,0 +1,332 @@
+"""
+Refresh pipeline: scrape -> database / snapshot -> fit -> export / predictions.
+
+Each stage declares the stages it depends on, its outputs and a function
+listing its inputs (files, directories and plain values such as the model
+config). A stage's fingerprint hashes the content of those inputs together
+with the stage's own source, and the stage is skipped when the fingerprint
+matches the one recorded after its last successful run and its outputs still
+exist. Outputs that are not files (a database table) are checked with a
+probe, e.g. a row count, recorded after the run and compared on the next
+one, so a dropped or emptied table is reloaded. Downstream stages hash what their upstream stages produced, not
+whether they ran, so a re-scrape that changes nothing skips everything after
+it. Stages whose dependencies are all done run in parallel.
+
+    python -m src.pipeline                  # full refresh
+    python -m src.pipeline --skip-scrape    # refresh from the current CSV backup
+    python -m src.pipeline --force fit      # rerun a stage (and whatever its outputs change)
+    python -m src.pipeline --dry-run        # show which stages would run
+    python -m src.pipeline --adaptive       # fit until the convergence targets are met
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STATE_PATH = PROJECT_ROOT / 'data' / 'pipeline_state.json'
+CSV_PATH = PROJECT_ROOT / 'data' / 'backups' / 'match_logs.csv'
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[], None]
+    inputs: Callable[[], Iterable] = lambda: []
+    # A function too, since some paths depend on the inputs (a trace is named by its fingerprint)
+    outputs: Callable[[], Iterable[Path]] = lambda: []
+    deps: List[str] = field(default_factory=list)
+    # Stages whose inputs cannot be hashed up front (e.g. a remote site) run every time
+    always: bool = False
+    # Cheap JSON-serialisable summary of outputs that are not files; the stage
+    # reruns when it differs from the value recorded after its last run
+    probe: Optional[Callable[[], object]] = None
+
+
+def _hash_path(h, path):
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(p for p in path.rglob('*') if p.is_file()):
+            h.update(str(child.relative_to(path)).encode())
+            _hash_path(h, child)
+    elif path.exists():
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    else:
+        h.update(b'<missing>')
+
+
+def stage_fingerprint(stage):
+    """Hash the stage's source and the content of its inputs"""
+    h = hashlib.sha256()
+    h.update(stage.name.encode())
+    h.update(inspect.getsource(stage.run).encode())
+    for value in stage.inputs():
+        if isinstance(value, Path):
+            h.update(str(value).encode())
+            _hash_path(h, value)
+        else:
+            h.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _probe_value(stage):
+    """The stage's probe as it reads back from the state file (tuples become lists, dates strings)"""
+    return json.loads(json.dumps(stage.probe(), default=str))
+
+
+def stage_levels(stages):
+    """
+    Group stages into levels that can run in parallel.
+
+    Returns:
+        List[List[Stage]]: Each level only depends on earlier levels.
+
+    Raises:
+        ValueError: If a dependency is unknown or the dependencies form a cycle.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {unknown}")
+
+    levels, done = [], set()
+    remaining = list(stages)
+    while remaining:
+        level = [stage for stage in remaining if all(dep in done for dep in stage.deps)]
+        if not level:
+            raise ValueError(f"Dependency cycle among {[stage.name for stage in remaining]}")
+        levels.append(level)
+        done.update(stage.name for stage in level)
+        remaining = [stage for stage in remaining if stage.name not in done]
+    return levels
+
+
+def run_pipeline(stages, state_path=DEFAULT_STATE_PATH, force=(), dry_run=False, workers=None):
+    """
+    Run the stages in dependency order, skipping those whose inputs are unchanged.
+
+    Args:
+        stages (List[Stage]): The pipeline.
+        state_path (str | Path): JSON file recording each stage's last fingerprint and probe.
+        force (Iterable[str]): Stages to run even if unchanged.
+        dry_run (bool): Only report what would run; inputs of stages after a
+            stage that would run are hashed as they are now.
+        workers (int | None): Stages run at once within a level.
+
+    Returns:
+        Dict[str, str]: 'ran', 'skipped' or 'would run' per stage.
+
+    Raises:
+        RuntimeError: If a stage fails; later levels are not run.
+    """
+    state_path = Path(state_path)
+    state = json.loads(state_path.read_text()) if state_path.exists() else {}
+    # State files from before probes hold the bare fingerprint
+    state = {name: entry if isinstance(entry, dict) else {'fingerprint': entry} for name, entry in state.items()}
+    force = set(force)
+    status = {}
+
+    def process(stage):
+        start = time.perf_counter()
+        fingerprint = stage_fingerprint(stage)
+        recorded = state.get(stage.name, {})
+        unchanged = (
+            not stage.always
+            and stage.name not in force
+            and recorded.get('fingerprint') == fingerprint
+            and all(Path(output).exists() for output in stage.outputs())
+            and (stage.probe is None or _probe_value(stage) == recorded.get('probe'))
+        )
+        if unchanged:
+            return stage.name, 'skipped', recorded, time.perf_counter() - start
+        if dry_run:
+            return stage.name, 'would run', recorded, time.perf_counter() - start
+        stage.run()
+        # The recorded fingerprint is of the inputs the run started from, the probe of what it produced
+        entry = {'fingerprint': fingerprint}
+        if stage.probe is not None:
+            entry['probe'] = _probe_value(stage)
+        return stage.name, 'ran', entry, time.perf_counter() - start
+
+    start = time.perf_counter()
+    for level in stage_levels(stages):
+        with ThreadPoolExecutor(max_workers=workers or len(level)) as pool:
+            futures = [(stage, pool.submit(process, stage)) for stage in level]
+        failed = []
+        for stage, future in futures:
+            if future.exception() is not None:
+                print(f"{stage.name}: failed ({future.exception()!r})")
+                status[stage.name] = 'failed'
+                failed.append(stage.name)
+                continue
+            name, outcome, entry, seconds = future.result()
+            print(f"{name}: {outcome} ({seconds:.1f}s)")
+            status[name] = outcome
+            if outcome == 'ran':
+                state[name] = entry
+
+        # Stages that succeeded are recorded even if a sibling failed
+        if not dry_run:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = state_path.with_suffix('.json.tmp')
+            tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+            os.replace(tmp_path, state_path)
+        if failed:
+            raise RuntimeError(f"Pipeline stopped after failed stages {failed}")
+
+    print(f"Pipeline finished in {time.perf_counter() - start:.1f}s")
+    return status
+
+
+def refresh_stages(samples=2000, tune=1000, scrape=True, adaptive=False):
+    """
+    The refresh flow as pipeline stages.
+
+    The database stage is only included when a database is configured or
+    load_data reads from one, so a parquet-only setup refreshes without it.
+    The fit waits for whichever of the database and the snapshot load_data
+    is configured to read.
+
+    Args:
+        samples (int): Draws per chain for the fit; the most draws per chain if adaptive.
+        tune (int): Tuning steps per chain for the fit.
+        scrape (bool): Include the FBref scrape; otherwise start from the CSV backup.
+        adaptive (bool): Fit with adaptive sampling, stored under the same trace key.
+
+    Returns:
+        List[Stage]: scrape, database, snapshot, fit, export and predictions.
+    """
+    from src.data_loader import database_configured
+    from src.modeling.posterior_store import DEFAULT_POSTERIOR_PATH
+    from src.modeling.prediction_table import DEFAULT_TABLE_PATH
+    from src.modeling.trace_cache import DEFAULT_CACHE_DIR
+    from src.snapshot import DEFAULT_SNAPSHOT_DIR
+
+    # The prepared data and the schedule, loaded once for both hashing and running
+    prepared = {}
+
+    def prepared_data():
+        from src.modeling.mcmc import load_data, prepare_data
+
+        if 'data' not in prepared:
+            prepared['data'] = prepare_data(load_data())
+        return prepared['data']
+
+    def trace_key():
+        from src.modeling.trace_cache import trace_fingerprint
+
+        return trace_fingerprint(prepared_data(), samples=samples, tune=tune)
+
+    def schedule():
+        # Fetched once (through the HTTP cache) for hashing and predicting
+        from src.modeling.prediction_table import fetch_schedule
+
+        if 'schedule' not in prepared:
+            prepared['schedule'] = fetch_schedule()
+        return prepared['schedule']
+
+    def database_rows():
+        from sqlalchemy.exc import SQLAlchemyError
+        from src.data_loader import get_engine
+
+        try:
+            with get_engine().connect() as conn:
+                return list(conn.exec_driver_sql('SELECT COUNT(*), MAX(date) FROM match_logs').one())
+        except SQLAlchemyError:
+            # A missing table (or an unreachable database) never matches, so the stage runs
+            return None
+
+    def scrape_match_logs():
+        from scripts.scrape_fbref import scrape_match_logs as scrape
+
+        if scrape(str(CSV_PATH), incremental=CSV_PATH.exists()) is None:
+            raise RuntimeError("Scraping the match logs failed")
+
+    def load_database():
+        import pandas as pd
+        from scripts.data_cleaner import clean_data
+        from scripts.database_manager import DatabaseManager
+
+        DatabaseManager().save_to_database(clean_data(pd.read_csv(CSV_PATH)))
+
+    def build_snapshot():
+        from src.snapshot import build_snapshot as build
+
+        build(str(CSV_PATH), root=DEFAULT_SNAPSHOT_DIR)
+
+    def fit():
+        from src.modeling.trace_cache import load_or_sample
+
+        load_or_sample(prepared_data(), samples=samples, tune=tune, adaptive=adaptive)
+
+    def export():
+        from src.modeling.posterior_store import export_posterior
+        from src.modeling.trace_cache import load_or_sample
+
+        data = prepared_data()
+        trace = load_or_sample(data, samples=samples, tune=tune, adaptive=adaptive)
+        export_posterior(trace, teams=data['teams'], fingerprint=trace_key())
+
+    def predictions():
+        from src.modeling.prediction_table import build_prediction_table, write_prediction_table
+        from src.modeling.mcmc import extract_posterior
+        from src.modeling.trace_cache import load_or_sample
+
+        data = prepared_data()
+        posterior = extract_posterior(load_or_sample(data, samples=samples, tune=tune, adaptive=adaptive))
+        write_prediction_table(build_prediction_table(posterior, data, schedule()), trace=trace_key())
+
+    cleaning_code = [PROJECT_ROOT / 'scripts' / 'data_cleaner.py', PROJECT_ROOT / 'src' / 'team_names.py']
+    after_scrape = ['scrape'] if scrape else []
+    # Checked first, since it loads .env and with it DATA_SOURCE
+    with_database = database_configured()
+    source_stage = 'snapshot' if os.getenv('DATA_SOURCE', 'database') == 'parquet' else 'database'
+
+    stages = [
+        Stage('snapshot', build_snapshot, inputs=lambda: [CSV_PATH, *cleaning_code],
+              outputs=lambda: [Path(DEFAULT_SNAPSHOT_DIR)], deps=after_scrape),
+        # Waits for the source load_data reads
+        Stage('fit', fit, inputs=lambda: [trace_key()],
+              outputs=lambda: [Path(DEFAULT_CACHE_DIR) / f'{trace_key()}.nc'], deps=[source_stage]),
+        Stage('export', export, inputs=lambda: [trace_key()],
+              outputs=lambda: [DEFAULT_POSTERIOR_PATH], deps=['fit']),
+        Stage('predictions', predictions, inputs=lambda: [trace_key(), schedule().to_dict('records')],
+              outputs=lambda: [DEFAULT_TABLE_PATH], deps=['fit']),
+    ]
+    if with_database or source_stage == 'database':
+        stages.insert(0, Stage('database', load_database,
+                               inputs=lambda: [CSV_PATH, *cleaning_code, os.getenv('DB_URL')],
+                               probe=database_rows, deps=after_scrape))
+    if scrape:
+        stages.insert(0, Stage('scrape', scrape_match_logs, outputs=lambda: [CSV_PATH], always=True))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--skip-scrape', action='store_true', help="Start from the current CSV backup")
+    parser.add_argument('--force', nargs='+', default=[], help="Stages to run even if their inputs are unchanged")
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--tune', type=int, default=1000)
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Sample until the convergence targets are met, with --samples as the most draws")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH)
+    args = parser.parse_args()
+
+    stages = refresh_stages(samples=args.samples, tune=args.tune, scrape=not args.skip_scrape,
+                            adaptive=args.adaptive)
+    run_pipeline(stages, state_path=args.state, force=args.force, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+HTTP prediction service.
+
+Loads the data and posterior once and answers prediction requests from
+memory. Concurrent requests are coalesced by a micro-batcher into one
+vectorised predict_matches call, and recent fixture results are kept in an
+LRU cache that is cleared whenever a new posterior is loaded. Predictions use
+the exact scoreline method, so a cached result is identical to a fresh one.
+
+    python -m src.service --port 8000
+
+    POST /predict        {"home_team": "Liverpool", "away_team": "Arsenal"}
+    POST /predict/batch  {"fixtures": [{"home_team": ..., "away_team": ...}, ...]}
+    POST /reload         reload the data and posterior, clearing the cache
+    GET  /health         teams, posterior version and batching/cache counters
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.modeling.mcmc import predict_matches, team_indices
+
+CACHE_SIZE = 4096
+MAX_BATCH = 256
+# Seconds the batcher waits for more requests after the first one arrives
+MAX_WAIT = 0.002
+
+
+class MicroBatcher:
+    """Collects concurrently submitted fixture lists and predicts them in one call"""
+
+    def __init__(self, predict_fn, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.fixtures = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, fixtures):
+        """Queue a list of (home_team, away_team) pairs; the Future resolves to one result per pair"""
+        future = Future()
+        self._queue.put((fixtures, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self):
+        """Block for one request, then take more until the batch is full or max_wait has passed"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        size = len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            fixtures = [pair for pairs, _ in batch for pair in pairs]
+            try:
+                results = self.predict_fn(fixtures)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.fixtures += len(fixtures)
+
+            start = 0
+            for pairs, future in batch:
+                future.set_result(results[start:start + len(pairs)])
+                start += len(pairs)
+
+
+class PredictionService:
+    """
+    In-memory posterior with micro-batched prediction and an LRU result cache.
+
+    Args:
+        posterior (dict): Output of extract_posterior (or load_posterior).
+        data (dict): Output of prepare_data the posterior was fit on.
+        loader (Callable[[], Tuple[dict, dict]] | None): Returns a fresh
+            (posterior, data) pair for reload().
+        cache_size (int): Fixtures kept in the LRU cache; 0 disables it.
+        max_batch (int): Most fixtures predicted in one call.
+        max_wait (float): Seconds a batch waits to fill up.
+    """
+
+    def __init__(self, posterior, data, loader=None, cache_size=CACHE_SIZE, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.loader = loader
+        self.cache_size = cache_size
+        self.requests = 0
+        self.cache_hits = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._state = None
+        self.load(posterior, data)
+        self._batcher = MicroBatcher(self._predict_batch, max_batch=max_batch, max_wait=max_wait)
+
+    def load(self, posterior, data):
+        """Swap in a new posterior and data and invalidate cached results"""
+        with self._lock:
+            self._version += 1
+            self._state = (self._version, posterior, data)
+            self._cache.clear()
+        print(f"Loaded posterior version {self._version} for {data['n_teams']} teams")
+
+    def reload(self):
+        if self.loader is None:
+            raise ValueError("Service was started without a loader")
+        self.load(*self.loader())
+
+    def close(self):
+        self._batcher.close()
+
+    @property
+    def teams(self):
+        return list(self._state[2]['teams'])
+
+    def _predict_batch(self, fixtures):
+        # One state snapshot per batch, so a concurrent reload never mixes posteriors
+        version, posterior, data = self._state
+        home, away = zip(*fixtures)
+        prediction = predict_matches(
+            posterior, team_indices(home, data), team_indices(away, data), data, method='exact'
+        )
+        return [(version, record) for record in prediction.to_dict('records')]
+
+    def predict(self, fixtures):
+        """
+        Predict a list of (home_team, away_team) pairs.
+
+        Cached fixtures are answered directly; the rest are deduplicated and
+        sent to the batcher together.
+
+        Returns:
+            List[dict]: Outcome, over/under and both-teams-to-score
+            probabilities and expected goals, one per pair.
+
+        Raises:
+            ValueError: If a team is not in the model.
+        """
+        fixtures = [(str(home), str(away)) for home, away in fixtures]
+        # Reject bad requests here so they cannot fail the other requests in a batch
+        _, _, data = self._state
+        team_indices([team for pair in fixtures for team in pair], data)
+
+        results = {}
+        with self._lock:
+            self.requests += 1
+            for pair in fixtures:
+                if pair in self._cache:
+                    self._cache.move_to_end(pair)
+                    results[pair] = self._cache[pair]
+                    self.cache_hits += 1
+        missing = list(dict.fromkeys(pair for pair in fixtures if pair not in results))
+
+        if missing:
+            computed = self._batcher.submit(missing).result()
+            with self._lock:
+                for pair, (version, record) in zip(missing, computed):
+                    results[pair] = record
+                    # Results computed from a posterior that has since been replaced are not cached
+                    if self.cache_size and version == self._version:
+                        self._cache[pair] = record
+                        if len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+
+        return [dict(results[pair], home_team=pair[0], away_team=pair[1]) for pair in fixtures]
+
+    def stats(self):
+        return {
+            'version': self._version,
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self._cache),
+            'batches': self._batcher.batches,
+            'batched_fixtures': self._batcher.fixtures,
+        }
+
+
+def make_handler(service):
+    """A request handler class bound to a PredictionService"""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, dict(service.stats(), teams=service.teams))
+            else:
+                self._send(404, {'error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            try:
+                if self.path == '/predict':
+                    body = self._read_json()
+                    self._send(200, service.predict([(body['home_team'], body['away_team'])])[0])
+                elif self.path == '/predict/batch':
+                    body = self._read_json()
+                    fixtures = [(fixture['home_team'], fixture['away_team']) for fixture in body['fixtures']]
+                    self._send(200, {'predictions': service.predict(fixtures)})
+                elif self.path == '/reload':
+                    service.reload()
+                    self._send(200, service.stats())
+                else:
+                    self._send(404, {'error': f"Unknown path {self.path}"})
+            except (KeyError, TypeError, json.JSONDecodeError) as e:
+                self._send(400, {'error': f"Malformed request: {e!r}"})
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+            except Exception as e:
+                # e.g. a /reload whose loader fails; the previous posterior keeps serving
+                print(f"{self.command} {self.path} failed:\n{traceback.format_exc()}")
+                self._send(500, {'error': f"Internal error: {e!r}"})
+
+        def log_message(self, format, *args):
+            # Per-request logging would dominate latency under load
+            pass
+
+    return PredictionHandler
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 drops connections under bursts,
+    # which clients only retry after a second
+    request_queue_size = 128
+
+
+def serve(service, host='127.0.0.1', port=8000):
+    """Create a threading HTTP server for service; call serve_forever() on the result"""
+    return PredictionServer((host, port), make_handler(service))
+
+
+def load_serving_state():
+    """
+    Load the current data and its posterior.
+
+    Uses the exported posterior when its fingerprint matches this data, and
+    otherwise the trace cache entry for this data, which is the one the app's
+    PredictionStore predicts from.
+
+    Returns:
+        Tuple[dict, dict]: (posterior, data)
+    """
+    from src.modeling.mcmc import load_data, prepare_data
+    from src.modeling.posterior_store import load_matching_posterior
+
+    data = prepare_data(load_data())
+    return load_matching_posterior(data), data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-wait', type=float, default=MAX_WAIT, help="Seconds a batch waits to fill up")
+    args = parser.parse_args()
+
+    service = PredictionService(*load_serving_state(), loader=load_serving_state, cache_size=args.cache_size,
+                                max_batch=args.max_batch, max_wait=args.max_wait)
+    server = serve(service, args.host, args.port)
+    print(f"Serving predictions on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Local Parquet snapshot of the match logs.
+
+The snapshot holds the cleaned, typed and team-name-normalised match logs,
+partitioned by season (data/snapshot/season=2024-2025/...), so training and
+the app can run without a database. Reads prune columns and seasons and
+memory-map the files.
+
+Build it from the CSV backup or from the database, from the repository root:
+
+    python -m src.snapshot
+    python -m src.snapshot --from-database
+
+and select it with DATA_SOURCE=parquet or load_data(source='parquet').
+"""
+import argparse
+import glob
+import os
+import shutil
+import time
+import uuid
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SNAPSHOT_DIR = os.path.join(PROJECT_ROOT, 'data', 'snapshot')
+DEFAULT_CSV_PATH = os.path.join(PROJECT_ROOT, 'data', 'backups', 'match_logs.csv')
+
+# Seasons run July to June, matching data_loader.season_bounds
+SEASON_START_MONTH = 7
+
+
+def season_of(dates):
+    """Season label such as '2024-2025' for each date"""
+    dates = pd.to_datetime(pd.Series(dates))
+    start_year = dates.dt.year - (dates.dt.month < SEASON_START_MONTH)
+    return start_year.astype(str) + '-' + (start_year + 1).astype(str)
+
+
+def _version_path(root):
+    return f"{root}.v{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def write_snapshot(df, root=DEFAULT_SNAPSHOT_DIR):
+    """
+    Write match logs to a Parquet dataset partitioned by season.
+
+    Each snapshot is written to its own versioned directory next to root
+    (root.v<id>) and root is a symlink to the current one. The symlink is
+    replaced with a single rename, so root always exists and readers see
+    either the old or the new snapshot, never a half-written one. The
+    previous version is kept for readers that opened it before the swap;
+    older ones are removed.
+
+    Args:
+        df (pd.DataFrame): Cleaned match logs with a date column.
+        root (str): Dataset directory.
+
+    Returns:
+        List[str]: The seasons written.
+    """
+    from src.data_loader import MATCH_LOG_DTYPES
+
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.astype({col: kind for col, kind in MATCH_LOG_DTYPES.items() if col in df.columns})
+    df['season'] = season_of(df['date']).to_numpy()
+
+    root = os.path.abspath(root)
+    os.makedirs(os.path.dirname(root), exist_ok=True)
+    if os.path.isdir(root) and not os.path.islink(root):
+        # A snapshot written before versioning; moved aside once so root can become a symlink
+        os.replace(root, _version_path(root))
+    previous = os.path.realpath(root) if os.path.islink(root) else None
+
+    version = _version_path(root)
+    df.to_parquet(version, partition_cols=['season'], index=False)
+    link = f"{version}.link"
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, root)
+
+    keep = {os.path.realpath(version), previous}
+    for path in glob.glob(f"{glob.escape(root)}.v*"):
+        if not os.path.islink(path) and os.path.realpath(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+    seasons = sorted(df['season'].unique())
+    print(f"Wrote {len(df)} rows for seasons {', '.join(seasons)} to {root}")
+    return seasons
+
+
+def read_snapshot(columns=None, start_date=None, end_date=None, season=None, root=DEFAULT_SNAPSHOT_DIR):
+    """
+    Read match logs from the Parquet snapshot.
+
+    Only the requested columns are read, whole season partitions are skipped
+    by the season filter, and the date range is applied as a row filter.
+
+    Args:
+        columns (List[str] | None): Columns to read; all columns if None.
+        start_date (str | datetime | None): Earliest date to include.
+        end_date (str | datetime | None): Latest date to include.
+        season (str | None): Season such as '2024-2025'.
+        root (str): Dataset directory.
+
+    Returns:
+        pd.DataFrame: The selected match logs.
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"No snapshot at {root}; build one with `python -m src.snapshot`")
+
+    filters = []
+    if season is not None:
+        filters.append(('season', '=', season))
+    if start_date is not None:
+        filters.append(('date', '>=', pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(('date', '<=', pd.Timestamp(end_date)))
+
+    df = pd.read_parquet(
+        root,
+        columns=list(columns) if columns is not None else None,
+        filters=filters or None,
+        memory_map=True,
+    )
+    if columns is None:
+        df = df.drop(columns='season')
+    elif 'season' in df.columns:
+        df['season'] = df['season'].astype(str)
+    df = df.reset_index(drop=True)
+
+    print(f"Loaded {len(df)} rows from snapshot {root}")
+    return df
+
+
+def build_snapshot(csv_path=DEFAULT_CSV_PATH, from_database=False, root=DEFAULT_SNAPSHOT_DIR):
+    """Clean and normalise the CSV backup (or read the database) and write the snapshot"""
+    from src.team_names import normalize_team_names
+
+    if from_database:
+        from src.data_loader import load_from_database
+        df = load_from_database('match_logs')
+    else:
+        from scripts.data_cleaner import clean_data
+        df = clean_data(pd.read_csv(csv_path))
+
+    return write_snapshot(normalize_team_names(df), root=root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help="CSV backup to snapshot")
+    parser.add_argument('--from-database', action='store_true', help="Snapshot the match_logs table instead of the CSV")
+    parser.add_argument('--output', default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory")
+    args = parser.parse_args()
+
+    build_snapshot(args.csv, from_database=args.from_database, root=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Canonical team names.
+
+Match logs name a team by its FBref URL slug (e.g. 'Tottenham-Hotspur') but
+its opponents, and the schedule, by FBref's short display name (e.g.
+'Tottenham'). Every name is mapped to the slug form here, in one place, for
+the cleaner, the model loaders and the app.
+"""
+import pandas as pd
+
+# FBref display name -> canonical name; names not listed are already canonical
+TEAM_NAME_MAPPING = {
+    "Nott'ham Forest": "Nottingham-Forest",
+    "Ipswich Town": "Ipswich-Town",
+    "Leicester City": "Leicester-City",
+    "Tottenham": "Tottenham-Hotspur",
+    "Manchester City": "Manchester-City",
+    "Newcastle Utd": "Newcastle-United",
+    "West Ham": "West-Ham-United",
+    "Aston Villa": "Aston-Villa",
+    "Brighton": "Brighton-and-Hove-Albion",
+    "Crystal Palace": "Crystal-Palace",
+    "Wolves": "Wolverhampton-Wanderers",
+    "Manchester Utd": "Manchester-United",
+}
+
+TEAM_COLUMNS = ('team', 'opponent')
+
+
+def canonical_team_name(name):
+    """Canonical form of a single team name"""
+    return TEAM_NAME_MAPPING.get(name, name)
+
+
+def normalize_team_names(df, columns=TEAM_COLUMNS):
+    """
+    Map the team name columns of df to canonical names in place.
+
+    Categorical columns are mapped through their categories, so each
+    distinct name is looked up once whatever the number of rows.
+    """
+    for col in columns:
+        if col not in df.columns:
+            continue
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Several names can map to one, in which case map() drops the dtype
+            df[col] = df[col].map(canonical_team_name).astype('category')
+        else:
+            df[col] = df[col].replace(TEAM_NAME_MAPPING)
+    return df
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+TEAMS = ['Arsenal', 'Brentford', 'Chelsea', 'Everton', 'Fulham', 'Liverpool']
+
+
+def synthetic_match_logs(teams=TEAMS, rounds=2, seed=0, start='2024-08-17'):
+    """A double round robin in the cleaned match log layout, one row per team and fixture"""
+    rng = np.random.default_rng(seed)
+    n = len(teams)
+    # Circle method: every team plays once per week
+    order = list(range(n))
+    weeks = []
+    for _ in range(n - 1):
+        weeks.append([(order[i], order[n - 1 - i]) for i in range(n // 2)])
+        order = [order[0], order[-1]] + order[1:-1]
+    weeks = (weeks + [[(away, home) for home, away in week] for week in weeks]) * (rounds // 2)
+
+    rows = []
+    for week, fixtures in enumerate(weeks):
+        date = pd.Timestamp(start) + pd.Timedelta(weeks=week)
+        for home, away in fixtures:
+            goals = rng.poisson([1.6, 1.1])
+            shots = goals + rng.poisson(3, size=2)
+            xg = np.round(goals * 0.8 + rng.gamma(2, 0.2, size=2), 1)
+            possession = rng.integers(35, 66)
+            for side, (team, opponent) in enumerate([(home, away), (away, home)]):
+                rows.append({
+                    'date': date,
+                    'team': teams[team],
+                    'opponent': teams[opponent],
+                    'venue': 'Home' if side == 0 else 'Away',
+                    'goals_for': int(goals[side]),
+                    'goals_against': int(goals[1 - side]),
+                    'shots_on_target': int(shots[side]),
+                    'shooting_xG': float(xg[side]),
+                    'possession': float(possession if side == 0 else 100 - possession),
+                })
+    return pd.DataFrame(rows)
+
+
+def synthetic_posterior(n_teams, draws=400, seed=0):
+    """Random parameters with the model's shapes"""
+    from src.modeling.mcmc import POSTERIOR_PARAMS
+
+    rng = np.random.default_rng(seed)
+    return {
+        name: rng.normal(0, 0.1, size=(draws, n_teams) if name in ('attack', 'defense') else draws)
+        for name in POSTERIOR_PARAMS
+    }
+
+
+@pytest.fixture
+def match_logs():
+    return synthetic_match_logs()
+
+
+@pytest.fixture
+def prepared(match_logs):
+    from src.modeling.mcmc import prepare_data
+
+    return prepare_data(match_logs)
+
+
+@pytest.fixture(scope='session')
+def trace():
+    """A short NUTS fit of the synthetic season, shared by the tests that need a real trace"""
+    from src.modeling.compiled_model import compiled_model
+    from src.modeling.mcmc import prepare_data
+
+    data = prepare_data(synthetic_match_logs())
+    return compiled_model(data).sample(data, samples=100, tune=100, cores=1, random_seed=0)
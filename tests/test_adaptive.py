@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from src.modeling import adaptive, trace_cache
+from src.modeling.adaptive import sample_adaptive
+from src.modeling.compiled_model import compiled_model
+from src.modeling.mcmc import sample_model, set_model_data
+from src.modeling.warm_start import refit
+
+
+@pytest.fixture
+def model(prepared):
+    return set_model_data(compiled_model(prepared).model, prepared)
+
+
+def test_sample_model_forwards_the_targets(monkeypatch, model):
+    calls = []
+    monkeypatch.setattr(adaptive, 'sample_adaptive', lambda model, **kwargs: calls.append(kwargs))
+
+    sample_model(model, samples=800, tune=100, cores=1, adaptive=True, max_rhat=1.05, min_ess=50, chunk_size=40)
+    sample_model(model, samples=800, tune=100, cores=1, adaptive=True)
+
+    assert calls[0] == {'max_draws': 800, 'tune': 100, 'cores': 1, 'max_rhat': 1.05, 'min_ess': 50, 'chunk_size': 40}
+    assert calls[1] == {'max_draws': 800, 'tune': 100, 'cores': 1}
+
+
+def test_stops_once_the_targets_are_met(model):
+    trace = sample_adaptive(model, max_draws=300, tune=100, chunk_size=50, cores=1,
+                            max_rhat=1.5, min_ess=10, random_seed=0)
+    assert trace.posterior.sizes['draw'] == 50
+
+
+def test_chunks_extend_the_chains_up_to_the_budget(model):
+    trace = sample_adaptive(model, max_draws=90, tune=50, chunk_size=40, cores=1,
+                            max_rhat=1.0, min_ess=1e9, random_seed=0)
+
+    assert trace.posterior.sizes['draw'] == 90
+    np.testing.assert_array_equal(trace.posterior['draw'].values, np.arange(90))
+    assert trace.sample_stats.sizes['draw'] == 90
+
+
+def test_a_given_step_is_frozen_in_place(prepared, model):
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiag
+
+    compiled = compiled_model(prepared)
+    step = compiled.reset_step()
+    compiles = compiled.timings['compiles']
+
+    sample_adaptive(model, max_draws=60, tune=50, chunk_size=30, cores=1, max_rhat=1.0, min_ess=1e9,
+                    random_seed=0, step=step)
+
+    assert compiled.timings['compiles'] == compiles
+    assert isinstance(step.potential, QuadPotentialDiag)
+
+
+def test_later_chunks_sample_at_the_adapted_step_size(prepared, model):
+    step = compiled_model(prepared).reset_step()
+
+    trace = sample_adaptive(model, max_draws=80, tune=50, chunk_size=40, cores=1, max_rhat=1.0, min_ess=1e9,
+                            random_seed=0, step=step)
+
+    # The first chunk samples at its dual-averaged step size; later chunks keep it
+    adapted = np.median(trace.sample_stats['step_size_bar'].values[:, 39])
+    assert step.step_size == pytest.approx(adapted)
+    np.testing.assert_allclose(trace.sample_stats['step_size'].values[:, 40:], adapted)
+
+
+def test_adaptive_refit(prepared, trace):
+    new_trace, report = refit(prepared, trace, samples=100, tune=50, cores=1, max_rhat=1.5, min_ess=10,
+                              adaptive=True, chunk_size=50)
+
+    assert new_trace.posterior.sizes['draw'] == 50
+    assert new_trace.posterior.sizes['chain'] == trace.posterior.sizes['chain']
+    assert report['max_rhat'] <= 1.5
+
+
+def test_adaptive_fit_is_cached_under_the_fixed_length_key(monkeypatch, tmp_path, prepared, trace):
+    calls = []
+
+    def fake_sample_model(model, **kwargs):
+        calls.append(kwargs)
+        return trace
+
+    monkeypatch.setattr(trace_cache, 'sample_model', fake_sample_model)
+    trace_cache.load_or_sample(prepared, samples=500, tune=100, cache_dir=tmp_path, adaptive=True, min_ess=200)
+
+    key = trace_cache.trace_fingerprint(prepared, samples=500, tune=100)
+    assert (tmp_path / f'{key}.nc').exists()
+    assert calls == [{'samples': 500, 'tune': 100, 'adaptive': True, 'max_rhat': None, 'min_ess': 200,
+                      'chunk_size': None}]
+
+    trace_cache.load_or_sample(prepared, samples=500, tune=100, cache_dir=tmp_path)
+    assert len(calls) == 1
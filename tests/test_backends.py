@@ -0,0 +1,52 @@
+import numpy as np
+import pymc as pm
+import pytest
+
+from src.modeling.backends import fit, fit_advi
+from src.modeling.mcmc import POSTERIOR_PARAMS, build_model, extract_posterior
+
+
+def test_laplace_recovers_a_gaussian_posterior():
+    observed = np.random.default_rng(0).normal(1.0, 2.0, size=400)
+    with pm.Model() as model:
+        mu = pm.Normal('mu', 0.0, 10.0)
+        sigma = pm.HalfNormal('sigma', 5.0)
+        pm.Normal('y', mu, sigma, observed=observed)
+
+    trace = fit(model, 'laplace', samples=4000, random_seed=0)
+
+    mu = trace.posterior['mu'].values
+    assert mu.shape == (1, 4000)
+    assert mu.mean() == pytest.approx(observed.mean(), abs=0.02)
+    assert mu.std() == pytest.approx(observed.std() / np.sqrt(len(observed)), rel=0.1)
+    # Constrained variables come back on their own scale, without the log_ copies
+    assert trace.posterior['sigma'].values.mean() == pytest.approx(observed.std(), rel=0.05)
+    assert set(trace.posterior.data_vars) == {'mu', 'sigma'}
+
+
+def test_laplace_fit_of_the_match_model_agrees_with_nuts(prepared, trace):
+    laplace = extract_posterior(fit(build_model(prepared), 'laplace', samples=500, random_seed=0))
+    nuts = extract_posterior(trace)
+
+    for name in POSTERIOR_PARAMS:
+        assert laplace[name].shape[1:] == nuts[name].shape[1:]
+    np.testing.assert_allclose(laplace['attack'].mean(axis=0), nuts['attack'].mean(axis=0), atol=0.25)
+
+
+def test_advi_returns_posterior_draws(prepared):
+    posterior = extract_posterior(fit_advi(build_model(prepared), samples=200, iterations=2000, random_seed=0))
+
+    assert posterior['attack'].shape == (200, prepared['n_teams'])
+    assert set(posterior) == set(POSTERIOR_PARAMS)
+
+
+def test_unknown_and_unavailable_backends(prepared):
+    model = build_model(prepared)
+
+    with pytest.raises(ValueError, match='Unknown backend'):
+        fit(model, 'gibbs')
+    try:
+        import jax  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match='needs jax'):
+            fit(model, 'numpyro')
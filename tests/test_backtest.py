@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.backtest import fold_cutoffs, run_fold, summarize
+
+
+def test_fold_cutoffs_start_after_the_minimum_training_set(prepared):
+    # Three fixtures a week for ten weeks; nine fixtures are played by the third week
+    dates = prepared['dates']
+
+    cutoffs = fold_cutoffs(dates, every_weeks=2, min_train_fixtures=9, n_teams=prepared['n_teams'])
+
+    first = np.datetime64(pd.Timestamp(dates[8]).date()) + np.timedelta64(1, 'D')
+    assert cutoffs[0] == first
+    assert np.diff(cutoffs).tolist() == [np.timedelta64(14, 'D')] * (len(cutoffs) - 1)
+    assert cutoffs[-1] <= dates.max().astype('datetime64[D]') < cutoffs[-1] + np.timedelta64(14, 'D')
+
+
+def test_fold_cutoffs_need_more_fixtures_than_teams(prepared):
+    assert fold_cutoffs(prepared['dates'], min_train_fixtures=1, n_teams=12)[0] > fold_cutoffs(
+        prepared['dates'], min_train_fixtures=1, n_teams=6)[0]
+    with pytest.raises(ValueError, match='Need more than 30 fixtures'):
+        fold_cutoffs(prepared['dates'], min_train_fixtures=30)
+
+
+def test_run_fold_trains_only_on_earlier_fixtures(prepared):
+    cutoffs = fold_cutoffs(prepared['dates'], min_train_fixtures=12)
+    cutoff = cutoffs[0]
+
+    fold = run_fold(cutoff, cutoff + np.timedelta64(7, 'D'), samples=200, tune=0, cores=1,
+                    backend='laplace', n_recent_matches=5, seed=0, data=prepared)
+
+    dates = prepared['dates'].astype('datetime64[D]')
+    in_window = (dates >= cutoff) & (dates < cutoff + np.timedelta64(7, 'D'))
+    assert len(fold) == in_window.sum() == 3
+    assert (fold['n_train'] == (dates < cutoff).sum()).all()
+    assert (fold['date'] >= pd.Timestamp(cutoff)).all()
+    np.testing.assert_array_equal(fold['home_goals'], prepared['home_goals'][in_window])
+    np.testing.assert_allclose(fold[['home_win_prob', 'draw_prob', 'away_win_prob']].sum(axis=1), 1.0)
+
+    summary = summarize(fold)
+    assert summary[['n_test', 'n_train']].iloc[0].tolist() == [3, 12]
+    assert summary['log_loss'].iloc[0] == summary['cumulative_log_loss'].iloc[0]
+
+
+def test_run_fold_skips_empty_windows(prepared):
+    after = prepared['dates'].max().astype('datetime64[D]') + np.timedelta64(7, 'D')
+
+    assert run_fold(after, after + np.timedelta64(7, 'D'), samples=10, tune=0, cores=1,
+                    backend='laplace', n_recent_matches=5, seed=0, data=prepared) is None
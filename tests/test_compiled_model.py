@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.modeling.compiled_model import compiled_model
+from src.modeling.mcmc import slice_fixtures
+from src.modeling.warm_start import MASS_MATRIX_WEIGHT, refit, warm_start_state
+
+
+def test_folds_share_one_compiled_step(prepared, trace):
+    compiled = compiled_model(prepared)
+    compiles = compiled.timings['compiles']
+    first_half = slice_fixtures(prepared, np.arange(len(prepared['home_goals'])) < 15)
+
+    fold = compiled.sample(first_half, samples=50, tune=50, cores=1, random_seed=1)
+
+    assert compiled_model(first_half) is compiled
+    assert compiled.timings['compiles'] == compiles
+    assert fold.posterior.sizes['draw'] == 50
+    assert fold.posterior['attack'].shape[-1] == prepared['n_teams']
+
+
+def test_reset_step_replaces_potential_and_step_size(prepared):
+    compiled = compiled_model(prepared)
+    step = compiled.step
+    size = len(step.potential._initial_mean)
+
+    warm = compiled.reset_step(step_size=0.123)
+    assert warm is step
+    assert warm.step_size == 0.123
+    assert warm.integrator._potential is warm.potential
+
+    cold = compiled.reset_step()
+    assert cold.step_size == 0.25 / size ** 0.25
+    np.testing.assert_array_equal(cold.potential._initial_diag, np.ones(size))
+
+
+def test_refit_reuses_the_compiled_step(prepared, trace):
+    compiled = compiled_model(prepared)
+    compiled.step
+    compiles = compiled.timings['compiles']
+    state = warm_start_state(compiled.model, trace)
+
+    new_trace, report = refit(prepared, trace, samples=50, tune=50, cores=1)
+
+    assert compiled.timings['compiles'] == compiles
+    # The mass matrix adaptation started from the previous trace's variances
+    np.testing.assert_allclose(compiled.step.potential._initial_diag, state['variance'])
+    assert compiled.step.potential._initial_weight == MASS_MATRIX_WEIGHT
+    assert new_trace.posterior.sizes['chain'] == trace.posterior.sizes['chain']
+    assert set(report) >= {'max_rhat', 'min_ess_bulk', 'min_ess_tail', 'divergences', 'needs_full_refit', 'seconds'}
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from scripts.data_cleaner import CATEGORICAL_COLUMNS, clean_data
+
+
+def raw_match_logs():
+    """Scraped match logs as the CSV backup stores them: every cell is text"""
+    return pd.DataFrame({
+        'Date': ['2024-08-17', '2024-08-17', '2024-08-24'],
+        'Team': ['Manchester Utd', 'Fulham', 'Newcastle Utd'],
+        'Venue': ['Home', 'Away', 'Home'],
+        'Opponent': ['Fulham', 'Manchester Utd', 'Manchester City'],
+        'shooting_Time': ['20:00', ' ', '15:00'],
+        'shooting_Result': ['W', 'L', 'D'],
+        'shooting_GF': ['1', '0', ' 2 '],
+        'keeper_PSxG+/-': ['+0.4', '-1.2', ''],
+        'passing_TotDist': ['5,512', '4,101', '6,000'],
+        'possession_Poss': ['62', '38', '51'],
+    }, dtype=object)
+
+
+def test_clean_data_types_and_normalises_columns():
+    df = clean_data(raw_match_logs())
+
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+    np.testing.assert_array_equal(df['goals_for'], [1, 0, 2])
+    np.testing.assert_allclose(df['expected_goals_plus_minus'], [0.4, -1.2, np.nan])
+    np.testing.assert_array_equal(df['total_passing_distance'], [5512, 4101, 6000])
+    np.testing.assert_array_equal(df['possession'], [62, 38, 51])
+    for col in CATEGORICAL_COLUMNS:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype)
+
+
+def test_clean_data_keeps_text_and_blanks():
+    df = clean_data(raw_match_logs())
+
+    assert df['time'].tolist()[0] == '20:00'
+    assert pd.isna(df['time'].iloc[1])
+    assert df['result'].astype(str).tolist() == ['W', 'L', 'D']
+
+
+def test_clean_data_maps_team_names():
+    df = clean_data(raw_match_logs())
+
+    assert df['team'].astype(str).tolist() == ['Manchester-United', 'Fulham', 'Newcastle-United']
+    assert df['opponent'].astype(str).tolist() == ['Fulham', 'Manchester-United', 'Manchester-City']
+
+
+def test_mixed_columns_stay_text():
+    raw = raw_match_logs()
+    raw['shooting_GF'] = ['1', 'abandoned', '2']
+
+    df = clean_data(raw)
+
+    assert df['goals_for'].tolist() == ['1', 'abandoned', '2']
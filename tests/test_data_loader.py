@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src import data_loader
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'match_logs.db'}"
+    monkeypatch.setenv('DB_URL', url)
+    data_loader.get_engine.cache_clear()
+    df = pd.DataFrame({
+        'date': ['2024-08-17', '2024-08-17', '2025-01-04', '2025-08-16'],
+        'team': ['Arsenal', 'Wolves', 'Arsenal', 'Arsenal'],
+        'goals_for': [2, 0, 1, None],
+        'shots': [18, 9, 12, None],
+        'shooting_xG': [1.2, 0.3, 0.9, None],
+    })
+    df.to_sql('match_logs', create_engine(url), index=False)
+    yield url
+    data_loader.get_engine.cache_clear()
+
+
+def test_counts_with_nulls_read_as_nullable_integers(database):
+    df = data_loader.load_from_database()
+
+    assert df['goals_for'].dtype == 'Int64'
+    assert df['shots'].dtype == 'Int64'
+    assert df['shooting_xG'].dtype == 'float64'
+    assert df['goals_for'].isna().tolist() == [False, False, False, True]
+    assert df['goals_for'].iloc[:3].tolist() == [2, 0, 1]
+
+
+def test_columns_and_dates_are_pushed_into_the_query(database):
+    df = data_loader.load_from_database(columns=['date', 'team', 'goals_for'], season='2024-2025', chunksize=1)
+
+    assert list(df.columns) == ['date', 'team', 'goals_for']
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-08-17', '2024-08-17', '2025-01-04']
+    assert df['goals_for'].dtype == 'Int64'
+
+
+def test_engine_is_shared(database):
+    assert data_loader.get_engine() is data_loader.get_engine()
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+from sqlalchemy import inspect
+
+from scripts.database_manager import PRIMARY_KEY, DatabaseManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return DatabaseManager(url=f"sqlite:///{tmp_path / 'match_logs.db'}")
+
+
+def match_logs(goals=(2, 0, 1)):
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-08-17', '2024-08-17', '2024-08-24']),
+        'team': ['Arsenal', 'Wolves', 'Arsenal'],
+        'goals_for': list(goals),
+        'shooting_xG': [1.2, 0.3, 0.9],
+    })
+
+
+def stored(manager):
+    df = pd.read_sql_table('match_logs', manager.engine)
+    return df.sort_values(PRIMARY_KEY).reset_index(drop=True)
+
+
+def test_first_save_builds_keyed_table(manager):
+    assert manager.save_to_database(match_logs()) == 3
+
+    assert inspect(manager.engine).get_pk_constraint('match_logs')['constrained_columns'] == PRIMARY_KEY
+    assert stored(manager)['goals_for'].tolist() == [2, 0, 1]
+
+
+def test_upsert_writes_only_new_and_changed_rows(manager):
+    manager.save_to_database(match_logs())
+
+    assert manager.save_to_database(match_logs()) == 0
+
+    update = pd.concat([match_logs(goals=(2, 0, 3)), pd.DataFrame({
+        'date': pd.to_datetime(['2024-08-31']), 'team': ['Wolves'], 'goals_for': [1], 'shooting_xG': [0.8],
+    })], ignore_index=True)
+    assert manager.save_to_database(update) == 2
+
+    df = stored(manager)
+    assert list(zip(df['team'], df['goals_for'])) == [('Arsenal', 2), ('Wolves', 0), ('Arsenal', 3), ('Wolves', 1)]
+
+
+def test_duplicate_keys_keep_the_last_row(manager):
+    df = pd.concat([match_logs(), match_logs(goals=(5, 0, 1)).iloc[[0]]], ignore_index=True)
+
+    manager.save_to_database(df)
+
+    assert stored(manager)['goals_for'].tolist() == [5, 0, 1]
+
+
+def test_legacy_table_without_key_is_rebuilt(manager):
+    # The old loader replaced the table with pandas defaults: no primary key
+    match_logs(goals=(9, 9, 9)).to_sql('match_logs', manager.engine, index=False)
+
+    assert manager.save_to_database(match_logs()) == 3
+
+    assert inspect(manager.engine).get_pk_constraint('match_logs')['constrained_columns'] == PRIMARY_KEY
+    assert inspect(manager.engine).get_table_names() == ['match_logs']
+    assert stored(manager)['goals_for'].tolist() == [2, 0, 1]
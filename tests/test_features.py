@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.features import FORM_STATS, FORM_WINDOWS, form_column, rolling_form_features
+from tests.conftest import synthetic_match_logs
+
+
+def naive_form(df, stat, window):
+    """Average of the stat over each team's previous `window` matches, one row at a time"""
+    values = []
+    for _, row in df.iterrows():
+        history = df[(df['team'] == row['team']) & (df['date'] < row['date'])].sort_values('date')
+        recent = history[stat].tail(window).dropna()
+        values.append(recent.mean() if len(recent) else 0.0)
+    return np.array(values)
+
+
+def test_rolling_form_matches_naive_loop():
+    # Shuffled so the result has to be aligned back to the original index
+    df = synthetic_match_logs(rounds=4).sample(frac=1, random_state=1)
+
+    form = rolling_form_features(df)
+
+    assert form.index.equals(df.index)
+    for stat in FORM_STATS:
+        for window in FORM_WINDOWS:
+            np.testing.assert_allclose(form[form_column(stat, window)].to_numpy(), naive_form(df, stat, window))
+
+
+def test_rolling_form_skips_missing_values_and_starts_at_zero():
+    df = pd.DataFrame({
+        'team': ['Arsenal'] * 4,
+        'date': pd.date_range('2024-08-17', periods=4, freq='7D'),
+        'goals_for': [2.0, np.nan, 4.0, 1.0],
+    })
+
+    form = rolling_form_features(df, windows=(2,), stats=['goals_for'])
+
+    # The NaN match counts towards the window but not the average
+    np.testing.assert_allclose(form['goals_for_last_2'], [0.0, 2.0, 2.0, 4.0])
+
+
+def test_prediction_form_does_not_depend_on_row_order():
+    from src.modeling.mcmc import prepare_data, slice_fixtures
+
+    df = synthetic_match_logs(rounds=4)
+    ordered = prepare_data(df.copy())
+    shuffled = prepare_data(df.sample(frac=1, random_state=1).reset_index(drop=True))
+
+    assert shuffled['avg_goals'] == pytest.approx(ordered['avg_goals'])
+
+    # Each team's latest five matches by date, as the training features see them
+    expected = df.sort_values('date').groupby('team')['goals_for'].apply(lambda goals: goals.tail(5).mean())
+    assert ordered['avg_goals'] == pytest.approx(expected.to_dict())
+
+    first_weeks = shuffled['dates'] < np.datetime64('2024-09-21')
+    sliced = slice_fixtures(shuffled, first_weeks)
+    expected = (df[df['date'] < '2024-09-21'].sort_values('date')
+                .groupby('team')['goals_for'].apply(lambda goals: goals.tail(5).mean()))
+    assert sliced['avg_goals'] == pytest.approx(expected.to_dict())
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from scripts.html_tables import extract_columns, parse_table, strain_tables
+from scripts.scrape_fbref import COLUMNS_TO_KEEP
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'fbref'
+PAGES = sorted(FIXTURES.rglob('*-Match-Logs-Premier-League.html'))
+
+
+def full_parse_rows(html, columns_to_keep):
+    """The original path: parse the whole page, then build one dict per row"""
+    table = BeautifulSoup(html, 'html.parser').find('table', {'id': 'matchlogs_for'})
+    rows = table.find_all('tr')
+    headers = [th.text.strip() for th in rows[1].find_all('th')]
+    indices = [i for i, col in enumerate(headers) if col in columns_to_keep]
+    matches = []
+    for row in rows[2:-1]:
+        cells = row.find_all(['th', 'td'])
+        if len(cells) > max(indices):
+            matches.append({headers[i]: cells[i].text.strip() for i in indices})
+    return matches
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda page: f"{page.parents[0].name}-{page.stem.split('-')[0]}")
+def test_targeted_parse_matches_full_parse(page):
+    html = page.read_text()
+    columns_to_keep = COLUMNS_TO_KEEP[page.parent.name]
+
+    columns = extract_columns(parse_table(html, 'matchlogs_for'), columns_to_keep)
+
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    assert rows == full_parse_rows(html, columns_to_keep)
+
+
+def test_strain_tables_keeps_only_the_requested_tables():
+    html = PAGES[0].read_text()
+
+    soup = strain_tables(html, 'matchlogs_for')
+
+    assert [table['id'] for table in soup.find_all('table')] == ['matchlogs_for']
+    assert parse_table(html, 'no_such_table') is None
+
+
+def test_extract_columns_skips_short_rows_and_tiny_tables():
+    html = """<table id="t">
+        <tr><th colspan="3">Group</th></tr>
+        <tr><th>Date</th><th>GF</th><th>GF</th></tr>
+        <tr><th>2024-08-17</th><td>1</td><td>2</td></tr>
+        <tr><th>2024-08-24</th><td>3</td></tr>
+        <tr><th>Total</th><td>4</td><td>2</td></tr>
+    </table>"""
+    table = parse_table(html, 't')
+
+    # Duplicate header names keep the last matching cell
+    assert extract_columns(table, ['Date', 'GF']) == {'Date': ['2024-08-17'], 'GF': ['2']}
+    assert extract_columns(table, ['xG']) is None
+    assert extract_columns(parse_table('<table id="t"><tr><th>a</th></tr></table>', 't'), ['a']) is None
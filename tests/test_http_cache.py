@@ -0,0 +1,85 @@
+import re
+from pathlib import Path
+
+import pytest
+import requests
+
+from scripts.fixture_server import start_server
+from scripts.http_cache import DAY, CacheMiss, HTTPCache
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'fbref'
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server, base_url = start_server(str(FIXTURES))
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def page_url(base_url):
+    page = next(FIXTURES.rglob('*-Stats.html')).relative_to(FIXTURES / 'en')
+    return f"{base_url}/{page.with_suffix('')}"
+
+
+def fetch(cache, url):
+    """Fetch through the cache, returning the response and how many network requests it made"""
+    requests_made = []
+    response = cache.get(url, before_request=lambda: requests_made.append(url))
+    return response, len(requests_made)
+
+
+def test_fresh_entries_are_served_from_disk(tmp_path, page_url):
+    cache = HTTPCache(cache_dir=str(tmp_path), ttl_rules=[(re.compile(''), DAY)], offline=False)
+
+    first, first_requests = fetch(cache, page_url)
+    second, second_requests = fetch(cache, page_url)
+
+    assert (first_requests, first.from_cache) == (1, False)
+    assert (second_requests, second.from_cache) == (0, True)
+    assert second.text == first.text
+
+
+def test_stale_entries_are_revalidated(tmp_path, page_url):
+    cache = HTTPCache(cache_dir=str(tmp_path), ttl_rules=[(re.compile(''), 0)], offline=False)
+
+    first, _ = fetch(cache, page_url)
+    second, second_requests = fetch(cache, page_url)
+
+    # The fixture server answers the conditional request with 304, so the stored body is reused
+    assert second_requests == 1
+    assert second.from_cache
+    assert second.content == first.content
+
+
+def test_offline_mode_replays_stale_entries_and_rejects_misses(tmp_path, page_url):
+    HTTPCache(cache_dir=str(tmp_path), offline=False).get(page_url)
+    offline = HTTPCache(cache_dir=str(tmp_path), ttl_rules=[(re.compile(''), 0)], offline=True)
+
+    response, requests_made = fetch(offline, page_url)
+
+    assert (requests_made, response.from_cache, response.status_code) == (0, True, 200)
+    with pytest.raises(CacheMiss):
+        offline.get(page_url + '-missing')
+
+
+def test_errors_are_not_cached(tmp_path, base_url):
+    cache = HTTPCache(cache_dir=str(tmp_path), offline=False)
+
+    response, _ = fetch(cache, f"{base_url}/missing-page")
+    again, requests_made = fetch(cache, f"{base_url}/missing-page")
+
+    assert response.status_code == 404
+    assert (requests_made, again.from_cache) == (1, False)
+    with pytest.raises(requests.HTTPError, match='404'):
+        again.raise_for_status()
+
+
+def test_ttl_rules_first_match_wins():
+    cache = HTTPCache(ttl_rules=[(re.compile('/matchlogs/'), 60), (re.compile('/squads/'), None)])
+
+    assert cache.ttl_for('https://fbref.com/en/squads/x/matchlogs/shooting') == 60
+    assert cache.ttl_for('https://fbref.com/en/squads/x') is None
+    assert cache.ttl_for('https://fbref.com/en/comps/9') == DAY
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.modeling import trace_cache
+from src.modeling.posterior_store import export_posterior, load_matching_posterior
+from src.modeling.trace_cache import trace_fingerprint
+from tests.conftest import synthetic_posterior
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ['pymc', 'pytensor', 'arviz', 'scipy.stats']
+
+
+@pytest.mark.parametrize('module', [
+    'src.modeling.mcmc',
+    'src.modeling.posterior_store',
+    'src.modeling.trace_cache',
+    'src.modeling.prediction_table',
+    'src.service',
+])
+def test_prediction_path_does_not_import_heavy_modules(module):
+    # A fresh interpreter, since this one has already imported pymc for other tests
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_matching_export_is_served_without_the_trace_cache(prepared, tmp_path, monkeypatch):
+    monkeypatch.setattr(trace_cache, 'load_or_sample', lambda *args, **kwargs: pytest.fail("trace cache used"))
+    posterior = synthetic_posterior(prepared['n_teams'])
+    path = export_posterior(posterior, tmp_path / 'posterior.npy',
+                            fingerprint=trace_fingerprint(prepared, samples=100, tune=100))
+
+    loaded = load_matching_posterior(prepared, path, samples=100, tune=100)
+
+    assert loaded['attack'].shape == posterior['attack'].shape
+
+
+@pytest.mark.parametrize('fingerprint', [None, 'stale'])
+def test_unmatched_export_falls_back_to_the_trace_cache(prepared, trace, tmp_path, monkeypatch, fingerprint):
+    calls = []
+    monkeypatch.setattr(trace_cache, 'load_or_sample', lambda data, **kwargs: calls.append(kwargs) or trace)
+    path = export_posterior(synthetic_posterior(prepared['n_teams']), tmp_path / 'posterior.npy', fingerprint=fingerprint)
+
+    loaded = load_matching_posterior(prepared, path, samples=100, tune=100)
+
+    assert calls == [{'samples': 100, 'tune': 100}]
+    assert loaded['attack'].shape[0] == trace.posterior.sizes['chain'] * trace.posterior.sizes['draw']
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.mcmc import predict_match, predict_matches
+from src.modeling.model_evaluation import calibration_table, evaluate_model, evaluate_predictions, team_breakdown
+from tests.conftest import synthetic_posterior
+
+
+@pytest.fixture
+def fixtures():
+    predictions = pd.DataFrame({
+        'home_win_prob': [0.6, 0.2, 0.3, 0.0],
+        'draw_prob': [0.3, 0.3, 0.4, 0.5],
+        'away_win_prob': [0.1, 0.5, 0.3, 0.5],
+        'expected_home_goals': [1.8, 0.9, 1.2, 0.7],
+        'expected_away_goals': [0.7, 1.5, 1.1, 1.4],
+    })
+    actuals = pd.DataFrame({
+        'home_team': ['Arsenal', 'Chelsea', 'Everton', 'Fulham'],
+        'away_team': ['Chelsea', 'Arsenal', 'Fulham', 'Everton'],
+        'home_goals': [2, 1, 0, 3],
+        'away_goals': [0, 1, 2, 1],
+    })
+    return predictions, actuals
+
+
+def naive_metrics(predictions, actuals):
+    """Log-loss and RPS one fixture at a time, from their textbook definitions"""
+    log_loss, rps = [], []
+    for (_, p), (_, a) in zip(predictions.iterrows(), actuals.iterrows()):
+        probs = [p['home_win_prob'], p['draw_prob'], p['away_win_prob']]
+        outcome = 0 if a['home_goals'] > a['away_goals'] else 1 if a['home_goals'] == a['away_goals'] else 2
+        log_loss.append(-math.log(max(probs[outcome], 1e-15)))
+        observed = [1.0 if i == outcome else 0.0 for i in range(3)]
+        rps.append(sum((sum(probs[:k + 1]) - sum(observed[:k + 1])) ** 2 for k in range(2)) / 2)
+    return np.mean(log_loss), np.mean(rps)
+
+
+def test_metrics_match_their_definitions(fixtures):
+    predictions, actuals = fixtures
+
+    metrics = evaluate_predictions(predictions, actuals)
+
+    log_loss, rps = naive_metrics(predictions, actuals)
+    assert metrics['log_loss'] == pytest.approx(log_loss)
+    assert metrics['rps'] == pytest.approx(rps)
+    assert metrics['accuracy'] == pytest.approx(0.25)
+    assert metrics['brier_home'] == pytest.approx(np.mean([0.16, 0.04, 0.09, 1.0]))
+    assert metrics['mae_home_goals'] == pytest.approx(np.mean([0.2, 0.1, 1.2, 2.3]))
+
+
+def test_zero_probability_outcomes_are_clipped(fixtures):
+    predictions, actuals = fixtures
+
+    # Fulham's home win had probability 0; the loss is large but finite
+    assert np.isfinite(evaluate_predictions(predictions, actuals)['log_loss'])
+
+
+def test_calibration_table_bins_each_outcome(fixtures):
+    predictions, actuals = fixtures
+
+    table = calibration_table(predictions, actuals, n_bins=2)
+
+    assert table.groupby('outcome')['count'].sum().to_dict() == {'away_win': 4, 'draw': 4, 'home_win': 4}
+    home_low = table[(table['outcome'] == 'home_win') & (table['lower'] == 0.0)].iloc[0]
+    assert home_low['count'] == 3
+    assert home_low['mean_predicted'] == pytest.approx((0.2 + 0.3 + 0.0) / 3)
+    assert home_low['observed_frequency'] == pytest.approx(1 / 3)
+
+
+def test_team_breakdown_counts_both_sides(fixtures):
+    predictions, actuals = fixtures
+
+    breakdown = team_breakdown(predictions, actuals).set_index('team')
+
+    assert breakdown['matches'].to_dict() == {'Arsenal': 2, 'Chelsea': 2, 'Everton': 2, 'Fulham': 2}
+    # Arsenal's goals MAE is over its own goals: 2 at home vs 1.8, 1 away vs 1.5
+    assert breakdown.loc['Arsenal', 'mae_goals'] == pytest.approx((0.2 + 0.5) / 2)
+
+
+def test_batched_evaluation_matches_per_row_loop(match_logs, prepared):
+    posterior = synthetic_posterior(prepared['n_teams'])
+    test_data = match_logs[match_logs['venue'] == 'Home']
+
+    def exact_matches(trace, home_idx, away_idx, data):
+        return predict_matches(trace, home_idx, away_idx, data, method='exact')
+
+    def exact_match(**kwargs):
+        return predict_match(method='exact', **kwargs)
+
+    batched, _, actuals = evaluate_model(prepared, test_data, posterior, predict_matches_fn=exact_matches)
+    looped, _, _ = evaluate_model(prepared, test_data, posterior, predict_match_fn=exact_match)
+
+    assert batched == pytest.approx(looped)
+    assert list(actuals.columns) == ['home_team', 'away_team', 'home_goals', 'away_goals']
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.mcmc import PAIRED_STATS, pair_fixtures, prepare_data
+
+
+def naive_pairs(df):
+    """The original per-row pairing: filter the whole frame for each home row's away row"""
+    pairs = []
+    for _, home in df[df['venue'] == 'Home'].iterrows():
+        away = df[(df['date'] == home['date']) & (df['team'] == home['opponent']) & (df['opponent'] == home['team'])].iloc[0]
+        pairs.append((home['date'], home['team'], away['team'], home['goals_for'], away['goals_for'],
+                      home['shooting_xG'], away['shooting_xG'], home['possession'], away['possession']))
+    return pairs
+
+
+def test_pair_fixtures_matches_naive_pairing(match_logs):
+    paired = pair_fixtures(match_logs)
+
+    expected = naive_pairs(match_logs)
+    actual = list(paired[['date', 'home_team', 'away_team', 'home_goals_for', 'away_goals_for',
+                          'home_shooting_xG', 'away_shooting_xG', 'home_possession', 'away_possession']]
+                  .itertuples(index=False, name=None))
+    assert actual == expected
+    assert len(paired) == len(match_logs) // 2
+    assert {f'away_{col}' for col in PAIRED_STATS} <= set(paired.columns)
+
+
+def test_pair_fixtures_rejects_duplicated_rows(match_logs):
+    with pytest.raises(ValueError, match='2 duplicated team/date rows'):
+        pair_fixtures(pd.concat([match_logs, match_logs.iloc[[0]]], ignore_index=True))
+
+
+def test_pair_fixtures_rejects_home_rows_without_away_row(match_logs):
+    away_row = match_logs[match_logs['venue'] == 'Away'].index[0]
+    with pytest.raises(ValueError, match='1 home fixtures without a matching away row'):
+        pair_fixtures(match_logs.drop(index=away_row))
+
+
+def test_prepare_data_indexes_teams_in_fixture_order(match_logs):
+    data = prepare_data(match_logs)
+
+    home = match_logs[match_logs['venue'] == 'Home']
+    assert [data['teams'][i] for i in data['home_teams']] == home['team'].tolist()
+    assert [data['teams'][i] for i in data['away_teams']] == home['opponent'].tolist()
+    np.testing.assert_array_equal(data['home_goals'], home['goals_for'].to_numpy())
+    np.testing.assert_allclose(data['home_possession'], home['possession'].to_numpy() / 100)
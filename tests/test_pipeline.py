@@ -0,0 +1,186 @@
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src import data_loader
+from src.modeling import prediction_table
+from src.pipeline import Stage, refresh_stages, run_pipeline, stage_fingerprint, stage_levels
+from tests.conftest import synthetic_match_logs
+
+
+def copy_stage(name, source, target, deps=()):
+    def run():
+        target.write_text(source.read_text().upper())
+    return Stage(name, run, inputs=lambda: [source], outputs=lambda: [target], deps=list(deps))
+
+
+@pytest.fixture
+def files(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('a')
+    return source, tmp_path / 'middle.txt', tmp_path / 'final.txt'
+
+
+def chain(files):
+    source, middle, final = files
+    return [copy_stage('first', source, middle), copy_stage('second', middle, final, deps=['first'])]
+
+
+def test_unchanged_stages_are_skipped(tmp_path, files):
+    state = tmp_path / 'state.json'
+    assert run_pipeline(chain(files), state_path=state) == {'first': 'ran', 'second': 'ran'}
+    assert run_pipeline(chain(files), state_path=state) == {'first': 'skipped', 'second': 'skipped'}
+
+    files[0].write_text('b')
+    assert run_pipeline(chain(files), state_path=state, dry_run=True) == {'first': 'would run', 'second': 'skipped'}
+    assert run_pipeline(chain(files), state_path=state) == {'first': 'ran', 'second': 'ran'}
+    assert files[2].read_text() == 'B'
+
+
+def test_forced_stage_with_unchanged_output_leaves_the_rest_skipped(tmp_path, files):
+    state = tmp_path / 'state.json'
+    run_pipeline(chain(files), state_path=state)
+    assert run_pipeline(chain(files), state_path=state, force=['first']) == {'first': 'ran', 'second': 'skipped'}
+
+
+def test_missing_output_reruns_the_stage(tmp_path, files):
+    state = tmp_path / 'state.json'
+    run_pipeline(chain(files), state_path=state)
+    files[2].unlink()
+    assert run_pipeline(chain(files), state_path=state) == {'first': 'skipped', 'second': 'ran'}
+
+
+def test_probe_mismatch_reruns_the_stage(tmp_path):
+    rows = {'count': 0}
+
+    def load():
+        rows['count'] = 3
+
+    stages = [Stage('load', load, inputs=lambda: ['config'], probe=lambda: (rows['count'], pd.Timestamp('2025-01-04')))]
+    state = tmp_path / 'state.json'
+    assert run_pipeline(stages, state_path=state) == {'load': 'ran'}
+    assert json.loads(state.read_text())['load']['probe'] == [3, '2025-01-04 00:00:00']
+    assert run_pipeline(stages, state_path=state) == {'load': 'skipped'}
+
+    rows['count'] = 0
+    assert run_pipeline(stages, state_path=state) == {'load': 'ran'}
+
+
+def test_state_files_with_bare_fingerprints_are_read(tmp_path, files):
+    state = tmp_path / 'state.json'
+    stages = chain(files)
+    run_pipeline(stages, state_path=state)
+    state.write_text(json.dumps({stage.name: stage_fingerprint(stage) for stage in stages}))
+    assert run_pipeline(stages, state_path=state) == {'first': 'skipped', 'second': 'skipped'}
+
+
+def test_failed_stage_stops_later_levels(tmp_path, files):
+    def fail():
+        raise OSError('disk full')
+
+    stages = [Stage('broken', fail), copy_stage('after', files[0], files[1], deps=['broken'])]
+    with pytest.raises(RuntimeError, match='broken'):
+        run_pipeline(stages, state_path=tmp_path / 'state.json')
+    assert not files[1].exists()
+
+
+def test_stage_levels_reject_cycles_and_unknown_deps():
+    noop = lambda: None  # noqa: E731
+    levels = stage_levels([Stage('a', noop), Stage('b', noop, deps=['a']), Stage('c', noop, deps=['a'])])
+    assert [[stage.name for stage in level] for level in levels] == [['a'], ['b', 'c']]
+    with pytest.raises(ValueError, match='cycle'):
+        stage_levels([Stage('a', noop, deps=['b']), Stage('b', noop, deps=['a'])])
+    with pytest.raises(ValueError, match='unknown'):
+        stage_levels([Stage('a', noop, deps=['missing'])])
+
+
+def test_dropped_or_emptied_table_is_reloaded(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'match_logs.db'}"
+    monkeypatch.setenv('DB_URL', url)
+    data_loader.get_engine.cache_clear()
+    state = tmp_path / 'state.json'
+
+    def run():
+        stages = [stage for stage in refresh_stages(scrape=False) if stage.name == 'database']
+        return run_pipeline(stages, state_path=state)['database']
+
+    try:
+        assert run() == 'ran'
+        assert run() == 'skipped'
+
+        with create_engine(url).begin() as conn:
+            conn.execute(text('DELETE FROM match_logs'))
+        assert run() == 'ran'
+
+        with create_engine(url).begin() as conn:
+            conn.execute(text('DROP TABLE match_logs'))
+        assert run() == 'ran'
+        with create_engine(url).connect() as conn:
+            assert conn.execute(text('SELECT COUNT(*) FROM match_logs')).scalar() > 0
+    finally:
+        data_loader.get_engine.cache_clear()
+
+
+def test_schedule_changes_the_predictions_fingerprint(monkeypatch):
+    schedule = pd.DataFrame({'gameweek': [11], 'date': ['2024-11-02'],
+                             'home_team': ['Arsenal'], 'away_team': ['Chelsea']})
+    monkeypatch.setattr(prediction_table, 'fetch_schedule', lambda: schedule.copy())
+    monkeypatch.setattr('src.modeling.mcmc.load_data', synthetic_match_logs)
+
+    def fingerprint():
+        stage = next(stage for stage in refresh_stages(scrape=False) if stage.name == 'predictions')
+        return stage_fingerprint(stage)
+
+    before = fingerprint()
+    assert fingerprint() == before
+    schedule.loc[0, 'date'] = '2024-11-03'
+    assert fingerprint() != before
+
+
+
+@pytest.fixture
+def no_database(monkeypatch):
+    """No database configured, and no .env to pick one up from"""
+    monkeypatch.setattr(data_loader, 'load_dotenv', lambda: None)
+    for name in ['DB_URL', 'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT', 'DATA_SOURCE']:
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize('env, stages, fit_deps', [
+    ({'DATA_SOURCE': 'parquet'}, ['snapshot', 'fit', 'export', 'predictions'], ['snapshot']),
+    ({'DATA_SOURCE': 'parquet', 'DB_URL': 'sqlite://'}, ['database', 'snapshot', 'fit', 'export', 'predictions'],
+     ['snapshot']),
+    ({}, ['database', 'snapshot', 'fit', 'export', 'predictions'], ['database']),
+])
+def test_database_stage_follows_the_configuration(no_database, monkeypatch, env, stages, fit_deps):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    refresh = refresh_stages(scrape=False)
+
+    assert [stage.name for stage in refresh] == stages
+    assert next(stage for stage in refresh if stage.name == 'fit').deps == fit_deps
+
+
+def test_parquet_refresh_runs_without_a_database(no_database, tmp_path, monkeypatch):
+    from tests.conftest import synthetic_posterior
+
+    monkeypatch.setenv('DATA_SOURCE', 'parquet')
+    ran = []
+    schedule = pd.DataFrame({'gameweek': [11], 'date': ['2024-11-02'],
+                             'home_team': ['Arsenal'], 'away_team': ['Chelsea']})
+    monkeypatch.setattr('src.snapshot.build_snapshot', lambda *args, **kwargs: ran.append('snapshot'))
+    monkeypatch.setattr('src.modeling.mcmc.load_data', synthetic_match_logs)
+    monkeypatch.setattr('src.modeling.trace_cache.load_or_sample',
+                        lambda data, **kwargs: ran.append('fit') or synthetic_posterior(data['n_teams']))
+    monkeypatch.setattr('src.modeling.posterior_store.export_posterior', lambda *args, **kwargs: ran.append('export'))
+    monkeypatch.setattr(prediction_table, 'fetch_schedule', lambda: schedule.copy())
+    monkeypatch.setattr(prediction_table, 'write_prediction_table',
+                        lambda table, **kwargs: ran.append(('predictions', len(table))))
+
+    status = run_pipeline(refresh_stages(scrape=False), state_path=tmp_path / 'state.json', workers=1)
+
+    assert status == {'snapshot': 'ran', 'fit': 'ran', 'export': 'ran', 'predictions': 'ran'}
+    assert 'snapshot' in ran and ('predictions', 1) in ran
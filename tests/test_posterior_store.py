@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.modeling.mcmc import POSTERIOR_PARAMS, extract_posterior, predict_matches
+from src.modeling.posterior_store import export_posterior, load_posterior, load_posterior_metadata
+
+
+def test_export_round_trip(trace, prepared, tmp_path):
+    path = export_posterior(trace, tmp_path / 'posterior.npy', teams=prepared['teams'], fingerprint='abc')
+
+    posterior = load_posterior(path)
+    expected = extract_posterior(trace)
+
+    assert set(posterior) == set(POSTERIOR_PARAMS)
+    for name in POSTERIOR_PARAMS:
+        assert posterior[name].shape == expected[name].shape
+        assert posterior[name].dtype == np.float32
+        np.testing.assert_allclose(posterior[name], expected[name], rtol=1e-6)
+
+    metadata = load_posterior_metadata(path)
+    assert metadata['teams'] == prepared['teams']
+    assert metadata['fingerprint'] == 'abc'
+    assert metadata['n_draws'] == expected['attack'].shape[0]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['posterior.json', 'posterior.npy']
+
+
+def test_loaded_posterior_predicts_like_the_trace(trace, prepared, tmp_path):
+    path = export_posterior(trace, tmp_path / 'posterior.npy')
+    home, away = [0, 1, 2], [3, 4, 5]
+
+    from_store = predict_matches(load_posterior(path), home, away, prepared, method='exact')
+    from_trace = predict_matches(trace, home, away, prepared, method='exact')
+
+    np.testing.assert_allclose(from_store.to_numpy(), from_trace.to_numpy(), rtol=1e-5)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.modeling.mcmc import predict_match, predict_matches
+from tests.conftest import synthetic_posterior
+
+
+@pytest.fixture
+def posterior(prepared):
+    return synthetic_posterior(prepared['n_teams'], draws=4000)
+
+
+def all_fixtures(n_teams):
+    home, away = np.array([(h, a) for h in range(n_teams) for a in range(n_teams) if h != a]).T
+    return home, away
+
+
+def naive_expected_goals(posterior, home, away, data):
+    """Expected goals for one fixture, computed draw by draw as the original loop did"""
+    home_team, away_team = data['teams'][home], data['teams'][away]
+    theta_home, theta_away = [], []
+    for d in range(len(posterior['home_advantage'])):
+        theta_home.append(np.exp(
+            posterior['attack'][d, home] - posterior['defense'][d, away] + posterior['home_advantage'][d]
+            + data['avg_goals'][home_team] * posterior['recent_form_coefficient'][d]
+            + posterior['beta_home_xG'][d] * data['home_xg'][home]
+            + posterior['beta_home_possession'][d] * data['home_possession'][home]
+        ))
+        theta_away.append(np.exp(
+            posterior['attack'][d, away] - posterior['defense'][d, home]
+            + data['avg_goals'][away_team] * posterior['recent_form_coefficient'][d]
+            + posterior['beta_away_xG'][d] * data['away_xg'][away]
+            + posterior['beta_away_possession'][d] * data['away_possession'][away]
+        ))
+    return np.mean(theta_home), np.mean(theta_away)
+
+
+def test_expected_goals_match_per_draw_loop(prepared):
+    posterior = synthetic_posterior(prepared['n_teams'], draws=50)
+    home, away = all_fixtures(prepared['n_teams'])
+
+    predictions = predict_matches(posterior, home, away, prepared, random_state=0)
+
+    expected = np.array([naive_expected_goals(posterior, h, a, prepared) for h, a in zip(home, away)])
+    np.testing.assert_allclose(predictions[['expected_home_goals', 'expected_away_goals']].to_numpy(), expected)
+
+
+def test_sampled_probabilities_agree_with_exact(prepared, posterior):
+    home, away = all_fixtures(prepared['n_teams'])
+    columns = ['home_win_prob', 'draw_prob', 'away_win_prob']
+
+    sampled = predict_matches(posterior, home, away, prepared, random_state=0)
+    exact = predict_matches(posterior, home, away, prepared, method='exact')
+
+    np.testing.assert_allclose(sampled[columns].sum(axis=1), 1.0)
+    np.testing.assert_allclose(sampled[columns].to_numpy(), exact[columns].to_numpy(), atol=0.03)
+
+
+def test_sampling_is_seeded(prepared, posterior):
+    home, away = all_fixtures(prepared['n_teams'])
+
+    first = predict_matches(posterior, home, away, prepared, random_state=7)
+    second = predict_matches(posterior, home, away, prepared, random_state=7)
+
+    assert first.equals(second)
+
+
+def test_batch_matches_single_fixture(prepared, posterior):
+    home, away = all_fixtures(prepared['n_teams'])
+    batch = predict_matches(posterior, home, away, prepared, method='exact')
+
+    single = predict_match(posterior, prepared['teams'][home[3]], prepared['teams'][away[3]], prepared, method='exact')
+
+    assert single == pytest.approx(batch.iloc[3].to_dict())
+
+
+def test_rejects_unknown_method_and_team(prepared, posterior):
+    with pytest.raises(ValueError, match="Unknown prediction method"):
+        predict_matches(posterior, [0], [1], prepared, method='bootstrap')
+    with pytest.raises(ValueError, match="not found in data"):
+        predict_match(posterior, 'Arsenal', 'Wrexham', prepared)
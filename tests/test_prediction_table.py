@@ -0,0 +1,84 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.modeling import prediction_table
+from src.modeling.mcmc import extract_posterior, prepare_data
+from src.modeling.prediction_table import PredictionStore, build_prediction_table, read_prediction_table
+from src.modeling.trace_cache import store_trace, trace_fingerprint
+from tests.conftest import synthetic_match_logs
+
+SCHEDULE = pd.DataFrame({
+    'gameweek': [11, 11, 12],
+    'date': ['2024-11-02', '2024-11-02', '2024-11-09'],
+    'home_team': ['Arsenal', 'Chelsea', 'Everton'],
+    'away_team': ['Liverpool', 'Newcastle-United', 'Fulham'],
+})
+
+
+@pytest.fixture
+def current(monkeypatch):
+    """The match logs load_data returns, replaceable by the test"""
+    logs = {'df': synthetic_match_logs()}
+    monkeypatch.setattr(prediction_table, 'load_data', lambda: logs['df'].copy())
+    return logs
+
+
+def make_store(tmp_path):
+    return PredictionStore(path=tmp_path / 'gameweeks.parquet', cache_dir=tmp_path / 'traces',
+                           schedule_fn=lambda: SCHEDULE)
+
+
+def test_table_predicts_known_fixtures(prepared, trace):
+    table = build_prediction_table(extract_posterior(trace), prepared, SCHEDULE)
+
+    assert table[['gameweek', 'home_team', 'away_team']].equals(SCHEDULE[['gameweek', 'home_team', 'away_team']])
+    assert table['home_win_prob'].notna().tolist() == [True, False, True]
+
+
+def test_store_uses_the_trace_of_the_current_data(tmp_path, current, prepared, trace):
+    key = trace_fingerprint(prepared, samples=2000, tune=1000)
+    store_trace(trace, key, cache_dir=tmp_path / 'traces')
+    # A newer trace of other data must not be picked up
+    decoy = store_trace(trace, 'other-data', cache_dir=tmp_path / 'traces')
+    os.utime(decoy, (decoy.stat().st_mtime + 10,) * 2)
+
+    store = make_store(tmp_path)
+
+    assert store.metadata['trace'] == key
+    assert read_prediction_table(tmp_path / 'gameweeks.parquet')[1]['trace'] == key
+    assert len(store.gameweek(11)) == 2
+
+    version = store.version
+    store.refresh()
+    assert store.version == version
+
+
+def test_refresh_waits_for_the_new_data_to_be_fit(tmp_path, current, prepared, trace):
+    store_trace(trace, trace_fingerprint(prepared, samples=2000, tune=1000), cache_dir=tmp_path / 'traces')
+    store = make_store(tmp_path)
+    version = store.version
+
+    current['df'] = synthetic_match_logs(seed=1)
+    new_key = trace_fingerprint(prepare_data(synthetic_match_logs(seed=1)), samples=2000, tune=1000)
+    decoy = store_trace(trace, 'other-data', cache_dir=tmp_path / 'traces')
+    os.utime(decoy, (decoy.stat().st_mtime + 10,) * 2)
+    store.refresh()
+    assert store.version == version
+
+    fitted = store_trace(trace, new_key, cache_dir=tmp_path / 'traces')
+    os.utime(fitted, (fitted.stat().st_mtime + 20,) * 2)
+    store.refresh()
+    assert store.version == version + 1
+    assert store.metadata['trace'] == new_key
+
+
+def test_refresh_picks_up_a_table_written_elsewhere(tmp_path, current, prepared, trace):
+    store_trace(trace, trace_fingerprint(prepared, samples=2000, tune=1000), cache_dir=tmp_path / 'traces')
+    store = make_store(tmp_path)
+    other = make_store(tmp_path)
+
+    other.rebuild()
+    store.refresh()
+    assert store.metadata == other.metadata
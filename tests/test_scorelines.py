@@ -0,0 +1,62 @@
+from math import exp, factorial
+
+import numpy as np
+import pytest
+
+from src.modeling.scorelines import OVER_UNDER_LINES, market_probabilities, poisson_pmf_grid, scoreline_matrix
+
+
+def poisson_pmf(k, theta):
+    return theta ** k * exp(-theta) / factorial(k)
+
+
+def test_pmf_grid_matches_closed_form():
+    theta = np.array([[0.3, 1.4], [2.2, 3.9]])
+
+    pmf = poisson_pmf_grid(theta, max_goals=8)
+
+    expected = [[[poisson_pmf(k, t) for t in row] for row in theta] for k in range(9)]
+    np.testing.assert_allclose(pmf, expected)
+
+
+def test_scoreline_matrix_averages_outer_products_over_draws():
+    rng = np.random.default_rng(0)
+    theta_home = rng.uniform(0.5, 2.5, size=(5, 30))
+    theta_away = rng.uniform(0.5, 2.5, size=(5, 30))
+
+    # A small chunk size exercises the fixture blocks
+    matrix = scoreline_matrix(theta_home, theta_away, max_goals=6, chunk_size=2)
+
+    for f in range(5):
+        expected = np.zeros((7, 7))
+        for d in range(30):
+            expected += np.outer(
+                [poisson_pmf(i, theta_home[f, d]) for i in range(7)],
+                [poisson_pmf(j, theta_away[f, d]) for j in range(7)],
+            )
+        np.testing.assert_allclose(matrix[f], expected / expected.sum())
+
+
+def test_market_probabilities_are_consistent():
+    rng = np.random.default_rng(1)
+    matrix = scoreline_matrix(rng.uniform(0.5, 2.5, size=(4, 20)), rng.uniform(0.5, 2.5, size=(4, 20)))
+
+    markets = market_probabilities(matrix)
+
+    np.testing.assert_allclose(markets[['home_win_prob', 'draw_prob', 'away_win_prob']].sum(axis=1), 1.0)
+    for line in OVER_UNDER_LINES:
+        np.testing.assert_allclose(markets[f'over_{line}_prob'] + markets[f'under_{line}_prob'], 1.0)
+    np.testing.assert_allclose(markets['under_0.5_prob'], matrix[:, 0, 0])
+    np.testing.assert_allclose(markets['btts_prob'], matrix[:, 1:, 1:].sum(axis=(1, 2)))
+
+
+def test_market_probabilities_of_a_known_scoreline():
+    matrix = np.zeros((1, 4, 4))
+    matrix[0, 2, 1] = 1.0
+
+    markets = market_probabilities(matrix, lines=(2.5, 3.5)).iloc[0]
+
+    assert markets['home_win_prob'] == 1.0
+    assert markets['over_2.5_prob'] == 1.0
+    assert markets['under_3.5_prob'] == 1.0
+    assert markets['btts_prob'] == pytest.approx(1.0)
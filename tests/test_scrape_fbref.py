@@ -0,0 +1,154 @@
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scripts import scrape_fbref
+from scripts.fixture_server import start_server
+from scripts.http_cache import HTTPCache
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'fbref'
+
+
+@pytest.fixture
+def fbref(tmp_path, monkeypatch):
+    """Point the scraper at the saved pages, with an empty HTTP cache"""
+    server, base_url = start_server(str(FIXTURES))
+    season = scrape_fbref.SEASON
+    monkeypatch.setattr(scrape_fbref, 'BASE_URL', base_url)
+    monkeypatch.setattr(scrape_fbref, 'PL_STATS_URL',
+                        f"{base_url}/comps/9/{season}/{season}-Premier-League-Stats#all_results{season}91")
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), ttl_rules=scrape_fbref.TTL_RULES, offline=False)
+    monkeypatch.setattr(scrape_fbref, 'HTTP_CACHE', cache)
+    yield cache
+    server.shutdown()
+    server.server_close()
+
+
+def scrape(csv_path, **kwargs):
+    return scrape_fbref.scrape_match_logs(str(csv_path), requests_per_second=1000, burst=20, **kwargs)
+
+
+def test_scrape_match_logs_merges_every_log_type(fbref, tmp_path):
+    csv_path = tmp_path / 'match_logs.csv'
+    df = scrape(csv_path)
+
+    assert df is not None
+    assert sorted(zip(df['Team'], df['Date'])) == [
+        ('Arsenal', '2024-08-17'), ('Arsenal', '2024-08-24'), ('Arsenal', '2024-08-31'),
+        ('Chelsea', '2024-08-18'), ('Chelsea', '2024-08-25'), ('Chelsea', '2024-09-01'),
+    ]
+    for log_type, columns in scrape_fbref.COLUMNS_TO_KEEP.items():
+        for column in columns:
+            if column not in ('Date', 'Venue', 'Opponent'):
+                assert f"{log_type}_{column}" in df.columns
+
+    arsenal = df.set_index(['Team', 'Date']).loc[('Arsenal', '2024-08-24')]
+    assert arsenal['Venue'] == 'Away'
+    assert arsenal['Opponent'] == 'Aston Villa'
+    assert arsenal['shooting_GF'] == '2'
+    assert arsenal['keeper_SoTA'] == '10'
+    assert arsenal['keeper_PSxG+/-'] == '+0.4'
+    # Only matchlogs_for is read; the against table has zeros everywhere
+    assert arsenal['keeper_Saves'] == '7'
+
+    saved = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(saved, df.reset_index(drop=True))
+
+
+def test_incremental_scrape_skips_up_to_date_teams(fbref, tmp_path, monkeypatch):
+    csv_path = tmp_path / 'match_logs.csv'
+    scrape(csv_path)
+    first = csv_path.read_text()
+
+    requested = []
+    fetch_match_log = scrape_fbref.fetch_match_log
+
+    def tracking_fetch(team, log_type, url, rate_limiter):
+        requested.append(url)
+        return fetch_match_log(team, log_type, url, rate_limiter)
+
+    monkeypatch.setattr(scrape_fbref, 'fetch_match_log', tracking_fetch)
+    df = scrape(csv_path, incremental=True)
+
+    assert requested == []
+    assert len(df) == 6
+    assert csv_path.read_text() == first
+
+
+def test_parse_match_log_skips_the_totals_row():
+    page = next((FIXTURES / 'en' / 'squads').rglob('shooting/Chelsea-Match-Logs-Premier-League.html'))
+    rows = scrape_fbref.parse_match_log(page.read_text(), 'Chelsea', 'shooting')
+
+    assert [row['Date'] for row in rows] == ['2024-08-18', '2024-08-25', '2024-09-01']
+    assert rows[1]['Opponent'] == 'Wolves'
+    assert rows[1]['GF'] == '6'
+    assert set(rows[0]) == set(scrape_fbref.COLUMNS_TO_KEEP['shooting'])
+
+
+def test_incremental_scrape_fetches_only_new_matches(fbref, tmp_path, monkeypatch):
+    csv_path = tmp_path / 'match_logs.csv'
+    full = scrape(csv_path)
+    # Pretend Arsenal's latest match had not been played at the last scrape
+    stored = full[~((full['Team'] == 'Arsenal') & (full['Date'] == '2024-08-31'))]
+    stored.to_csv(csv_path, index=False)
+
+    requested = []
+    fetch_match_log = scrape_fbref.fetch_match_log
+
+    def tracking_fetch(team, log_type, url, rate_limiter):
+        requested.append(team[0])
+        return fetch_match_log(team, log_type, url, rate_limiter)
+
+    monkeypatch.setattr(scrape_fbref, 'fetch_match_log', tracking_fetch)
+    merged = scrape(csv_path, incremental=True)
+
+    assert requested == ['Arsenal'] * len(scrape_fbref.COLUMNS_TO_KEEP)
+    pd.testing.assert_frame_equal(
+        merged.sort_values(['Team', 'Date']).reset_index(drop=True),
+        full.sort_values(['Team', 'Date']).reset_index(drop=True),
+    )
+
+
+def test_rate_limiter_holds_concurrent_workers_to_the_budget():
+    limiter = scrape_fbref.RateLimiter(rate=50, burst=5)
+    times = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire()
+            with lock:
+                times.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 requests: a burst of 5, then 15 more at 50 per second
+    assert len(times) == 20
+    assert time.monotonic() - start >= 15 / 50 * 0.9
+    # No stretch from the start holds more than the burst plus what refills during it
+    for window in (0.05, 0.1, 0.2):
+        assert sum(t - start < window for t in times) <= 5 + window * 50 + 1
+
+
+def test_output_does_not_depend_on_completion_order(fbref, tmp_path, monkeypatch):
+    expected = scrape(tmp_path / 'in_order.csv', max_workers=1)
+
+    fetch_match_log = scrape_fbref.fetch_match_log
+
+    def slow_first_teams(team, log_type, url, rate_limiter):
+        # Earlier teams finish last
+        time.sleep(0.05 if team[0] == 'Arsenal' else 0)
+        return fetch_match_log(team, log_type, url, rate_limiter)
+
+    monkeypatch.setattr(scrape_fbref, 'fetch_match_log', slow_first_teams)
+    df = scrape(tmp_path / 'concurrent.csv', max_workers=8)
+
+    pd.testing.assert_frame_equal(df, expected)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.mcmc import predict_matches, slice_fixtures, team_indices
+from src.modeling.season import current_table, remaining_fixtures, simulate_season
+from tests.conftest import synthetic_posterior
+
+
+@pytest.fixture
+def first_half(prepared):
+    """The season after its first 15 fixtures: every team has played every other once"""
+    return slice_fixtures(prepared, np.arange(len(prepared['home_goals'])) < 15)
+
+
+def test_current_table_matches_match_logs(match_logs, prepared):
+    table = current_table(prepared)
+
+    points = match_logs['goals_for'].gt(match_logs['goals_against']) * 3 + match_logs['goals_for'].eq(match_logs['goals_against'])
+    per_team = match_logs.assign(points=points).groupby('team')[['points', 'goals_for', 'goals_against']].sum()
+    per_team = per_team.loc[prepared['teams']]
+    np.testing.assert_array_equal(table['points'], per_team['points'])
+    np.testing.assert_array_equal(table['goals_for'], per_team['goals_for'])
+    np.testing.assert_array_equal(table['goals_against'], per_team['goals_against'])
+    np.testing.assert_array_equal(table['played'], 10)
+
+
+def test_remaining_fixtures_are_the_unplayed_pairs(prepared, first_half):
+    fixtures = remaining_fixtures(first_half)
+
+    played = set(zip(first_half['home_teams'], first_half['away_teams']))
+    second_half = set(zip(prepared['home_teams'][15:], prepared['away_teams'][15:]))
+    remaining = set(zip(team_indices(fixtures['home_team'], prepared), team_indices(fixtures['away_team'], prepared)))
+    assert remaining == second_half
+    assert not remaining & played
+    assert remaining_fixtures(prepared).empty
+
+
+def test_simulated_points_match_analytic_expectation(first_half):
+    posterior = synthetic_posterior(first_half['n_teams'])
+    fixtures = remaining_fixtures(first_half)
+
+    summary, positions = simulate_season(posterior, first_half, n_simulations=40000, chunk_size=5000, random_state=0)
+
+    np.testing.assert_allclose(positions.sum(axis=0), 1.0)
+    np.testing.assert_allclose(positions.sum(axis=1), 1.0)
+
+    # 3 P(win) + P(draw) per remaining fixture, from the exact scoreline probabilities
+    markets = predict_matches(posterior, team_indices(fixtures['home_team'], first_half),
+                              team_indices(fixtures['away_team'], first_half), first_half, method='exact')
+    home_points = 3 * markets['home_win_prob'] + markets['draw_prob']
+    away_points = 3 * markets['away_win_prob'] + markets['draw_prob']
+    expected = pd.concat([
+        pd.Series(home_points.to_numpy(), index=fixtures['home_team']),
+        pd.Series(away_points.to_numpy(), index=fixtures['away_team']),
+    ]).groupby(level=0).sum() + pd.Series(current_table(first_half)['points'], index=first_half['teams'])
+    actual = summary.set_index('team')['expected_points']
+    np.testing.assert_allclose(actual.loc[expected.index], expected, atol=0.05)
+
+
+def test_results_do_not_depend_on_thread_count(first_half):
+    posterior = synthetic_posterior(first_half['n_teams'])
+
+    single = simulate_season(posterior, first_half, n_simulations=3000, chunk_size=1000, workers=1, random_state=3)
+    threaded = simulate_season(posterior, first_half, n_simulations=3000, chunk_size=1000, workers=3, random_state=3)
+
+    pd.testing.assert_frame_equal(single[0], threaded[0])
+    pd.testing.assert_frame_equal(single[1], threaded[1])
+
+
+def test_finished_season_ranks_on_points_then_goal_difference(prepared):
+    summary, positions = simulate_season(synthetic_posterior(prepared['n_teams']), prepared,
+                                         n_simulations=100, random_state=0)
+
+    table = current_table(prepared)
+    ranking = sorted(range(prepared['n_teams']), key=lambda i: (
+        -table['points'][i], -(table['goals_for'][i] - table['goals_against'][i]), -table['goals_for'][i]))
+    champion = prepared['teams'][ranking[0]]
+    assert summary['expected_points'].tolist() == sorted(table['points'], reverse=True)
+    assert positions.loc[champion, 1] == 1.0
+    assert summary.set_index('team').loc[champion, 'title_prob'] == 1.0
@@ -0,0 +1,98 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src.modeling.mcmc import predict_matches, team_indices
+from src.service import PredictionService, serve
+from tests.conftest import synthetic_posterior
+
+
+@pytest.fixture
+def service(prepared):
+    posterior = synthetic_posterior(prepared['n_teams'])
+    service = PredictionService(posterior, prepared, loader=lambda: (posterior, prepared), max_wait=0.001)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def url(service):
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_predictions_match_predict_matches(service, prepared):
+    fixtures = [('Arsenal', 'Chelsea'), ('Liverpool', 'Fulham'), ('Arsenal', 'Chelsea')]
+    results = service.predict(fixtures)
+
+    expected = predict_matches(
+        service._state[1], team_indices(['Arsenal', 'Liverpool'], prepared),
+        team_indices(['Chelsea', 'Fulham'], prepared), prepared, method='exact'
+    )
+    got = pd.DataFrame(results[:2])[expected.columns]
+    pd.testing.assert_frame_equal(got, expected)
+    assert results[2] == results[0]
+
+
+def test_repeated_fixtures_are_cached_until_reload(service):
+    service.predict([('Arsenal', 'Chelsea')])
+    service.predict([('Arsenal', 'Chelsea')])
+    assert service.stats()['cache_hits'] == 1
+
+    service.reload()
+    assert service.stats()['cache_entries'] == 0
+    assert service.stats()['version'] == 2
+
+
+def test_http_endpoints(url, prepared):
+    with urllib.request.urlopen(f"{url}/health") as response:
+        assert json.loads(response.read())['teams'] == list(prepared['teams'])
+
+    status, single = post(f"{url}/predict", {'home_team': 'Everton', 'away_team': 'Brentford'})
+    assert status == 200
+    assert single['home_team'] == 'Everton'
+    assert single['home_win_prob'] + single['draw_prob'] + single['away_win_prob'] == pytest.approx(1, abs=1e-6)
+
+    status, batch = post(f"{url}/predict/batch", {'fixtures': [
+        {'home_team': 'Everton', 'away_team': 'Brentford'}, {'home_team': 'Chelsea', 'away_team': 'Arsenal'},
+    ]})
+    assert status == 200
+    assert batch['predictions'][0] == single
+
+
+def test_bad_requests_get_400(url):
+    assert post(f"{url}/predict", {'home_team': 'Everton'})[0] == 400
+    status, body = post(f"{url}/predict", {'home_team': 'Everton', 'away_team': 'Nowhere FC'})
+    assert status == 400
+    assert 'Nowhere FC' in body['error']
+    assert post(f"{url}/unknown", {})[0] == 404
+
+
+def test_failed_reload_gets_500_and_keeps_serving(service, url):
+    def failing_loader():
+        raise OSError("database unavailable")
+
+    service.loader = failing_loader
+    status, body = post(f"{url}/reload", {})
+    assert status == 500
+    assert 'database unavailable' in body['error']
+
+    status, _ = post(f"{url}/predict", {'home_team': 'Everton', 'away_team': 'Brentford'})
+    assert status == 200
+    assert service.stats()['version'] == 1
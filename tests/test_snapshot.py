@@ -0,0 +1,62 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.snapshot import read_snapshot, season_of, write_snapshot
+
+
+def match_logs(goals):
+    return pd.DataFrame({
+        'date': ['2024-05-19', '2024-08-17', '2024-08-17', '2025-01-04'],
+        'team': ['Arsenal', 'Arsenal', 'Wolves', 'Chelsea'],
+        'goals_for': goals,
+        'shooting_xG': [2.1, 1.2, 0.3, 0.9],
+    })
+
+
+def test_season_of_splits_in_july():
+    assert season_of(['2024-06-30', '2024-07-01', '2025-01-04']).tolist() == ['2023-2024', '2024-2025', '2024-2025']
+
+
+def test_round_trip_prunes_seasons_and_columns(tmp_path):
+    root = str(tmp_path / 'snapshot')
+    assert write_snapshot(match_logs([3, 2, 0, 1]), root=root) == ['2023-2024', '2024-2025']
+
+    df = read_snapshot(root=root)
+    assert len(df) == 4
+    assert df['goals_for'].dtype == 'Int64'
+
+    season = read_snapshot(columns=['date', 'team', 'goals_for'], season='2024-2025', root=root)
+    assert list(season.columns) == ['date', 'team', 'goals_for']
+    assert sorted(season['team']) == ['Arsenal', 'Chelsea', 'Wolves']
+
+    dated = read_snapshot(start_date='2024-08-18', root=root)
+    assert dated['team'].tolist() == ['Chelsea']
+
+
+def test_rewrite_swaps_the_symlink_and_keeps_one_previous_version(tmp_path):
+    root = str(tmp_path / 'snapshot')
+    versions = []
+    for goals in range(3):
+        write_snapshot(match_logs([goals] * 4), root=root)
+        assert os.path.islink(root)
+        versions.append(os.path.realpath(root))
+
+    assert read_snapshot(root=root)['goals_for'].tolist() == [2] * 4
+    remaining = sorted(str(path) for path in tmp_path.glob('snapshot.v*'))
+    assert remaining == sorted(versions[1:])
+
+
+def test_snapshot_written_before_versioning_is_replaced(tmp_path):
+    root = tmp_path / 'snapshot'
+    match_logs([1, 1, 1, 1]).to_parquet(root, partition_cols=['team'], index=False)
+
+    write_snapshot(match_logs([5, 5, 5, 5]), root=str(root))
+    assert root.is_symlink()
+    assert read_snapshot(root=str(root))['goals_for'].tolist() == [5] * 4
+
+
+def test_missing_snapshot_raises(tmp_path):
+    with pytest.raises(ValueError, match="No snapshot"):
+        read_snapshot(root=str(tmp_path / 'snapshot'))
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.modeling import trace_cache
+from src.modeling.trace_cache import evict_stale, latest_trace_path, load_or_sample, trace_fingerprint
+
+
+def test_fingerprint_tracks_data_and_sampler_config(prepared):
+    key = trace_fingerprint(prepared, samples=2000, tune=1000)
+
+    assert trace_fingerprint(prepared, tune=1000, samples=2000) == key
+    assert trace_fingerprint(prepared, samples=1000, tune=1000) != key
+
+    changed = dict(prepared, home_goals=prepared['home_goals'].copy())
+    changed['home_goals'][0] += 1
+    assert trace_fingerprint(changed, samples=2000, tune=1000) != key
+
+
+def test_load_or_sample_samples_once_per_fingerprint(prepared, trace, tmp_path, monkeypatch):
+    calls = []
+
+    def fake_sample_model(model, **kwargs):
+        calls.append(kwargs)
+        return trace
+
+    monkeypatch.setattr(trace_cache, 'sample_model', fake_sample_model)
+
+    first = load_or_sample(prepared, samples=100, tune=100, cache_dir=tmp_path)
+    second = load_or_sample(prepared, samples=100, tune=100, cache_dir=tmp_path)
+
+    assert len(calls) == 1
+    key = trace_fingerprint(prepared, samples=100, tune=100)
+    assert latest_trace_path(tmp_path) == tmp_path / f'{key}.nc'
+    np.testing.assert_allclose(second.posterior['attack'].values, first.posterior['attack'].values)
+
+    load_or_sample(prepared, samples=200, tune=100, cache_dir=tmp_path)
+    assert len(calls) == 2
+
+
+def test_evict_stale_keeps_most_recently_used(tmp_path):
+    for age, name in enumerate(['newest', 'middle', 'oldest']):
+        path = tmp_path / f'{name}.nc'
+        path.write_bytes(b'')
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+
+    evict_stale(tmp_path, max_entries=2)
+
+    assert sorted(path.stem for path in tmp_path.glob('*.nc')) == ['middle', 'newest']
+
+
+@pytest.mark.parametrize('entries', [0, 1])
+def test_latest_trace_path_on_small_cache(tmp_path, entries):
+    if entries:
+        (tmp_path / 'only.nc').write_bytes(b'')
+    assert latest_trace_path(tmp_path) == (tmp_path / 'only.nc' if entries else None)
@@ -0,0 +1,69 @@
+import arviz as az
+import numpy as np
+import pytest
+
+from src.modeling.compiled_model import compiled_model
+from src.modeling.mcmc import POSTERIOR_PARAMS
+from src.modeling.warm_start import convergence_report, warm_start_state
+
+
+def test_warm_start_state_from_previous_trace(prepared, trace):
+    model = compiled_model(prepared).model
+
+    state = warm_start_state(model, trace)
+
+    posterior = trace.posterior
+    assert len(state['initvals']) == posterior.sizes['chain']
+    for chain, initvals in enumerate(state['initvals']):
+        np.testing.assert_array_equal(initvals['attack'], posterior['attack'].values[chain, -1])
+
+    # The flat vectors follow model.value_vars, one block per variable
+    sizes = [model.initial_point()[var.name].size for var in model.value_vars]
+    assert len(state['mean']) == len(state['variance']) == sum(sizes)
+    start = sum(sizes[:[var.name for var in model.value_vars].index('attack')])
+    attack = posterior['attack'].values.reshape(-1, prepared['n_teams'])
+    np.testing.assert_allclose(state['mean'][start:start + prepared['n_teams']], attack.mean(axis=0))
+    np.testing.assert_allclose(state['variance'][start:start + prepared['n_teams']], attack.var(axis=0))
+    assert state['step_size'] == pytest.approx(np.median(trace.sample_stats['step_size_bar'].values[:, -1]))
+
+
+def test_warm_start_step_size_falls_back_to_step_size(prepared, trace):
+    model = compiled_model(prepared).model
+    without_bar = trace.copy()
+    without_bar.sample_stats = without_bar.sample_stats.drop_vars('step_size_bar')
+
+    state = warm_start_state(model, without_bar)
+
+    assert state['step_size'] == pytest.approx(np.median(trace.sample_stats['step_size'].values[:, -1]))
+
+
+def synthetic_trace(chains=4, draws=500, divergences=0, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    posterior = {
+        name: rng.normal(size=(chains, draws, 3) if name in ('attack', 'defense') else (chains, draws))
+        for name in POSTERIOR_PARAMS
+    }
+    # Shifting one chain makes the chains disagree, so R-hat rises
+    posterior['home_advantage'][0] += shift
+    diverging = np.zeros((chains, draws), dtype=bool)
+    diverging[0, :divergences] = True
+    return az.from_dict(posterior=posterior, sample_stats={'diverging': diverging})
+
+
+def test_convergence_report_passes_well_mixed_chains():
+    trace = synthetic_trace()
+
+    report = convergence_report(trace, max_rhat=1.05, min_ess=400)
+
+    assert report['max_rhat'] == pytest.approx(float(max(az.rhat(trace)[name].max() for name in POSTERIOR_PARAMS)))
+    assert report['min_ess_bulk'] > 400
+    assert report['divergences'] == 0
+    assert not report['needs_full_refit']
+
+
+@pytest.mark.parametrize('kwargs', [{'divergences': 2}, {'shift': 3.0}])
+def test_convergence_report_flags_divergences_and_disagreeing_chains(kwargs):
+    report = convergence_report(synthetic_trace(**kwargs), max_rhat=1.05, min_ess=400)
+
+    assert report['needs_full_refit']
+    assert report['divergences'] == kwargs.get('divergences', 0)